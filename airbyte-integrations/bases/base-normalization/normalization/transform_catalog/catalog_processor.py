@@ -3,10 +3,12 @@
 #
 
 
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import yaml
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode, SyncMode  # type: ignore
@@ -16,6 +18,9 @@ from normalization.transform_catalog.destination_name_transformer import Destina
 from normalization.transform_catalog.stream_processor import StreamProcessor
 from normalization.transform_catalog.table_name_registry import TableNameRegistry
 
+# registry of resolved table names shared with the processes of the pool
+worker_tables_registry: Optional[TableNameRegistry] = None
+
 
 class CatalogProcessor:
     """
@@ -26,22 +31,36 @@ class CatalogProcessor:
     targeted destination schema.
 
     This is relying on a StreamProcessor to handle the conversion of a stream to a table one at a time.
+    Top-level streams (with their nested substreams) are independent once the table names are resolved, so they can be
+    processed by a pool of processes. When a manifest file is given, the fingerprints of the processed streams are recorded
+    in it, so the models of streams which didn't change since the previous run are neither generated nor written again.
     """
 
-    def __init__(self, output_directory: str, destination_type: DestinationType):
+    def __init__(
+        self,
+        output_directory: str,
+        destination_type: DestinationType,
+        max_workers: int = 1,
+        manifest_path: Optional[str] = None,
+    ):
         """
         @param output_directory is the path to the directory where this processor should write the resulting SQL files (DBT models)
         @param destination_type is the destination type of warehouse
+        @param max_workers is the number of processes generating the models, streams are processed serially by default
+        @param manifest_path is the file recording the fingerprints of the processed streams, it should be kept outside of the
+        output directory so it is not mistaken for a model. Every stream is processed when it is not set.
         """
         self.output_directory: str = output_directory
         self.destination_type: DestinationType = destination_type
         self.name_transformer: DestinationNameTransformer = DestinationNameTransformer(destination_type)
         self.models_to_source: Dict[str, str] = {}
+        self.max_workers: int = max(max_workers, 1)
+        self.manifest_path: Optional[str] = manifest_path
 
     def process(self, catalog_file: str, json_column_name: str, default_schema: str):
         """
         This method first parse and build models to handle top-level streams.
-        In a second loop will go over the substreams that were nested in a breadth-first traversal manner.
+        The substreams that were nested are handled in a breadth-first traversal manner by the same worker as their top-level stream.
 
         @param catalog_file input AirbyteCatalog file in JSON Schema describing the structure of the raw data
         @param json_column_name is the column name containing the JSON Blob with the raw data
@@ -51,7 +70,6 @@ class CatalogProcessor:
         schema_to_source_tables: Dict[str, Set[str]] = {}
         catalog = read_json(catalog_file)
         # print(json.dumps(catalog, separators=(",", ":")))
-        substreams = []
         stream_processors = self.build_stream_processor(
             catalog=catalog,
             json_column_name=json_column_name,
@@ -67,7 +85,13 @@ class CatalogProcessor:
                 f"WARN: Resolving conflict: {conflict.schema}.{conflict.table_name_conflict} "
                 f"from '{'.'.join(conflict.json_path)}' into {conflict.table_name_resolved}"
             )
-        for stream_processor in stream_processors:
+        manifest = self.read_manifest()
+        previous_files = get_manifest_files(manifest)
+        code_fingerprint = get_code_fingerprint()
+        stream_tree_names = tables_registry.get_names_by_stream()
+        stream_keys = []
+        outdated_streams = []
+        for stream_processor, configured_stream in zip(stream_processors, catalog["streams"]):
             # MySQL table names need to be manually truncated, because it does not do it automatically
             truncate = (
                 self.destination_type == DestinationType.MYSQL
@@ -77,15 +101,42 @@ class CatalogProcessor:
             raw_table_name = self.name_transformer.normalize_table_name(f"_airbyte_raw_{stream_processor.stream_name}", truncate=truncate)
             add_table_to_sources(schema_to_source_tables, stream_processor.schema, raw_table_name)
 
-            nested_processors = stream_processor.process()
-            self.models_to_source.update(stream_processor.models_to_source)
-
-            if nested_processors and len(nested_processors) > 0:
-                substreams += nested_processors
-            for file in stream_processor.sql_outputs:
-                output_sql_file(os.path.join(self.output_directory, file), stream_processor.sql_outputs[file])
+            key = f"{stream_processor.schema}.{stream_processor.stream_name}"
+            stream_keys.append(key)
+            fingerprint = get_fingerprint(
+                {
+                    "code": code_fingerprint,
+                    "destination_type": self.destination_type.value,
+                    "json_column_name": json_column_name,
+                    "default_schema": default_schema,
+                    "configured_stream": configured_stream,
+                    "table_names": stream_tree_names.get(stream_processor.stream_name, []),
+                }
+            )
+            if self.is_up_to_date(manifest.get(key), fingerprint):
+                print(f"  Skipping stream '{stream_processor.stream_name}' because its models are up to date")
+            else:
+                manifest[key] = {"fingerprint": fingerprint, "levels": []}
+                outdated_streams.append((key, stream_processor))
+
+        processed_levels = self.process_stream_trees([stream_processor for _, stream_processor in outdated_streams], tables_registry)
+        for (key, _), levels in zip(outdated_streams, processed_levels):
+            for sql_outputs, models_to_source in levels:
+                for file in sql_outputs:
+                    output_sql_file(os.path.join(self.output_directory, file), sql_outputs[file])
+                manifest[key]["levels"].append({"files": sorted(sql_outputs), "models_to_source": models_to_source})
+        # keep the breadth-first order of models over all streams, as if the substreams were processed after all top-level streams
+        depth = 0
+        while any(depth < len(manifest[key]["levels"]) for key in stream_keys):
+            for key in stream_keys:
+                if depth < len(manifest[key]["levels"]):
+                    self.models_to_source.update(manifest[key]["levels"][depth]["models_to_source"])
+            depth += 1
+        # forget the streams which are no longer in the catalog, and remove the models nobody generates anymore
+        manifest = {key: manifest[key] for key in stream_keys}
+        self.remove_stale_files(previous_files - get_manifest_files(manifest))
         self.write_yaml_sources_file(schema_to_source_tables)
-        self.process_substreams(substreams, tables_registry)
+        self.write_manifest(manifest)
 
     @staticmethod
     def build_stream_processor(
@@ -165,21 +216,54 @@ class CatalogProcessor:
             result.append(stream_processor)
         return result
 
-    def process_substreams(self, substreams: List[StreamProcessor], tables_registry: TableNameRegistry):
+    def process_stream_trees(
+        self, stream_processors: List[StreamProcessor], tables_registry: TableNameRegistry
+    ) -> Iterator[List[Tuple[Dict[str, str], Dict[str, str]]]]:
         """
-        Handle nested stream/substream/children
+        Handle top-level streams with their nested stream/substream/children, in a pool of processes if there are several of them.
+        @return for every top-level stream, the sql outputs and models to source of every level of nesting
         """
-        while substreams:
-            children = substreams
-            substreams = []
-            for substream in children:
-                substream.tables_registry = tables_registry
-                nested_processors = substream.process()
-                self.models_to_source.update(substream.models_to_source)
-                if nested_processors:
-                    substreams += nested_processors
-                for file in substream.sql_outputs:
-                    output_sql_file(os.path.join(self.output_directory, file), substream.sql_outputs[file])
+        max_workers = min(self.max_workers, len(stream_processors))
+        if max_workers <= 1:
+            yield from map(process_stream_tree, stream_processors)
+            return
+        for stream_processor in stream_processors:
+            # the registry is sent once to every worker instead of being pickled along with every stream
+            stream_processor.tables_registry = None  # type: ignore
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(tables_registry,)) as executor:
+            yield from executor.map(process_stream_tree, stream_processors)
+
+    def read_manifest(self) -> Dict[str, Dict]:
+        """
+        Read the fingerprints and outputs of the streams processed by previous runs
+        """
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        return read_json(self.manifest_path)
+
+    def write_manifest(self, manifest: Dict[str, Dict]):
+        if self.manifest_path:
+            output_json_file(self.manifest_path, manifest)
+
+    def is_up_to_date(self, manifest_entry: Optional[Dict], fingerprint: str) -> bool:
+        """
+        Models of a stream are up to date if they were generated from the same fingerprint and all of them are still there
+        """
+        if not manifest_entry or manifest_entry["fingerprint"] != fingerprint:
+            return False
+        return all(
+            os.path.exists(os.path.join(self.output_directory, file)) for level in manifest_entry["levels"] for file in level["files"]
+        )
+
+    def remove_stale_files(self, files: Set[str]):
+        """
+        Remove the models recorded by a previous run which are not generated anymore, so dbt doesn't build them
+        """
+        for file in sorted(files):
+            path = os.path.join(self.output_directory, file)
+            if os.path.exists(path):
+                print(f"  Removing stale model {file}")
+                os.remove(path)
 
     def write_yaml_sources_file(self, schema_to_source_tables: Dict[str, Set[str]]):
         """
@@ -218,6 +302,13 @@ class CatalogProcessor:
 # Static Functions
 
 
+def get_manifest_files(manifest: Dict[str, Dict]) -> Set[str]:
+    """
+    @return the files of all the levels of all the streams recorded in the manifest
+    """
+    return {file for entry in manifest.values() for level in entry["levels"] for file in level["files"]}
+
+
 def read_json(input_path: str) -> Any:
     """
     Reads and load a json file
@@ -297,3 +388,61 @@ def output_sql_file(file: str, sql: str):
             if line.strip():
                 f.write(line + "\n")
         f.write("\n")
+
+
+def output_json_file(file: str, content: Any):
+    """
+    @param file is the path to filename to be written
+    @param content is the json serializable content to be written
+    """
+    output_dir = os.path.dirname(file)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(file, "w") as f:
+        json.dump(content, f, indent=2)
+
+
+def get_fingerprint(content: Any) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_code_fingerprint() -> str:
+    """
+    Fingerprint of the code generating the models, so models are generated again when normalization itself changes
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sha = hashlib.sha256()
+    for file_name in sorted(os.listdir(package_dir)):
+        if file_name.endswith(".py"):
+            with open(os.path.join(package_dir, file_name), "rb") as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def init_worker(tables_registry: TableNameRegistry):
+    global worker_tables_registry
+    worker_tables_registry = tables_registry
+
+
+def process_stream_tree(stream_processor: StreamProcessor) -> List[Tuple[Dict[str, str], Dict[str, str]]]:
+    """
+    Handle a top-level stream and its nested stream/substream/children in a breadth-first traversal manner
+    @return the sql outputs and models to source of every level of nesting
+    """
+    if stream_processor.tables_registry is None:
+        stream_processor.tables_registry = worker_tables_registry
+    levels = []
+    substreams = [stream_processor]
+    while substreams:
+        children = substreams
+        substreams = []
+        sql_outputs: Dict[str, str] = {}
+        models_to_source: Dict[str, str] = {}
+        for substream in children:
+            nested_processors = substream.process()
+            sql_outputs.update(substream.sql_outputs)
+            models_to_source.update(substream.models_to_source)
+            if nested_processors:
+                substreams += nested_processors
+        levels.append((sql_outputs, models_to_source))
+    return levels
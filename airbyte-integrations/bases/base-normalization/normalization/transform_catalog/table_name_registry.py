@@ -315,6 +315,18 @@ class TableNameRegistry:
 
         return self.name_transformer.normalize_table_name(f"{file_name}{norm_suffix}", False, truncate, conflict, conflict_solver)
 
+    def get_names_by_stream(self) -> Dict[str, List[List[str]]]:
+        """
+        Group the resolved schema, table and file names of every top-level stream and its nested streams by the top-level stream name
+        """
+        result: Dict[str, List[List[str]]] = {}
+        for key in self.simple_table_registry:
+            for value in self.simple_table_registry[key]:
+                for schema in [value.intermediate_schema, value.schema]:
+                    resolved = self.registry[self.get_registry_key(schema, value.json_path, value.stream_name)]
+                    result.setdefault(value.json_path[0], []).append([resolved.schema, resolved.table_name, resolved.file_name])
+        return {stream_name: sorted(names) for stream_name, names in result.items()}
+
     def to_dict(self, apply_function=(lambda x: x)) -> Dict:
         """
         Converts to a pure dict to serialize as json
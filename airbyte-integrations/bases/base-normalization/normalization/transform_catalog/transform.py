@@ -42,6 +42,10 @@ python3 main_dev_transform_catalog.py \
         parser.add_argument("--catalog", nargs="+", type=str, required=True, help="path to Catalog (JSON Schema) file")
         parser.add_argument("--out", type=str, required=True, help="path to output generated DBT Models to")
         parser.add_argument("--json-column", type=str, required=False, help="name of the column containing the json blob")
+        parser.add_argument("--max-workers", type=int, default=1, help="number of processes generating the models")
+        parser.add_argument(
+            "--manifest", type=str, required=False, help="path to a file outside of --out recording the streams processed by previous runs"
+        )
         parsed_args = parser.parse_args(args)
         profiles_yml = read_profiles_yml(parsed_args.profile_config_dir)
         self.config = {
@@ -51,6 +55,8 @@ python3 main_dev_transform_catalog.py \
             "output_path": parsed_args.out,
             "json_column": parsed_args.json_column,
             "profile_config_dir": parsed_args.profile_config_dir,
+            "max_workers": parsed_args.max_workers,
+            "manifest_path": parsed_args.manifest,
         }
 
     def process_catalog(self) -> None:
@@ -58,7 +64,12 @@ python3 main_dev_transform_catalog.py \
         schema = self.config["schema"]
         output = self.config["output_path"]
         json_col = self.config["json_column"]
-        processor = CatalogProcessor(output_directory=output, destination_type=destination_type)
+        processor = CatalogProcessor(
+            output_directory=output,
+            destination_type=destination_type,
+            max_workers=self.config.get("max_workers", 1),
+            manifest_path=self.config.get("manifest_path"),
+        )
         for catalog_file in self.config["catalog"]:
             print(f"Processing {catalog_file}...")
             processor.process(catalog_file=catalog_file, json_column_name=json_col, default_schema=schema)
@@ -3,11 +3,21 @@
 #
 
 
+from functools import lru_cache
 from typing import Set, Union
 
+from jinja2 import Template
 from normalization.transform_catalog import dbt_macro
 
 
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> Template:
+    """
+    Compile the jinja template only once per process, the same model templates are rendered for every stream
+    """
+    return Template(source)
+
+
 def jinja_call(command: Union[str, dbt_macro.Macro]) -> str:
     return "{{ " + command + " }}"
 
@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+import os
+
+import pytest
+from normalization.destination_type import DestinationType
+from normalization.transform_catalog import catalog_processor
+from normalization.transform_catalog.catalog_processor import CatalogProcessor
+
+
+@pytest.fixture(scope="function", autouse=True)
+def before_tests(request):
+    # This makes the test run whether it is executed from the tests folder (with pytest/gradle)
+    # or from the base-normalization folder (through pycharm)
+    unit_tests_dir = os.path.join(request.fspath.dirname, "unit_tests")
+    if os.path.exists(unit_tests_dir):
+        os.chdir(unit_tests_dir)
+    else:
+        os.chdir(request.fspath.dirname)
+    yield
+    os.chdir(request.config.invocation_dir)
+
+
+def process_catalog(catalog_file: str, output_directory: str, max_workers: int = 1, manifest_path: str = None) -> CatalogProcessor:
+    processor = CatalogProcessor(
+        output_directory=output_directory,
+        destination_type=DestinationType.POSTGRES,
+        max_workers=max_workers,
+        manifest_path=manifest_path,
+    )
+    processor.process(catalog_file=catalog_file, json_column_name="_airbyte_data", default_schema="schema_test")
+    return processor
+
+
+def read_outputs(output_directory: str):
+    outputs = {}
+    for root, _, files in os.walk(output_directory):
+        for file in files:
+            with open(os.path.join(root, file), "r") as f:
+                outputs[os.path.relpath(os.path.join(root, file), output_directory)] = f.read()
+    return outputs
+
+
+def test_process_in_pool_of_workers(tmp_path):
+    catalog_file = "resources/un-nesting_collisions_catalog.json"
+    processor = process_catalog(catalog_file, str(tmp_path / "serial"), max_workers=1)
+    pool_processor = process_catalog(catalog_file, str(tmp_path / "pool"), max_workers=2)
+
+    assert read_outputs(str(tmp_path / "pool")) == read_outputs(str(tmp_path / "serial"))
+    assert list(pool_processor.models_to_source.items()) == list(processor.models_to_source.items())
+
+
+def test_process_unchanged_streams_are_skipped(tmp_path, monkeypatch):
+    catalog = json.load(open("resources/un-nesting_collisions_catalog.json"))
+    catalog_file = str(tmp_path / "catalog.json")
+    json.dump(catalog, open(catalog_file, "w"))
+    output_directory = str(tmp_path / "models")
+    manifest_path = str(tmp_path / "manifest.json")
+    models_to_source = process_catalog(catalog_file, output_directory, manifest_path=manifest_path).models_to_source
+    outputs = read_outputs(output_directory)
+
+    written_files = []
+    output_sql_file = catalog_processor.output_sql_file
+    monkeypatch.setattr(catalog_processor, "output_sql_file", lambda file, sql: written_files.append(file) or output_sql_file(file, sql))
+    assert process_catalog(catalog_file, output_directory, manifest_path=manifest_path).models_to_source == models_to_source
+    assert written_files == []
+    assert read_outputs(output_directory) == outputs
+
+    # only the models of the stream which changed are generated again
+    catalog["streams"][1]["destination_sync_mode"] = "overwrite"
+    json.dump(catalog, open(catalog_file, "w"))
+    process_catalog(catalog_file, output_directory, manifest_path=manifest_path)
+    assert written_files
+    assert all("/simple_stream" not in file and "/simple_b94" not in file for file in written_files)
+    assert read_outputs(output_directory) != outputs
+
+    # deleted models are generated again
+    os.remove(written_files[0])
+    written_files.clear()
+    process_catalog(catalog_file, output_directory, manifest_path=manifest_path)
+    assert written_files
+
+
+def test_process_without_manifest_generates_every_stream(tmp_path, monkeypatch):
+    catalog_file = "resources/un-nesting_collisions_catalog.json"
+    output_directory = str(tmp_path / "models")
+    process_catalog(catalog_file, output_directory)
+    outputs = read_outputs(output_directory)
+
+    written_files = []
+    output_sql_file = catalog_processor.output_sql_file
+    monkeypatch.setattr(catalog_processor, "output_sql_file", lambda file, sql: written_files.append(file) or output_sql_file(file, sql))
+    process_catalog(catalog_file, output_directory)
+    assert sorted(os.path.relpath(file, output_directory) for file in written_files) == sorted(file for file in outputs if file.endswith(".sql"))
+    assert read_outputs(output_directory) == outputs
+    assert os.listdir(tmp_path) == ["models"]
+
+
+def test_process_removes_stale_models(tmp_path):
+    catalog = json.load(open("resources/un-nesting_collisions_catalog.json"))
+    catalog["streams"][1].update({"destination_sync_mode": "append_dedup", "cursor_field": ["id"], "primary_key": [["id"]]})
+    catalog_file = str(tmp_path / "catalog.json")
+    json.dump(catalog, open(catalog_file, "w"))
+    output_directory = str(tmp_path / "models")
+    manifest_path = str(tmp_path / "manifest.json")
+    process_catalog(catalog_file, output_directory, manifest_path=manifest_path)
+    dedup_outputs = read_outputs(output_directory)
+
+    # the models of the previous generation of a stream are removed when they are not generated again
+    catalog["streams"][1].update({"destination_sync_mode": "append", "cursor_field": [], "primary_key": []})
+    json.dump(catalog, open(catalog_file, "w"))
+    process_catalog(catalog_file, output_directory, manifest_path=manifest_path)
+    outputs = read_outputs(output_directory)
+    assert set(dedup_outputs) - set(outputs)
+    process_catalog(catalog_file, str(tmp_path / "expected"))
+    assert outputs == read_outputs(str(tmp_path / "expected"))
+
+    # the models and the manifest entries of the streams removed from the catalog are removed
+    del catalog["streams"][1]
+    json.dump(catalog, open(catalog_file, "w"))
+    process_catalog(catalog_file, output_directory, manifest_path=manifest_path)
+    assert "namespace.simple" not in json.load(open(manifest_path))
+    process_catalog(catalog_file, str(tmp_path / "expected_without_stream"))
+    assert read_outputs(output_directory) == read_outputs(str(tmp_path / "expected_without_stream"))
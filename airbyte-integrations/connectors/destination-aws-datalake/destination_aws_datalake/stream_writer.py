@@ -6,7 +6,7 @@ import json
 import logging
 from datetime import date, datetime
 from decimal import Decimal, getcontext
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -53,6 +53,10 @@ class StreamWriter:
         self._messages = []
         self._partial_flush_count = 0
 
+        self._schema_keys = set(self._schema)
+        self._record_casts, self._column_casts = self._get_casts()
+        self._json_encoder = DictEncoder()
+
         logger.info(f"Creating StreamWriter for {self._database}:{self._table}")
 
     def _get_date_columns(self) -> List[str]:
@@ -106,15 +110,32 @@ class StreamWriter:
         Since the json schema is used to build the table and cast types correctly,
         we need to remove any unexpected properties that can't be casted accurately.
         """
-        schema_keys = self._schema.keys()
-        records_keys = record.keys()
-        difference = list(set(records_keys).difference(set(schema_keys)))
+        difference = [key for key in record if key not in self._schema_keys]
 
         for key in difference:
             del record[key]
 
         return record
 
+    def _get_casts(self) -> Tuple[List[Tuple[str, Dict[str, Any]]], Dict[str, Callable[[pd.Series], pd.Series]]]:
+        """
+        Helper that splits the top level keys between the ones cast record by record by `_json_schema_cast_value`,
+        and the ones cast column by column when flushing, which gives the same values as `_json_schema_cast_value`
+        at a fraction of the cost of parsing the dates and numbers one value at a time.
+        """
+        record_casts = []
+        column_casts = {}
+        for key, schema_entry in self._schema.items():
+            typ = self._get_json_schema_type(schema_entry.get("type"))
+            if typ == "string" and schema_entry.get("format") == "date-time":
+                column_casts[key] = lambda column: pd.to_datetime(column, errors="coerce", utc=True, format="mixed")
+            elif typ == "integer" or (typ == "number" and not self._config.glue_catalog_float_as_decimal):
+                column_casts[key] = lambda column: pd.to_numeric(column, errors="coerce")
+            else:
+                record_casts.append((key, schema_entry))
+
+        return record_casts, column_casts
+
     def _json_schema_cast_value(self, value, schema_entry) -> Any:
         typ = schema_entry.get("type")
         typ = self._get_json_schema_type(typ)
@@ -371,7 +392,9 @@ class StreamWriter:
 
     def append_message(self, message: Dict[str, Any]):
         clean_message = self._drop_additional_top_level_properties(message)
-        clean_message = self._json_schema_cast(clean_message)
+        # the dates and numbers at the top level are cast column by column on flush
+        for key, schema_entry in self._record_casts:
+            clean_message[key] = self._json_schema_cast_value(clean_message.get(key), schema_entry)
         self._messages.append(clean_message)
 
     def reset(self):
@@ -385,6 +408,9 @@ class StreamWriter:
         logger.debug(f"Flushing {len(self._messages)} messages to table {self._database}:{self._table}")
 
         df = pd.DataFrame(self._messages)
+        for col, cast in self._column_casts.items():
+            df[col] = cast(df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object))
+
         # best effort to convert pandas types
         df = df.astype(self._get_pandas_dtypes_from_json_schema(df), errors="ignore")
 
@@ -412,7 +438,7 @@ class StreamWriter:
         # so they can be queried with json_extract
         for col in json_casts:
             if col in df.columns:
-                df[col] = df[col].apply(lambda x: json.dumps(x, cls=DictEncoder))
+                df[col] = [self._json_encoder.encode(x) for x in df[col]]
 
         if self._sync_mode == DestinationSyncMode.overwrite and self._partial_flush_count < 1:
             logger.debug(f"Overwriting {len(df)} records to {self._database}:{self._table}")
@@ -6,9 +6,11 @@ import json
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Mapping
+from unittest.mock import MagicMock
 
 import numpy as np
 import pandas as pd
+import pytest
 from destination_aws_datalake import DestinationAwsDatalake
 from destination_aws_datalake.aws import AwsHandler
 from destination_aws_datalake.config_reader import ConnectorConfig
@@ -321,6 +323,39 @@ def test_append_messsage():
     assert writer._messages[0] == message
 
 
+@pytest.mark.parametrize("partitioning", ["NO PARTITIONING", "YEAR/MONTH/DAY", "DATE"])
+def test_flush_casts_columns_as_records(partitioning):
+    messages = [
+        {"string_col": "test", "int_col": 1, "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01", "extra": "x"},
+        {"string_col": "", "int_col": "2", "datetime_col": "2021-06-15T16:08:39-07:00", "date_col": None},
+        {"int_col": "not a number", "datetime_col": "not a date"},
+        {"string_col": "test", "int_col": None, "datetime_col": "", "date_col": "2021-01-03"},
+    ]
+
+    def flushed_dataframe(writer: StreamWriter) -> pd.DataFrame:
+        writer._aws_handler = MagicMock()
+        writer.flush()
+        df, _, _, dtype, partition_fields = writer._aws_handler.append.call_args.args
+        return df, dtype, partition_fields
+
+    writer = get_writer({**get_config(), "partitioning": partitioning})
+    for message in messages:
+        writer.append_message(dict(message))
+
+    # the values cast record by record, as before the dates and numbers were cast column by column
+    expected_writer = get_writer({**get_config(), "partitioning": partitioning})
+    expected_writer._column_casts = {}
+    for message in messages:
+        expected_writer._messages.append(expected_writer._json_schema_cast(expected_writer._drop_additional_top_level_properties(dict(message))))
+
+    df, dtype, partition_fields = flushed_dataframe(writer)
+    expected_df, expected_dtype, expected_partition_fields = flushed_dataframe(expected_writer)
+    assert sorted(df.columns) == sorted(expected_df.columns)
+    pd.testing.assert_frame_equal(df, expected_df[df.columns])
+    assert dtype == expected_dtype
+    assert partition_fields == expected_partition_fields
+
+
 def test_get_cursor_field():
     writer = get_writer(get_config())
     assert writer._cursor_fields == ["datetime_col"]
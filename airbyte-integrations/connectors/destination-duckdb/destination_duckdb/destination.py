@@ -21,6 +21,18 @@ logger = getLogger("airbyte")
 
 CONFIG_MOTHERDUCK_API_KEY = "motherduck_api_key"
 CONFIG_DEFAULT_SCHEMA = "main"
+# The records of a stream are written once either of the limits is reached, even before the next state message,
+# so the memory used by the buffer stays bounded for the sources emitting state messages rarely.
+MAX_STREAM_BATCH_SIZE = 50_000
+MAX_STREAM_BATCH_BYTES = 64 * 1024 * 1024
+
+RAW_TABLE_SCHEMA = pa.schema(
+    [
+        ("_airbyte_ab_id", pa.string()),
+        ("_airbyte_emitted_at", pa.string()),
+        ("_airbyte_data", pa.string()),
+    ]
+)
 
 
 def validated_sql_name(sql_name: Any) -> str:
@@ -111,6 +123,7 @@ class DestinationDuckdb(Destination):
             con.execute(query)
 
         buffer = defaultdict(lambda: defaultdict(list))
+        buffered_bytes = defaultdict(int)
 
         for message in input_messages:
             if message.type == Type.STATE:
@@ -120,6 +133,7 @@ class DestinationDuckdb(Destination):
                     DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
 
                 buffer = defaultdict(lambda: defaultdict(list))
+                buffered_bytes = defaultdict(int)
 
                 yield message
             elif message.type == Type.RECORD:
@@ -131,7 +145,18 @@ class DestinationDuckdb(Destination):
                 # add to buffer
                 buffer[stream_name]["_airbyte_ab_id"].append(str(uuid.uuid4()))
                 buffer[stream_name]["_airbyte_emitted_at"].append(datetime.datetime.now().isoformat())
-                buffer[stream_name]["_airbyte_data"].append(json.dumps(data))
+                serialized_data = json.dumps(data)
+                buffer[stream_name]["_airbyte_data"].append(serialized_data)
+                buffered_bytes[stream_name] += len(serialized_data.encode())
+
+                if (
+                    len(buffer[stream_name]["_airbyte_ab_id"]) >= MAX_STREAM_BATCH_SIZE
+                    or buffered_bytes[stream_name] >= MAX_STREAM_BATCH_BYTES
+                ):
+                    logger.info(f"flushing buffer for stream {stream_name} with {len(buffer[stream_name]['_airbyte_ab_id'])} records")
+                    DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
+                    del buffer[stream_name]
+                    del buffered_bytes[stream_name]
 
             else:
                 logger.info(f"Message type {message.type} not supported, skipping")
@@ -144,7 +169,7 @@ class DestinationDuckdb(Destination):
     def _safe_write(*, con: duckdb.DuckDBPyConnection, buffer: Dict[str, Dict[str, List[Any]]], schema_name: str, stream_name: str):
         table_name = f"_airbyte_raw_{stream_name}"
         try:
-            pa_table = pa.Table.from_pydict(buffer[stream_name])
+            pa_table = pa.Table.from_pydict(buffer[stream_name], schema=RAW_TABLE_SCHEMA)
         except:
             logger.exception(
                 f"Writing with pyarrow view failed, falling back to writing with executemany. Expect some performance degradation."
@@ -1,7 +1,23 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
+import tempfile
+from unittest.mock import patch
+
+import duckdb
 import pytest
-from destination_duckdb.destination import DestinationDuckdb, validated_sql_name
+from destination_duckdb.destination import CONFIG_DEFAULT_SCHEMA, DestinationDuckdb, validated_sql_name
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
 
 
 def test_read_invalid_path():
@@ -32,3 +48,52 @@ def test_validated_sql_name(input, expected):
             validated_sql_name(input)
     else:
         assert validated_sql_name(input) == expected
+
+
+@pytest.mark.parametrize(
+    "limit, value",
+    [
+        ("MAX_STREAM_BATCH_SIZE", 2),
+        # every serialized record is 9 bytes long
+        ("MAX_STREAM_BATCH_BYTES", 18),
+    ],
+    ids=["records", "bytes"],
+)
+def test_write_flushes_bounded_batches_before_state(limit, value):
+    db_path = f"{tempfile.mkdtemp()}/test.duckdb"
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="mystream", json_schema={"type": "object"}, supported_sync_modes=[SyncMode.incremental]),
+                sync_mode=SyncMode.incremental,
+                destination_sync_mode=DestinationSyncMode.append,
+            )
+        ]
+    )
+    flushed_records = []
+    written_records = []
+    original_safe_write = DestinationDuckdb._safe_write
+
+    def safe_write(**kwargs):
+        written_records.append(len(kwargs["buffer"][kwargs["stream_name"]]["_airbyte_ab_id"]))
+        original_safe_write(**kwargs)
+
+    def messages():
+        for i in range(5):
+            yield AirbyteMessage(
+                type=Type.RECORD, record=AirbyteRecordMessage(stream="mystream", data={"id": i}, emitted_at=0)
+            )
+            flushed_records.append(sum(written_records))
+        yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": 4}))
+
+    with patch.object(DestinationDuckdb, "_get_destination_path", return_value=db_path), patch(
+        "destination_duckdb.destination.MAX_STREAM_BATCH_SIZE", 2
+    ), patch.object(DestinationDuckdb, "_safe_write", side_effect=safe_write):
+        result = list(DestinationDuckdb().write({"schema": CONFIG_DEFAULT_SCHEMA}, catalog, messages()))
+
+    # the records are written every 2 records, without waiting for the state message
+    assert flushed_records == [0, 2, 2, 4, 4]
+    assert [message.type for message in result] == [Type.STATE]
+    with duckdb.connect(db_path) as con:
+        rows = con.execute(f"SELECT _airbyte_data FROM {CONFIG_DEFAULT_SCHEMA}._airbyte_raw_mystream").fetchall()
+    assert sorted(row[0] for row in rows) == [f'{{"id": {i}}}' for i in range(5)]
@@ -9,9 +9,10 @@ import os
 import re
 import uuid
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from logging import getLogger
-from typing import Any, Dict, Iterable, List, Mapping, cast
+from typing import Any, Callable, Dict, Iterable, List, Mapping, cast
 from urllib.parse import urlparse
 
 import orjson
@@ -233,83 +234,109 @@ class DestinationMotherDuck(Destination):
         for configured_stream in configured_catalog.streams:
             processor.prepare_stream_table(stream_name=configured_stream.stream.name, sync_mode=configured_stream.destination_sync_mode)
 
-        buffer: dict[str, dict[str, list[Any]]] = defaultdict(lambda: defaultdict(list))
+        # The columns of the stream don't change during the sync, so they are resolved only once per stream.
+        data_columns: dict[str, list[str]] = {
+            stream_name: [
+                column_name for column_name in processor._get_sql_column_definitions(stream_name) if column_name not in AB_INTERNAL_COLUMNS
+            ]
+            for stream_name in streams
+        }
+        buffer: dict[str, dict[str, list[Any]]] = {}
+        column_appenders: dict[str, list[tuple[str, Callable[[Any], None]]]] = {}
         records_buffered: dict[str, int] = defaultdict(int)
         records_processed: dict[str, int] = defaultdict(int)
         records_since_last_checkpoint: dict[str, int] = defaultdict(int)
         legacy_state_messages: list[AirbyteMessage] = []
-        for message in input_messages:
-            if message.type == Type.STATE and message.state is not None:
-                if message.state.stream is None:
-                    logger.warning("Cannot process legacy state message, skipping.")
-                    # Hold until the end of the stream, and then yield them all at once.
-                    legacy_state_messages.append(message)
-                    continue
-                stream_name = message.state.stream.stream_descriptor.name
-                _ = message.state.stream.stream_descriptor.namespace  # Unused currently
-                # flush the buffer
-                self._flush_buffer(
-                    buffer=buffer,
-                    configured_catalog=configured_catalog,
-                    db_path=path,
-                    schema_name=schema_name,
-                    motherduck_api_key=motherduck_api_key,
-                    stream_name=stream_name,
-                )
-                buffer = defaultdict(lambda: defaultdict(list))
-                records_buffered[stream_name] = 0
-
-                # Annotate the state message with the number of records processed
-                message.state.destinationStats = AirbyteStateStats(
-                    recordCount=records_since_last_checkpoint[stream_name],
-                )
-                records_since_last_checkpoint[stream_name] = 0
-
-                yield message
-            elif message.type == Type.RECORD and message.record is not None:
-                data = message.record.data
-                stream_name = message.record.stream
-                if stream_name not in streams:
-                    logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
-                    continue
-                # add to buffer
-                record_meta: dict[str, str] = {}
-                for column_name in processor._get_sql_column_definitions(stream_name):
-                    if column_name in data:
-                        buffer[stream_name][column_name].append(data[column_name])
-                    elif column_name not in AB_INTERNAL_COLUMNS:
-                        buffer[stream_name][column_name].append(None)
-
-                buffer[stream_name][AB_RAW_ID_COLUMN].append(str(uuid.uuid4()))
-                buffer[stream_name][AB_EXTRACTED_AT_COLUMN].append(datetime.datetime.now().isoformat())
-                buffer[stream_name][AB_META_COLUMN].append(json.dumps(record_meta))
-                records_buffered[stream_name] += 1
-                records_since_last_checkpoint[stream_name] += 1
-
-                if records_buffered[stream_name] >= MAX_STREAM_BATCH_SIZE:
-                    logger.info(
-                        f"Loading {records_buffered[stream_name]:,} records from '{stream_name}' stream buffer...",
-                    )
+        record_meta = json.dumps({})
+
+        # The full buffers are loaded on the background thread, while the next ones are filled.
+        # The single worker keeps the loads in order, and at most one buffer waits to be loaded.
+        flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="motherduck-flush")
+        pending_flush: Future[None] | None = None
+        try:
+            for message in input_messages:
+                if message.type == Type.STATE and message.state is not None:
+                    if message.state.stream is None:
+                        logger.warning("Cannot process legacy state message, skipping.")
+                        # Hold until the end of the stream, and then yield them all at once.
+                        legacy_state_messages.append(message)
+                        continue
+                    stream_name = message.state.stream.stream_descriptor.name
+                    _ = message.state.stream.stream_descriptor.namespace  # Unused currently
+                    # the records preceding the state message must be loaded before it's emitted
+                    if pending_flush is not None:
+                        pending_flush.result()
+                        pending_flush = None
+                    # flush the buffer
                     self._flush_buffer(
                         buffer=buffer,
                         configured_catalog=configured_catalog,
-                        db_path=path,
-                        schema_name=schema_name,
-                        motherduck_api_key=motherduck_api_key,
+                        processor=processor,
                         stream_name=stream_name,
                     )
-                    buffer = defaultdict(lambda: defaultdict(list))
-                    records_processed[stream_name] += records_buffered[stream_name]
+                    buffer.pop(stream_name, None)
                     records_buffered[stream_name] = 0
-                    logger.info(
-                        f"Records loaded successfully. Total '{stream_name}' records processed: {records_processed[stream_name]:,}",
+
+                    # Annotate the state message with the number of records processed
+                    message.state.destinationStats = AirbyteStateStats(
+                        recordCount=records_since_last_checkpoint[stream_name],
                     )
+                    records_since_last_checkpoint[stream_name] = 0
+
+                    yield message
+                elif message.type == Type.RECORD and message.record is not None:
+                    data = message.record.data
+                    stream_name = message.record.stream
+                    if stream_name not in streams:
+                        logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
+                        continue
+                    # add to buffer
+                    if stream_name not in buffer:
+                        buffer[stream_name] = {
+                            column_name: [] for column_name in [*data_columns[stream_name], AB_RAW_ID_COLUMN, AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN]
+                        }
+                        column_appenders[stream_name] = [
+                            (column_name, buffer[stream_name][column_name].append) for column_name in data_columns[stream_name]
+                        ]
+                    for column_name, append in column_appenders[stream_name]:
+                        append(data.get(column_name))
+
+                    buffer[stream_name][AB_RAW_ID_COLUMN].append(str(uuid.uuid4()))
+                    buffer[stream_name][AB_EXTRACTED_AT_COLUMN].append(datetime.datetime.now().isoformat())
+                    buffer[stream_name][AB_META_COLUMN].append(record_meta)
+                    records_buffered[stream_name] += 1
+                    records_since_last_checkpoint[stream_name] += 1
+
+                    if records_buffered[stream_name] >= MAX_STREAM_BATCH_SIZE:
+                        if pending_flush is not None:
+                            pending_flush.result()
+                        logger.info(
+                            f"Loading {records_buffered[stream_name]:,} records from '{stream_name}' stream buffer...",
+                        )
+                        pending_flush = flush_executor.submit(
+                            self._flush_buffer,
+                            buffer={stream_name: buffer.pop(stream_name)},
+                            configured_catalog=configured_catalog,
+                            processor=processor,
+                            stream_name=stream_name,
+                        )
+                        records_processed[stream_name] += records_buffered[stream_name]
+                        records_buffered[stream_name] = 0
+                        logger.info(
+                            f"Records submitted for loading. Total '{stream_name}' records processed: {records_processed[stream_name]:,}",
+                        )
+
+                else:
+                    logger.info(f"Message type {message.type} not supported, skipping")
 
-            else:
-                logger.info(f"Message type {message.type} not supported, skipping")
+            if pending_flush is not None:
+                pending_flush.result()
+                pending_flush = None
+        finally:
+            flush_executor.shutdown(wait=True)
 
         # flush any remaining messages
-        self._flush_buffer(buffer, configured_catalog, path, schema_name, motherduck_api_key)
+        self._flush_buffer(buffer, configured_catalog, processor)
         if legacy_state_messages:
             # Save to emit these now, since we've finished processing the stream.
             yield from legacy_state_messages
@@ -318,9 +345,7 @@ class DestinationMotherDuck(Destination):
         self,
         buffer: Dict[str, Dict[str, List[Any]]],
         configured_catalog: ConfiguredAirbyteCatalog,
-        db_path: str,
-        schema_name: str,
-        motherduck_api_key: str,
+        processor: DuckDBSqlProcessor | MotherDuckSqlProcessor,
         stream_name: str | None = None,
     ) -> None:
         """
@@ -330,9 +355,6 @@ class DestinationMotherDuck(Destination):
         """
         for configured_stream in configured_catalog.streams:
             if (stream_name is None or stream_name == configured_stream.stream.name) and buffer.get(configured_stream.stream.name):
-                processor = self._get_sql_processor(
-                    configured_catalog=configured_catalog, schema_name=schema_name, db_path=db_path, motherduck_token=motherduck_api_key
-                )
                 processor.write_stream_data_from_buffer(buffer, configured_stream.stream.name, configured_stream.destination_sync_mode)
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
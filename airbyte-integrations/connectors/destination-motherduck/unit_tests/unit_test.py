@@ -1,8 +1,25 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
-import pytest
-from destination_motherduck.destination import DestinationMotherDuck, UnicodeAwareNormalizer, validated_sql_name
+import tempfile
+from unittest.mock import patch
 
+import pytest
+from destination_motherduck.destination import CONFIG_DEFAULT_SCHEMA, DestinationMotherDuck, UnicodeAwareNormalizer, validated_sql_name
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStream,
+    AirbyteStreamState,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    StreamDescriptor,
+    SyncMode,
+    Type,
+)
 from airbyte_cdk.sql._util.name_normalizers import LowerCaseNormalizer
 from airbyte_cdk.sql.exceptions import AirbyteNameNormalizationError
 
@@ -37,6 +54,63 @@ def test_validated_sql_name(input, expected):
         assert validated_sql_name(input) == expected
 
 
+def _configured_stream(name: str) -> ConfiguredAirbyteStream:
+    return ConfiguredAirbyteStream(
+        stream=AirbyteStream(
+            name=name,
+            json_schema={"type": "object", "properties": {"id": {"type": "integer"}, "value": {"type": "string"}}},
+            supported_sync_modes=[SyncMode.incremental],
+        ),
+        sync_mode=SyncMode.incremental,
+        destination_sync_mode=DestinationSyncMode.append,
+    )
+
+
+def _record(stream: str, record_id: int) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=Type.RECORD,
+        record=AirbyteRecordMessage(stream=stream, data={"id": record_id, "value": f"{stream}_{record_id}"}, emitted_at=0),
+    )
+
+
+def _state(stream: str) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=Type.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream), stream_state={"id": 1}),
+        ),
+    )
+
+
+def test_write_flushes_interleaved_streams_with_a_single_processor():
+    db_path = f"{tempfile.mkdtemp()}/test.duckdb"
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream("first"), _configured_stream("second")])
+    messages = [
+        _record("first", 1),
+        _record("second", 1),
+        _record("first", 2),
+        _record("first", 3),
+        # the state message of the first stream must not drop the buffered records of the second stream
+        _state("first"),
+        _record("second", 2),
+        _record("second", 3),
+        _record("first", 4),
+    ]
+    destination = DestinationMotherDuck()
+    with patch.object(DestinationMotherDuck, "_get_destination_path", return_value=db_path), patch(
+        "destination_motherduck.destination.MAX_STREAM_BATCH_SIZE", 2
+    ), patch.object(DestinationMotherDuck, "_get_sql_processor", wraps=destination._get_sql_processor) as get_sql_processor:
+        result = list(destination.write({"schema": CONFIG_DEFAULT_SCHEMA}, catalog, messages))
+        get_sql_processor.assert_called_once()
+
+    assert [message.state.destinationStats.recordCount for message in result] == [3]
+    processor = destination._get_sql_processor(configured_catalog=catalog, schema_name=CONFIG_DEFAULT_SCHEMA, db_path=db_path)
+    for stream, record_ids in [("first", range(1, 5)), ("second", range(1, 4))]:
+        rows = processor._execute_sql(f"SELECT value FROM {CONFIG_DEFAULT_SCHEMA}.{stream} ORDER BY id")
+        assert [row[0] for row in rows] == [f"{stream}_{record_id}" for record_id in record_ids]
+
+
 class TestUnicodeAwareNormalizer:
     """Test the UnicodeAwareNormalizer that preserves Unicode characters."""
 
@@ -3,16 +3,21 @@
 
 from __future__ import annotations
 
+import gzip
+import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from textwrap import dedent
-from typing import Any
+from typing import Any, Iterator
 
 import dpath
 import sqlalchemy
 from airbyte._processors.file.jsonl import JsonlWriter
 from airbyte.secrets import SecretString
 from airbyte_cdk.destinations.vector_db_based import embedder
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
 from airbyte_cdk.destinations.vector_db_based.document_processor import (
     DocumentProcessor as DocumentSplitter,
 )
@@ -60,6 +65,55 @@ class PostgresConfig(SqlConfig):
         return self.database
 
 
+class _CopyTextReader:
+    """A file-like reader of the JSONL batch files, in the text format of the Postgres `COPY` command.
+
+    The files are read line by line, so only the lines requested by `read()` are kept in memory.
+    """
+
+    def __init__(self, files: list[Path], columns: list[str]) -> None:
+        self._lines = self._iter_lines(files, columns)
+        self._buffer = b""
+
+    @staticmethod
+    def _to_copy_text(value: Any) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, separators=(",", ":"))
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+            .replace("\t", "\\t")
+        )
+
+    def _iter_lines(self, files: list[Path], columns: list[str]) -> Iterator[bytes]:
+        for file_path in files:
+            with gzip.open(file_path, "rt") as file:
+                for line in file:
+                    record = json.loads(line)
+                    yield (
+                        "\t".join(self._to_copy_text(record.get(column)) for column in columns) + "\n"
+                    ).encode()
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the `COPY` data, or an empty string at the end."""
+        parts, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = b"".join(parts)
+        if size < 0:
+            size = length
+        data, self._buffer = data[:size], data[size:]
+        return data
+
+
 class EmbeddingConfig(Protocol):
     """A protocol for embedding configuration.
 
@@ -84,6 +138,15 @@ class PGVectorProcessor(SqlProcessorBase):
 
     file_writer_class = JsonlWriter
 
+    embedding_batch_size: int = 256
+    """The max number of chunks embedded by a single embedder call."""
+
+    embedding_concurrency: int = 4
+    """The max number of embedder calls running at the same time."""
+
+    copy_buffer_size: int = 8 * 1024 * 1024
+    """The max number of bytes sent to the database at once while loading the batch files."""
+
     # No need to override `type_converter_class`.
 
     def __init__(
@@ -98,6 +161,7 @@ class PGVectorProcessor(SqlProcessorBase):
         """Initialize the PGVector processor."""
         self.splitter_config = splitter_config
         self.embedder_config = embedder_config
+        self._pending_chunks: list[tuple[AirbyteRecordMessage, Chunk]] = []
         super().__init__(
             sql_config=sql_config,
             catalog_provider=catalog_provider,
@@ -122,6 +186,43 @@ class PGVectorProcessor(SqlProcessorBase):
             EMBEDDING_COLUMN: Vector(self.embedding_dimensions),
         }
 
+    @overrides
+    def _write_files_to_new_table(
+        self,
+        files: list[Path],
+        stream_name: str,
+        batch_id: str,
+    ) -> str:
+        """Write files to a new table with the Postgres `COPY FROM STDIN` command.
+
+        The batch files are streamed to the database as they are read, instead of being loaded into
+        dataframes and inserted row by row, so the memory usage is bounded by `copy_buffer_size`.
+        """
+        temp_table_name = self._create_table_for_loading(
+            stream_name=stream_name,
+            batch_id=batch_id,
+        )
+        columns_list: list[str] = list(
+            self._get_sql_column_definitions(stream_name=stream_name).keys()
+        )
+        copy_statement = (
+            f"COPY {self._fully_qualified(temp_table_name)} "
+            f"({', '.join(self._quote_identifier(column) for column in columns_list)}) "
+            "FROM STDIN"
+        )
+        with self.get_sql_connection() as conn:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    copy_statement,
+                    _CopyTextReader(files, columns_list),
+                    size=self.copy_buffer_size,
+                )
+            finally:
+                cursor.close()
+
+        return temp_table_name
+
     def _emulated_merge_temp_table_to_final_table(
         self,
         stream_name: str,
@@ -174,44 +275,80 @@ class PGVectorProcessor(SqlProcessorBase):
         We override the SQLProcessor implementation in order to handle chunking, embedding, etc.
 
         This method is called for each record message, before the record is written to local file.
+        The chunks are accumulated across the records, and embedded in batches once there are
+        enough of them to keep all the concurrent embedder calls busy.
         """
         document_chunks, id_to_delete = self.splitter.process(record_msg)
 
         _ = id_to_delete  # unused
 
-        embeddings = self.embedder.embed_documents(
-            documents=document_chunks,
-        )
-        for i, chunk in enumerate(document_chunks, start=0):
-            new_data: dict[str, Any] = {
-                DOCUMENT_ID_COLUMN: self._create_document_id(record_msg),
-                CHUNK_ID_COLUMN: str(uuid.uuid4().int),
-                METADATA_COLUMN: chunk.metadata,
-                DOCUMENT_CONTENT_COLUMN: chunk.page_content,
-                EMBEDDING_COLUMN: embeddings[i],
-            }
-
-            self.file_writer.process_record_message(
-                record_msg=AirbyteRecordMessage(
-                    namespace=record_msg.namespace,
-                    stream=record_msg.stream,
-                    data=new_data,
-                    emitted_at=record_msg.emitted_at,
-                ),
-                stream_schema={
-                    "type": "object",
-                    "properties": {
-                        DOCUMENT_ID_COLUMN: {"type": "string"},
-                        CHUNK_ID_COLUMN: {"type": "string"},
-                        METADATA_COLUMN: {"type": "object"},
-                        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
-                        EMBEDDING_COLUMN: {
-                            "type": "array",
-                            "items": {"type": "float"},
-                        },
+        self._pending_chunks.extend((record_msg, chunk) for chunk in document_chunks)
+        if len(self._pending_chunks) >= self.embedding_batch_size * self.embedding_concurrency:
+            self._write_pending_chunks()
+
+    @overrides
+    def _before_finalize(self) -> None:
+        """Embed and write the pending chunks, so they are committed before the state messages covering them."""
+        self._write_pending_chunks()
+
+    def _write_pending_chunks(self) -> None:
+        """Embed the pending chunks in concurrent batches and write them to the local files.
+
+        The chunks are written in the order they were received, no matter which batch is embedded first.
+        """
+        pending_chunks, self._pending_chunks = self._pending_chunks, []
+        if not pending_chunks:
+            return
+
+        batches = [
+            pending_chunks[i : i + self.embedding_batch_size]
+            for i in range(0, len(pending_chunks), self.embedding_batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=min(self.embedding_concurrency, len(batches))) as executor:
+            batches_embeddings = executor.map(
+                lambda batch: self.embedder.embed_documents(documents=[chunk for _, chunk in batch]),
+                batches,
+            )
+            for batch, embeddings in zip(batches, batches_embeddings):
+                for (record_msg, chunk), embedding in zip(batch, embeddings):
+                    self._write_chunk(record_msg, chunk, embedding)
+
+    def _write_chunk(
+        self,
+        record_msg: AirbyteRecordMessage,
+        chunk: Chunk,
+        embedding: list[float] | None,
+    ) -> None:
+        """Write the embedded chunk of the record to the local file."""
+        new_data: dict[str, Any] = {
+            DOCUMENT_ID_COLUMN: self._create_document_id(record_msg),
+            CHUNK_ID_COLUMN: str(uuid.uuid4().int),
+            METADATA_COLUMN: chunk.metadata,
+            DOCUMENT_CONTENT_COLUMN: chunk.page_content,
+            EMBEDDING_COLUMN: embedding,
+        }
+
+        self.file_writer.process_record_message(
+            record_msg=AirbyteRecordMessage(
+                namespace=record_msg.namespace,
+                stream=record_msg.stream,
+                data=new_data,
+                emitted_at=record_msg.emitted_at,
+            ),
+            stream_schema={
+                "type": "object",
+                "properties": {
+                    DOCUMENT_ID_COLUMN: {"type": "string"},
+                    CHUNK_ID_COLUMN: {"type": "string"},
+                    METADATA_COLUMN: {"type": "object"},
+                    DOCUMENT_CONTENT_COLUMN: {"type": "string"},
+                    EMBEDDING_COLUMN: {
+                        "type": "array",
+                        "items": {"type": "float"},
                     },
                 },
-            )
+            },
+        )
 
     def _add_missing_columns_to_table(
         self,
@@ -224,8 +361,9 @@ class PGVectorProcessor(SqlProcessorBase):
         """
         pass
 
-    @property
+    @cached_property
     def embedder(self) -> embedder.Embedder:
+        """The embedder, created once and shared by all the embedder calls."""
         return embedder.create_from_config(
             embedding_config=self.embedder_config,  # type: ignore [arg-type]  # No common base class
             processing_config=self.splitter_config,
@@ -236,8 +374,9 @@ class PGVectorProcessor(SqlProcessorBase):
         """Return the number of dimensions for the embeddings."""
         return self.embedder.embedding_dimensions
 
-    @property
+    @cached_property
     def splitter(self) -> DocumentSplitter:
+        """The document splitter, created once and reused for all the records."""
         return DocumentSplitter(
             config=self.splitter_config,
             catalog=self.catalog_provider.configured_catalog,
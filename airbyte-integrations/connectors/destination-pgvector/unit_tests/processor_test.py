@@ -0,0 +1,223 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from airbyte.strategies import WriteStrategy
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStream,
+    AirbyteStreamState,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    StreamDescriptor,
+    SyncMode,
+    Type,
+)
+
+from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
+from destination_pgvector.config import ConfigModel
+from destination_pgvector.globals import (
+    CHUNK_ID_COLUMN,
+    DOCUMENT_CONTENT_COLUMN,
+    DOCUMENT_ID_COLUMN,
+    EMBEDDING_COLUMN,
+    METADATA_COLUMN,
+)
+from destination_pgvector.pgvector_processor import PGVectorProcessor, PostgresConfig
+
+
+class TestPGVectorProcessor(unittest.TestCase):
+    def setUp(self):
+        config = ConfigModel.parse_obj(
+            {
+                "processing": {"text_fields": ["str_col"], "metadata_fields": [], "chunk_size": 1000},
+                "embedding": {"mode": "fake"},
+                "indexing": {
+                    "host": "MYACCOUNT",
+                    "port": 5432,
+                    "database": "MYDATABASE",
+                    "default_schema": "MYSCHEMA",
+                    "username": "MYUSERNAME",
+                    "credentials": {"password": "xxxxxxx"},
+                },
+            }
+        )
+        catalog = ConfiguredAirbyteCatalog(
+            streams=[
+                ConfiguredAirbyteStream(
+                    stream=AirbyteStream(
+                        name="mystream",
+                        json_schema={"type": "object", "properties": {"str_col": {"type": "string"}}},
+                        supported_sync_modes=[SyncMode.full_refresh],
+                    ),
+                    sync_mode=SyncMode.full_refresh,
+                    destination_sync_mode=DestinationSyncMode.overwrite,
+                )
+            ]
+        )
+        with patch.object(PGVectorProcessor, "_ensure_schema_exists"):
+            self.processor = PGVectorProcessor(
+                sql_config=PostgresConfig(
+                    host="MYACCOUNT",
+                    port=5432,
+                    database="MYDATABASE",
+                    schema_name="MYSCHEMA",
+                    username="MYUSERNAME",
+                    password="xxxxxxx",
+                ),
+                splitter_config=config.processing,
+                embedder_config=config.embedding,
+                catalog_provider=CatalogProvider(catalog),
+                temp_dir=Path(tempfile.mkdtemp()),
+            )
+        self.processor.file_writer = MagicMock()
+        self.processor.splitter = MagicMock()
+        self.processor.splitter.process.side_effect = lambda record: (
+            [Chunk(page_content=record.data["str_col"], metadata={}, record=record)],
+            None,
+        )
+        self.processor.embedder = MagicMock()
+        self.processor.embedder.embed_documents.side_effect = lambda documents: [[0.1]] * len(documents)
+        self.processor.embedding_batch_size = 3
+        self.processor.embedding_concurrency = 2
+
+    def _process_records(self, number_of_records: int) -> None:
+        for i in range(number_of_records):
+            self.processor.process_record_message(
+                AirbyteRecordMessage(stream="mystream", data={"str_col": f"text {i}"}, emitted_at=0),
+                stream_schema={},
+            )
+
+    def _written_contents(self) -> list:
+        return [
+            call.kwargs["record_msg"].data[DOCUMENT_CONTENT_COLUMN]
+            for call in self.processor.file_writer.process_record_message.call_args_list
+        ]
+
+    def test_chunks_are_embedded_in_batches(self):
+        embed_documents = self.processor.embedder.embed_documents
+        self._process_records(5)
+        # not enough chunks for all the concurrent batches yet
+        embed_documents.assert_not_called()
+        self.processor.file_writer.process_record_message.assert_not_called()
+
+        self._process_records(3)
+        self.assertEqual([len(call.kwargs["documents"]) for call in embed_documents.call_args_list], [3, 3])
+        self.assertEqual(self._written_contents(), [f"text {i}" for i in range(5)] + ["text 0"])
+
+        with patch.object(self.processor, "write_stream_data") as write_stream_data:
+            self.processor.write_all_stream_data(write_strategy=WriteStrategy.AUTO)
+        write_stream_data.assert_called_once()
+        self.assertEqual([len(call.kwargs["documents"]) for call in embed_documents.call_args_list], [3, 3, 2])
+
+        self.assertEqual(self._written_contents(), [f"text {i}" for i in range(5)] + [f"text {i}" for i in range(3)])
+        written_embeddings = [
+            call.kwargs["record_msg"].data[EMBEDDING_COLUMN] for call in self.processor.file_writer.process_record_message.call_args_list
+        ]
+        self.assertEqual(written_embeddings, [[0.1]] * 8)
+
+    def test_pending_chunks_are_written_before_their_state_is_emitted(self):
+        written_before_finalization = []
+
+        def write_stream_data(stream_name, write_strategy):
+            written_before_finalization.append(self._written_contents())
+            self.processor._finalize_state_messages(self.processor._pending_state_messages.pop(stream_name, []))
+            return []
+
+        def messages():
+            yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="mystream", data={"str_col": "text 0"}, emitted_at=0))
+            yield AirbyteMessage(
+                type=Type.STATE,
+                state=AirbyteStateMessage(
+                    type=AirbyteStateType.STREAM,
+                    stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name="mystream"), stream_state={"cursor": 0}),
+                ),
+            )
+            yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="mystream", data={"str_col": "text 1"}, emitted_at=0))
+
+        self.processor.finalize_after_records = 2
+        self.processor.finalize_after_seconds = None
+        with patch.object(self.processor, "write_stream_data", side_effect=write_stream_data), patch.object(
+            self.processor, "_state_writer", None
+        ):
+            output = self.processor.process_airbyte_messages_as_generator(messages(), write_strategy=WriteStrategy.APPEND)
+            state_message = next(output)
+            output.close()
+
+        # the chunks are fewer than the embedding batch threshold, but they are written before the state is emitted
+        self.assertEqual(state_message.stream.stream_state.cursor, 0)
+        self.assertEqual(written_before_finalization, [["text 0", "text 1"]])
+
+    def test_embedder_and_splitter_are_created_once(self):
+        del self.processor.embedder, self.processor.splitter
+        with patch("destination_pgvector.pgvector_processor.embedder.create_from_config") as create_embedder, patch(
+            "destination_pgvector.pgvector_processor.DocumentSplitter"
+        ) as create_splitter:
+            self.assertIs(self.processor.embedder, self.processor.embedder)
+            self.assertIs(self.processor.splitter, self.processor.splitter)
+        create_embedder.assert_called_once()
+        create_splitter.assert_called_once()
+
+    def test_files_are_copied_to_new_table(self):
+        file_path = Path(tempfile.mkdtemp()) / "batch.jsonl.gz"
+        with gzip.open(file_path, "wt") as file:
+            for i in range(3):
+                record = {
+                    "_airbyte_raw_id": f"raw_{i}",
+                    DOCUMENT_ID_COLUMN: f"doc_{i}",
+                    CHUNK_ID_COLUMN: str(i),
+                    METADATA_COLUMN: {"path": "a\\b"},
+                    DOCUMENT_CONTENT_COLUMN: "line\twith\ttabs\nand newlines" if i == 1 else None,
+                    EMBEDDING_COLUMN: [0.1, 0.2],
+                }
+                file.write(json.dumps(record) + "\n")
+
+        copied = []
+
+        def copy_expert(statement, file, size):
+            while data := file.read(size):
+                self.assertLessEqual(len(data), size)
+                copied.append(data)
+
+        self.processor.copy_buffer_size = 16
+        connection = MagicMock()
+        connection.connection.cursor.return_value.copy_expert.side_effect = copy_expert
+        with patch.object(self.processor, "_create_table_for_loading", return_value="mystream_temp"), patch.object(
+            self.processor, "get_sql_connection"
+        ) as get_sql_connection:
+            get_sql_connection.return_value.__enter__.return_value = connection
+            temp_table_name = self.processor._write_files_to_new_table(files=[file_path], stream_name="mystream", batch_id="1")
+
+        self.assertEqual(temp_table_name, "mystream_temp")
+        statement = connection.connection.cursor.return_value.copy_expert.call_args.args[0]
+        self.assertEqual(
+            statement,
+            'COPY MYSCHEMA."mystream_temp" ("document_id", "chunk_id", "metadata", "document_content", "embedding") FROM STDIN',
+        )
+        self.assertEqual(
+            b"".join(copied).decode().splitlines(),
+            [
+                'doc_0\t0\t{"path":"a\\\\\\\\b"}\t\\N\t[0.1,0.2]',
+                'doc_1\t1\t{"path":"a\\\\\\\\b"}\tline\\twith\\ttabs\\nand newlines\t[0.1,0.2]',
+                'doc_2\t2\t{"path":"a\\\\\\\\b"}\t\\N\t[0.1,0.2]',
+            ],
+        )
+        connection.connection.cursor.return_value.close.assert_called_once()
+
+    def test_replaced_stream_is_finalized_at_the_end(self):
+        # the stream is configured to overwrite its final table
+        self.assertFalse(self.processor._finalizes_during_sync("mystream", write_strategy=WriteStrategy.AUTO))
+        self.assertFalse(self.processor._finalizes_during_sync("mystream", write_strategy=WriteStrategy.REPLACE))
+        self.assertTrue(self.processor._finalizes_during_sync("mystream", write_strategy=WriteStrategy.APPEND))
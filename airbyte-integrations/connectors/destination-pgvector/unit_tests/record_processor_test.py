@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import unittest
+from collections import defaultdict
+
+from airbyte.strategies import WriteStrategy
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStream,
+    AirbyteStreamState,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    StreamDescriptor,
+    SyncMode,
+    Type,
+)
+
+from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
+from destination_pgvector.common.destinations.record_processor import RecordProcessorBase
+from destination_pgvector.common.state.state_writers import StateWriterBase
+
+
+class InMemoryStateWriter(StateWriterBase):
+    def __init__(self) -> None:
+        self.states = []
+
+    def write_state(self, state_message: AirbyteStateMessage) -> None:
+        self.states.append(state_message)
+
+
+class InMemoryRecordProcessor(RecordProcessorBase):
+    """Commits the records of each stream to the list, along with the state messages following them."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.pending_records = defaultdict(list)
+        self.committed_records = []
+        self.finalizations = 0
+
+    def process_record_message(self, record_msg: AirbyteRecordMessage, stream_schema: dict) -> None:
+        self.pending_records[record_msg.stream].append(record_msg.data["id"])
+
+    def write_stream_data(self, stream_name: str, write_strategy: WriteStrategy) -> list:
+        if self.pending_records[stream_name]:
+            self.finalizations += 1
+        self.committed_records += self.pending_records.pop(stream_name, [])
+        self._finalize_state_messages(self._pending_state_messages.pop(stream_name, []))
+        return []
+
+
+def _stream(name: str, destination_sync_mode: DestinationSyncMode) -> ConfiguredAirbyteStream:
+    return ConfiguredAirbyteStream(
+        stream=AirbyteStream(name=name, json_schema={"type": "object"}, supported_sync_modes=[SyncMode.incremental]),
+        sync_mode=SyncMode.incremental,
+        destination_sync_mode=destination_sync_mode,
+    )
+
+
+def _record(record_id: int, stream: str = "mystream") -> AirbyteMessage:
+    return AirbyteMessage(
+        type=Type.RECORD,
+        record=AirbyteRecordMessage(stream=stream, data={"id": record_id}, emitted_at=0),
+    )
+
+
+def _stream_state(cursor: int, stream: str = "mystream") -> AirbyteMessage:
+    return AirbyteMessage(
+        type=Type.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream), stream_state={"cursor": cursor}),
+        ),
+    )
+
+
+def _global_state(cursor: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(type=AirbyteStateType.GLOBAL, data={"cursor": cursor}))
+
+
+class TestRecordProcessorBase(unittest.TestCase):
+    def setUp(self):
+        catalog = ConfiguredAirbyteCatalog(
+            streams=[_stream("mystream", DestinationSyncMode.append), _stream("replaced", DestinationSyncMode.overwrite)]
+        )
+        self.state_writer = InMemoryStateWriter()
+        self.processor = InMemoryRecordProcessor(catalog_provider=CatalogProvider(catalog), state_writer=self.state_writer)
+        self.processor.finalize_after_seconds = None
+
+    def test_state_messages_are_yielded_once_their_records_are_committed(self):
+        self.processor.finalize_after_records = 2
+        committed_when_yielded = []
+
+        def messages():
+            yield _record(1)
+            yield _stream_state(1)
+            yield _record(2)
+            yield _stream_state(2)
+            yield _record(3)
+            yield _stream_state(3)
+
+        for state in self.processor.process_airbyte_messages_as_generator(messages(), write_strategy=WriteStrategy.APPEND):
+            committed_when_yielded.append((state.stream.stream_state.cursor, list(self.processor.committed_records)))
+
+        # the threshold is reached with the record 2, so only the state message preceding it is committed with it
+        self.assertEqual(committed_when_yielded, [(1, [1, 2]), (3, [1, 2, 3])])
+        self.assertEqual(self.processor.finalizations, 2)
+        self.assertEqual([state.stream.stream_state.cursor for state in self.state_writer.states], [1, 3])
+
+    def test_finalization_is_deferred_to_the_end_when_disabled(self):
+        self.processor.finalize_after_records = None
+
+        states = list(
+            self.processor.process_airbyte_messages_as_generator(
+                [_record(1), _stream_state(1), _record(2), _stream_state(2)], write_strategy=WriteStrategy.APPEND
+            )
+        )
+
+        self.assertEqual([state.stream.stream_state.cursor for state in states], [2])
+        self.assertEqual(self.processor.finalizations, 1)
+
+    def test_finalization_after_seconds(self):
+        self.processor.finalize_after_records = None
+        self.processor.finalize_after_seconds = 0
+
+        states = list(
+            self.processor.process_airbyte_messages_as_generator(
+                [_record(1), _stream_state(1), _stream_state(2)], write_strategy=WriteStrategy.APPEND
+            )
+        )
+
+        # the record is finalized after it is received, the following state messages don't trigger another finalization
+        self.assertEqual([state.stream.stream_state.cursor for state in states], [2])
+        self.assertEqual(self.processor.finalizations, 1)
+
+    def test_global_state_messages_are_finalized(self):
+        catalog = ConfiguredAirbyteCatalog(streams=[_stream("mystream", DestinationSyncMode.append)])
+        self.processor = InMemoryRecordProcessor(catalog_provider=CatalogProvider(catalog), state_writer=self.state_writer)
+        self.processor.finalize_after_records = 1
+        self.processor.finalize_after_seconds = None
+
+        states = list(
+            self.processor.process_airbyte_messages_as_generator(
+                [_record(1), _global_state(1), _record(2), _global_state(2)], write_strategy=WriteStrategy.APPEND
+            )
+        )
+
+        self.assertEqual([state.data for state in states], [{"cursor": 1}, {"cursor": 2}])
+
+    def test_replaced_streams_are_finalized_at_the_end(self):
+        self.processor.finalize_after_records = 1
+        messages = [_record(1, stream="replaced"), _stream_state(1, stream="replaced"), _record(2), _global_state(2), _record(3)]
+
+        committed_during_sync = [
+            list(self.processor.committed_records)
+            for _ in self.processor._process_airbyte_messages(messages, write_strategy=WriteStrategy.AUTO)
+        ]
+
+        # the records of the replaced stream are not counted towards the threshold, nor committed before the end of the input
+        self.assertEqual(committed_during_sync, [[2], [2, 3]])
+        self.assertEqual(self.processor.committed_records, [2, 3, 1])
+        # the global state message covers the replaced stream, so it waits for its records too
+        self.assertEqual([state.type for state in self.state_writer.states], [AirbyteStateType.STREAM, AirbyteStateType.GLOBAL])
@@ -10,6 +10,7 @@ import abc
 import io
 import queue
 import sys
+import time
 import warnings
 from collections import defaultdict
 from typing import TYPE_CHECKING, cast, final
@@ -22,6 +23,7 @@ from airbyte_protocol.models import (
     AirbyteStateMessage,
     AirbyteStateType,
     AirbyteStreamState,
+    DestinationSyncMode,
     Type,
 )
 
@@ -36,7 +38,6 @@ if TYPE_CHECKING:
     from airbyte._batch_handles import BatchHandle
 
     from destination_snowflake_cortex.common.catalog.catalog_providers import CatalogProvider
-    from destination_snowflake_cortex.common.state.state_writers import StateWriterBase
 
 
 class AirbyteMessageParsingError(Exception):
@@ -52,6 +53,18 @@ class RecordProcessorBase(abc.ABC):
     catalog and state aspects of the protocol.
     """
 
+    finalize_after_records: int | None = 100_000
+    """Finalize the pending data once this many records are received since the last finalization.
+
+    This bounds the size of the pending batch files. Set to `None` to only finalize at the end.
+    """
+
+    finalize_after_seconds: float | None = 5 * 60
+    """Finalize the pending data once this many seconds passed since the last finalization.
+
+    This lets the long syncs checkpoint their progress. Set to `None` to only finalize at the end.
+    """
+
     def __init__(
         self,
         *,
@@ -181,11 +194,8 @@ class RecordProcessorBase(abc.ABC):
         This is copied from PyAirbyte's RecordProcessorBase class.
 
         This version will _also_ yield `AirbyteMessage` objects which would otherwise only
-        be pushed to STDOUT or sent to the state writer.
-
-        TODO:
-        - In the future, we should optimize this to emit STATE messages as soon as their records
-          are committed, rather than waiting until the end of the input stream.
+        be pushed to STDOUT or sent to the state writer. The STATE messages are yielded as soon
+        as their records are committed, rather than at the end of the input stream.
         """
         # Create a queue to store output messages
         output_queue: queue.Queue[AirbyteMessage] = queue.Queue()
@@ -202,16 +212,21 @@ class RecordProcessorBase(abc.ABC):
                     return self.wrapped.write_state(state_message)
 
         self._state_writer = WrappedStateWriter(self._state_writer)
-        self.process_airbyte_messages(
-            messages=messages,
-            write_strategy=write_strategy,
-        )
-
-        # Restore the original state writer
-        self._state_writer = self._state_writer.wrapped
-
-        # Yield all messages from the output queue
-        yield from output_queue.queue
+        try:
+            for _ in self._process_airbyte_messages(
+                messages=messages,
+                write_strategy=write_strategy,
+            ):
+                # Yield the messages of the data finalized so far
+                while not output_queue.empty():
+                    yield output_queue.get()
+        finally:
+            # Restore the original state writer
+            self._state_writer = self._state_writer.wrapped
+
+        # Yield all remaining messages from the output queue
+        while not output_queue.empty():
+            yield output_queue.get()
 
     @final
     def process_airbyte_messages(
@@ -221,6 +236,24 @@ class RecordProcessorBase(abc.ABC):
         write_strategy: WriteStrategy,
     ) -> None:
         """Process a stream of Airbyte messages."""
+        for _ in self._process_airbyte_messages(
+            messages,
+            write_strategy=write_strategy,
+        ):
+            pass
+
+    def _process_airbyte_messages(
+        self,
+        messages: Iterable[AirbyteMessage],
+        *,
+        write_strategy: WriteStrategy,
+    ) -> Iterator[None]:
+        """Process a stream of Airbyte messages, yielding after each intermediate finalization.
+
+        The pending data of the appended and merged streams is finalized once `finalize_after_records`
+        of their records are received or `finalize_after_seconds` seconds passed since the last
+        finalization. All the data is finalized at the end of the input.
+        """
         if not isinstance(write_strategy, WriteStrategy):
             raise exc.AirbyteInternalError(
                 message="Invalid `write_strategy` argument. Expected instance of WriteStrategy.",
@@ -228,6 +261,9 @@ class RecordProcessorBase(abc.ABC):
             )
 
         stream_schemas: dict[str, dict] = {}
+        streams_finalized_during_sync: dict[str, bool] = {}
+        pending_records = 0
+        last_finalized_at = time.monotonic()
 
         # Process messages, writing to batches as we go
         for message in messages:
@@ -240,10 +276,17 @@ class RecordProcessorBase(abc.ABC):
                         stream_name=stream_name
                     )
 
+                    streams_finalized_during_sync[stream_name] = self._finalizes_during_sync(
+                        stream_name,
+                        write_strategy=write_strategy,
+                    )
+
                 self.process_record_message(
                     record_msg,
                     stream_schema=stream_schemas[stream_name],
                 )
+                if streams_finalized_during_sync[stream_name]:
+                    pending_records += 1
 
             elif message.type is Type.STATE:
                 state_msg = cast(AirbyteStateMessage, message.state)
@@ -263,7 +306,25 @@ class RecordProcessorBase(abc.ABC):
             else:
                 # Ignore unexpected or unhandled message types:
                 # Type.LOG, Type.TRACE, Type.CONTROL, etc.
-                pass
+                continue
+
+            if pending_records and (
+                (
+                    self.finalize_after_records is not None
+                    and pending_records >= self.finalize_after_records
+                )
+                or (
+                    self.finalize_after_seconds is not None
+                    and time.monotonic() - last_finalized_at >= self.finalize_after_seconds
+                )
+            ):
+                # Commit the records received so far, along with the state messages following them.
+                self._write_stream_data_during_sync(
+                    write_strategy=write_strategy,
+                )
+                pending_records = 0
+                last_finalized_at = time.monotonic()
+                yield
 
         # We've finished processing input data.
         # Finalize all received records and state messages:
@@ -275,12 +336,65 @@ class RecordProcessorBase(abc.ABC):
 
     def write_all_stream_data(self, write_strategy: WriteStrategy) -> None:
         """Finalize any pending writes."""
+        self._before_finalize()
         for stream_name in self.catalog_provider.stream_names:
             self.write_stream_data(
                 stream_name,
                 write_strategy=write_strategy,
             )
 
+        self._finalize_global_state_messages()
+
+    def _write_stream_data_during_sync(self, write_strategy: WriteStrategy) -> None:
+        """Finalize the pending writes of the streams which can be finalized before the end of the input.
+
+        The other streams are finalized at the end of the input, along with the global and legacy
+        state messages covering them.
+        """
+        self._before_finalize()
+        all_streams_finalized = True
+        for stream_name in self.catalog_provider.stream_names:
+            if not self._finalizes_during_sync(stream_name, write_strategy=write_strategy):
+                all_streams_finalized = False
+                continue
+
+            self.write_stream_data(
+                stream_name,
+                write_strategy=write_strategy,
+            )
+
+        if all_streams_finalized:
+            self._finalize_global_state_messages()
+
+    def _before_finalize(self) -> None:  # noqa: B027  # Intentionally empty, not abstract
+        """Write out the records still held by the processor, before the pending writes are finalized.
+
+        The state messages are emitted once the pending writes are finalized, so the records they cover
+        must all be in the pending batches by then. By default this is a no-op.
+        """
+        pass
+
+    def _finalizes_during_sync(self, stream_name: str, write_strategy: WriteStrategy) -> bool:
+        """Return whether the pending writes of the stream can be finalized before the end of the input.
+
+        Replacing the final table is deferred to the end of the input, so that a failed sync does not
+        leave it with a part of the records.
+        """
+        if write_strategy == WriteStrategy.AUTO:
+            return self.catalog_provider.get_destination_sync_mode(stream_name) in {
+                DestinationSyncMode.append,
+                DestinationSyncMode.append_dedup,
+            }
+        return write_strategy in {WriteStrategy.APPEND, WriteStrategy.MERGE}
+
+    def _finalize_global_state_messages(self) -> None:
+        """Finalize the global and legacy state messages, once all the streams they cover are committed."""
+        stream_names = self.catalog_provider.stream_names
+        for state_key in [key for key in self._pending_state_messages if key not in stream_names]:
+            state_messages = self._pending_state_messages.pop(state_key)
+            self._finalize_state_messages(state_messages)
+            self._finalized_state_messages[state_key] += state_messages
+
     @abc.abstractmethod
     def write_stream_data(
         self,
@@ -691,6 +691,38 @@ class SqlProcessorBase(RecordProcessorBase):
                 # We've added columns, so invalidate the cache.
                 self._invalidate_table_cache(table_name)
 
+    def _resolve_write_strategy(
+        self,
+        stream_name: str,
+        write_strategy: WriteStrategy,
+    ) -> WriteStrategy:
+        """Resolve the `AUTO` write strategy of the stream from its configured sync mode."""
+        if write_strategy != WriteStrategy.AUTO:
+            return write_strategy
+
+        configured_destination_sync_mode: DestinationSyncMode = (
+            self.catalog_provider.get_destination_sync_mode(stream_name)
+        )
+        if configured_destination_sync_mode == DestinationSyncMode.overwrite:
+            return WriteStrategy.REPLACE
+        if configured_destination_sync_mode == DestinationSyncMode.append:
+            return WriteStrategy.APPEND
+        if configured_destination_sync_mode == DestinationSyncMode.append_dedup:
+            return WriteStrategy.MERGE
+
+        # TODO: Consider removing the rest of these cases if they are dead code.
+        if self._get_primary_keys(stream_name):
+            return WriteStrategy.MERGE
+        if self._get_incremental_key(stream_name):
+            return WriteStrategy.APPEND
+        return WriteStrategy.REPLACE
+
+    def _finalizes_during_sync(self, stream_name: str, write_strategy: WriteStrategy) -> bool:
+        return super()._finalizes_during_sync(
+            stream_name,
+            write_strategy=self._resolve_write_strategy(stream_name, write_strategy),
+        )
+
     @final
     def _write_temp_table_to_final_table(
         self,
@@ -700,9 +732,7 @@ class SqlProcessorBase(RecordProcessorBase):
         write_strategy: WriteStrategy,
     ) -> None:
         """Write the temp table into the final table using the provided write strategy."""
-        has_pks: bool = bool(self._get_primary_keys(stream_name))
-        has_incremental_key: bool = bool(self._get_incremental_key(stream_name))
-        if write_strategy == WriteStrategy.MERGE and not has_pks:
+        if write_strategy == WriteStrategy.MERGE and not self._get_primary_keys(stream_name):
             raise exc.PyAirbyteInputError(
                 message="Cannot use merge strategy on a stream with no primary keys.",
                 context={
@@ -710,24 +740,7 @@ class SqlProcessorBase(RecordProcessorBase):
                 },
             )
 
-        if write_strategy == WriteStrategy.AUTO:
-            configured_destination_sync_mode: DestinationSyncMode = (
-                self.catalog_provider.get_destination_sync_mode(stream_name)
-            )
-            if configured_destination_sync_mode == DestinationSyncMode.overwrite:
-                write_strategy = WriteStrategy.REPLACE
-            elif configured_destination_sync_mode == DestinationSyncMode.append:
-                write_strategy = WriteStrategy.APPEND
-            elif configured_destination_sync_mode == DestinationSyncMode.append_dedup:
-                write_strategy = WriteStrategy.MERGE
-
-            # TODO: Consider removing the rest of these cases if they are dead code.
-            elif has_pks:
-                write_strategy = WriteStrategy.MERGE
-            elif has_incremental_key:
-                write_strategy = WriteStrategy.APPEND
-            else:
-                write_strategy = WriteStrategy.REPLACE
+        write_strategy = self._resolve_write_strategy(stream_name, write_strategy)
 
         if write_strategy == WriteStrategy.REPLACE:
             # Note: No need to check for schema compatibility
@@ -3,10 +3,12 @@
 #
 
 import copy
+import json
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Iterator, List, Mapping, Optional, Type, Union
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, Type, Union
 
 import backoff
 import pendulum
@@ -59,6 +61,22 @@ def update_in_batch(api: FacebookAdsApi, jobs: List["AsyncJob"]):
         batch = batch.execute()
 
 
+def parse_insights_throttle(headers: Union[Mapping[str, str], List[Mapping[str, str]], None]) -> Optional[float]:
+    """Get the insights throttle value of the account from the `x-fb-ads-insights-throttle` header, if provided.
+    The headers of the batch responses are the list of name/value pairs.
+
+    :param headers:
+    :return: minimum of the account and application throttle values
+    """
+    if isinstance(headers, list):
+        headers = {header["name"].lower(): header["value"] for header in headers}
+    ads_insights_throttle = (headers or {}).get("x-fb-ads-insights-throttle")
+    if not ads_insights_throttle:
+        return None
+    ads_insights_throttle = json.loads(ads_insights_throttle)
+    return min(ads_insights_throttle.get("acc_id_util_pct", 0), ads_insights_throttle.get("app_id_util_pct", 0))
+
+
 class Status(str, Enum):
     """Async job statuses"""
 
@@ -82,6 +100,7 @@ class AsyncJob(ABC):
         self._api = api
         self._interval = interval
         self._attempt_number = 0
+        self._insights_throttle: Optional[float] = None
 
     @property
     def interval(self) -> pendulum.Period:
@@ -101,6 +120,11 @@ class AsyncJob(ABC):
         """Number of attempts"""
         return self._attempt_number
 
+    @property
+    def insights_throttle(self) -> Optional[float]:
+        """Insights throttle of the account from the last job status response, if provided"""
+        return self._insights_throttle
+
     @property
     @abstractmethod
     def completed(self) -> bool:
@@ -122,6 +146,10 @@ class AsyncJob(ABC):
     def get_result(self) -> Iterator[Any]:
         """Retrieve result of the finished job."""
 
+    @abstractmethod
+    def get_result_data(self) -> Iterator[MutableMapping[str, Any]]:
+        """Retrieve result of the finished job as plain records."""
+
     @abstractmethod
     def split_job(self) -> List["AsyncJob"]:
         """Split existing job in few smaller ones"""
@@ -159,6 +187,11 @@ class ParentAsyncJob(AsyncJob):
         """Tell if any job previously failed"""
         return any(job.failed for job in self._jobs)
 
+    @property
+    def insights_throttle(self) -> Optional[float]:
+        """Highest insights throttle of the account from the last status responses of the jobs, if provided"""
+        return max((job.insights_throttle for job in self._jobs if job.insights_throttle is not None), default=None)
+
     def update_job(self, batch: Optional[FacebookAdsApiBatch] = None):
         """Checks jobs status in advance."""
         update_in_batch(api=self._api, jobs=self._jobs)
@@ -168,6 +201,11 @@ class ParentAsyncJob(AsyncJob):
         for job in self._jobs:
             yield from job.get_result()
 
+    def get_result_data(self) -> Iterator[MutableMapping[str, Any]]:
+        """Retrieve result of the finished job as plain records."""
+        for job in self._jobs:
+            yield from job.get_result_data()
+
     def split_job(self) -> List["AsyncJob"]:
         """Split existing job in few smaller ones."""
         new_jobs = []
@@ -199,6 +237,7 @@ class InsightAsyncJob(AsyncJob):
         edge_object: Union[AdAccount, Campaign, AdSet, Ad],
         params: Mapping[str, Any],
         job_timeout: Duration,
+        prefetch_result_pages: bool = True,
         **kwargs,
     ):
         """Initialize
@@ -206,6 +245,7 @@ class InsightAsyncJob(AsyncJob):
         :param api: FB API
         :param edge_object: Account, Campaign, AdSet or Ad
         :param params: job params, required to start/restart job
+        :param prefetch_result_pages: request the next page of the result while the current one is consumed
         """
         super().__init__(**kwargs)
         self._params = dict(params)
@@ -214,6 +254,7 @@ class InsightAsyncJob(AsyncJob):
             "until": self._interval.end.to_date_string(),
         }
         self._job_timeout = job_timeout
+        self._prefetch_result_pages = prefetch_result_pages
 
         self._edge_object = edge_object
         self._job: Optional[AdReportRun] = None
@@ -267,6 +308,7 @@ class InsightAsyncJob(AsyncJob):
                 params=self._params,
                 interval=self._interval,
                 job_timeout=self._job_timeout,
+                prefetch_result_pages=self._prefetch_result_pages,
             )
             for pk in ids
         ]
@@ -320,6 +362,7 @@ class InsightAsyncJob(AsyncJob):
     def _batch_success_handler(self, response: FacebookResponse):
         """Update job status from response"""
         self._job = ObjectParser(reuse_object=self._job).parse_single(response.json())
+        self._insights_throttle = parse_insights_throttle(response.headers())
         self._check_status()
 
     def _batch_failure_handler(self, response: FacebookResponse):
@@ -380,6 +423,47 @@ class InsightAsyncJob(AsyncJob):
             raise RuntimeError(f"{self}: Incorrect usage of get_result - the job is not started or failed")
         return self._job.get_result(params={"limit": self.page_size})
 
+    def get_result_data(self) -> Iterator[MutableMapping[str, Any]]:
+        """Retrieve result of the finished job as plain records, the same as `export_all_data()` of the objects from get_result.
+        SDK objects are not built for the records. When prefetching is enabled, the next page is requested while the records
+        of the current page are consumed.
+        """
+        if not self._job or self.failed:
+            raise RuntimeError(f"{self}: Incorrect usage of get_result_data - the job is not started or failed")
+
+        params: Optional[Mapping[str, Any]] = {"limit": self.page_size}
+        if not self._prefetch_result_pages:
+            while params:
+                response = self._get_result_page(params)
+                params = self._next_result_page_params(response, params)
+                yield from response["data"]
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = executor.submit(self._get_result_page, params)
+            while page:
+                response = page.result()
+                params = self._next_result_page_params(response, params)
+                page = executor.submit(self._get_result_page, params) if params else None
+                yield from response["data"]
+
+    @staticmethod
+    def _next_result_page_params(response: Mapping[str, Any], params: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        """Params of the page following the response, None if it's the last one."""
+        paging = response.get("paging", {})
+        # 'after' will always exist even if no more pages are available
+        if "next" in paging and "after" in paging.get("cursors", {}):
+            return {**params, "after": paging["cursors"]["after"]}
+        return None
+
+    @backoff_policy
+    def _get_result_page(self, params: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Request one page of the job result."""
+        response = self._api.call("GET", (self._job.get_id_assured(), "insights"), params=params).json()
+        if not isinstance(response.get("data"), list):
+            raise FacebookBadObjectError(f"{self}: Bad data in the job result page: {response}")
+        return response
+
     def __str__(self) -> str:
         """String representation of the job wrapper."""
         job_id = self._job["report_run_id"] if self._job else "<None>"
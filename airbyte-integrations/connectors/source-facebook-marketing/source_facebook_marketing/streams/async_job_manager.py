@@ -4,7 +4,7 @@
 
 import logging
 import time
-from typing import TYPE_CHECKING, Iterator, List
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from source_facebook_marketing.streams.common import JobException
 
@@ -21,6 +21,10 @@ class InsightAsyncJobManager:
     """
     Class for managing Ads Insights async jobs. Before running next job it
     checks current insight throttle value and if it greater than THROTTLE_LIMIT variable, no new jobs added.
+    Jobs of several accounts can be managed together: new jobs are taken from the accounts in turn,
+    each account being limited by its own insights throttle, so the jobs of one account don't wait for all the jobs of the other ones.
+    The throttle of each account is taken from the responses of the job start and status requests, the throttle is requested
+    explicitly only for the account about to receive a job, when its throttle is unknown or it has no running jobs to report it.
     To consume completed jobs use completed_job generator, jobs will be returned in the order they finished.
     """
 
@@ -29,34 +33,44 @@ class InsightAsyncJobManager:
     MAX_NUMBER_OF_ATTEMPTS = 20
     # Time to wait before checking job status update again.
     JOB_STATUS_UPDATE_SLEEP_SECONDS = 30
+    # Time to wait before the first status check of a new job, doubled with each next check up to JOB_STATUS_UPDATE_SLEEP_SECONDS.
+    # Most of the jobs complete in a few seconds, the longer a job runs the less likely it is to complete soon.
+    MIN_JOB_STATUS_UPDATE_SLEEP_SECONDS = 5
     # Maximum of concurrent jobs that could be scheduled. Since throttling
     # limit is not reliable indicator of async workload capability we still have to use this parameter.
     MAX_JOBS_IN_QUEUE = 100
 
-    def __init__(self, api: "API", jobs: Iterator[AsyncJob], account_id: str):
+    def __init__(
+        self,
+        api: "API",
+        jobs: Union[Iterable[AsyncJob], Mapping[str, Iterable[AsyncJob]]],
+        account_id: Optional[str] = None,
+    ):
         """Init
 
         :param api:
-        :param jobs:
+        :param jobs: jobs of the account, or jobs of each account when account_id is not set
+        :param account_id:
         """
         self._api = api
-        self._account_id = account_id
-        self._jobs = iter(jobs)
-        self._running_jobs = []
+        if account_id is not None:
+            jobs = {account_id: jobs}
+        self._jobs: Dict[str, Iterator[AsyncJob]] = {account: iter(account_jobs) for account, account_jobs in jobs.items()}
+        self._running_jobs: List[Tuple[str, AsyncJob]] = []
+        # number of status checks of each running job, used to poll young jobs more often than old ones
+        self._job_status_checks: Dict[AsyncJob, int] = {}
+        # the last known insights throttle value of each account
+        self._throttles: Dict[str, float] = {}
 
     def _start_jobs(self):
         """Enqueue new jobs."""
 
-        self._update_api_throttle_limit()
-        self._wait_throttle_limit_down()
         prev_jobs_count = len(self._running_jobs)
-        while self._get_current_throttle_value() < self.THROTTLE_LIMIT and len(self._running_jobs) < self.MAX_JOBS_IN_QUEUE:
-            job = next(self._jobs, None)
-            if not job:
-                self._empty = True
-                break
-            job.start()
-            self._running_jobs.append(job)
+        self._start_jobs_within_throttle_limit()
+        while not self._running_jobs and self._jobs:
+            # every account is throttled and there are no running jobs to wait for
+            self._wait_throttle_limit_down()
+            self._start_jobs_within_throttle_limit()
 
         logger.info(
             f"Added: {len(self._running_jobs) - prev_jobs_count} jobs. "
@@ -64,6 +78,33 @@ class InsightAsyncJobManager:
             f"{len(self._running_jobs)}/{self.MAX_JOBS_IN_QUEUE} job(s) in queue"
         )
 
+    def _start_jobs_within_throttle_limit(self):
+        """Start jobs of each account in turn until the account is throttled or out of jobs, or the queue is full."""
+        running_account_ids = {account_id for account_id, _ in self._running_jobs}
+        account_ids = []
+        for account_id in self._jobs:
+            if account_id not in self._throttles or (self._is_throttled(account_id) and account_id not in running_account_ids):
+                self._update_account_throttle(account_id)
+            if not self._is_throttled(account_id):
+                account_ids.append(account_id)
+
+        while account_ids and len(self._running_jobs) < self.MAX_JOBS_IN_QUEUE:
+            for account_id in list(account_ids):
+                if len(self._running_jobs) >= self.MAX_JOBS_IN_QUEUE:
+                    break
+                job = next(self._jobs[account_id], None)
+                if not job:
+                    del self._jobs[account_id]
+                    account_ids.remove(account_id)
+                    continue
+                # the job is started with a request to the account insights, so the throttle is the account one afterwards
+                job.start()
+                self._throttles[account_id] = self._get_current_throttle_value()
+                self._running_jobs.append((account_id, job))
+                self._job_status_checks[job] = 0
+                if self._is_throttled(account_id):
+                    account_ids.remove(account_id)
+
     def completed_jobs(self) -> Iterator[AsyncJob]:
         """Wait until job is ready and return it. If job
             failed try to restart it for FAILED_JOBS_RESTART_COUNT times. After job
@@ -71,30 +112,49 @@ class InsightAsyncJobManager:
 
         :yield: completed jobs
         """
+        for _, job in self.completed_jobs_by_account():
+            yield job
+
+    def completed_jobs_by_account(self) -> Iterator[Tuple[str, AsyncJob]]:
+        """Same as completed_jobs, but along with the account each job belongs to.
+
+        :yield: account id and completed job
+        """
         if not self._running_jobs:
             self._start_jobs()
 
         while self._running_jobs:
             completed_jobs = self._check_jobs_status_and_restart()
             while not completed_jobs:
-                logger.info(f"No jobs ready to be consumed, wait for {self.JOB_STATUS_UPDATE_SLEEP_SECONDS} seconds")
-                time.sleep(self.JOB_STATUS_UPDATE_SLEEP_SECONDS)
+                sleep_seconds = self._get_status_update_sleep_seconds()
+                logger.info(f"No jobs ready to be consumed, wait for {sleep_seconds} seconds")
+                time.sleep(sleep_seconds)
                 completed_jobs = self._check_jobs_status_and_restart()
             yield from completed_jobs
             self._start_jobs()
 
-    def _check_jobs_status_and_restart(self) -> List[AsyncJob]:
+    def _get_status_update_sleep_seconds(self) -> int:
+        """Time to wait before the next status check, driven by the youngest running job."""
+        status_checks = min(self._job_status_checks.get(job, 0) for _, job in self._running_jobs) if self._running_jobs else 0
+        return min(
+            self.MIN_JOB_STATUS_UPDATE_SLEEP_SECONDS * 2 ** max(status_checks - 1, 0),
+            self.JOB_STATUS_UPDATE_SLEEP_SECONDS,
+        )
+
+    def _check_jobs_status_and_restart(self) -> List[Tuple[str, AsyncJob]]:
         """Checks jobs status in advance and restart if some failed.
 
-        :return: list of completed jobs
+        :return: list of completed jobs along with their accounts
         """
         completed_jobs = []
         running_jobs = []
         failed_num = 0
 
-        update_in_batch(api=self._api.api, jobs=self._running_jobs)
+        update_in_batch(api=self._api.api, jobs=[job for _, job in self._running_jobs])
+        self._update_throttles_from_jobs()
         self._wait_throttle_limit_down()
-        for job in self._running_jobs:
+        for account_id, job in self._running_jobs:
+            status_checks = self._job_status_checks.pop(job, 0) + 1
             if job.failed:
                 if isinstance(job, ParentAsyncJob):
                     # if this job is a ParentAsyncJob, it holds X number of jobs
@@ -111,28 +171,47 @@ class InsightAsyncJobManager:
                     )
                     smaller_jobs = job.split_job()
                     grouped_jobs = ParentAsyncJob(api=self._api.api, jobs=smaller_jobs, interval=job.interval)
-                    running_jobs.append(grouped_jobs)
+                    running_jobs.append((account_id, grouped_jobs))
                     grouped_jobs.start()
+                    self._throttles[account_id] = self._get_current_throttle_value()
+                    self._job_status_checks[grouped_jobs] = 0
                 else:
                     logger.info("%s: failed, restarting", job)
                     job.restart()
-                    running_jobs.append(job)
+                    self._throttles[account_id] = self._get_current_throttle_value()
+                    running_jobs.append((account_id, job))
+                    self._job_status_checks[job] = 0
                 failed_num += 1
             elif job.completed:
-                completed_jobs.append(job)
+                completed_jobs.append((account_id, job))
             else:
-                running_jobs.append(job)
+                running_jobs.append((account_id, job))
+                self._job_status_checks[job] = status_checks
 
         self._running_jobs = running_jobs
         logger.info(f"Completed jobs: {len(completed_jobs)}, Failed jobs: {failed_num}, Running jobs: {len(self._running_jobs)}")
 
         return completed_jobs
 
+    def _update_throttles_from_jobs(self):
+        """Reuse the throttle values reported by the job status responses, the highest one is taken for each account."""
+        throttles = {}
+        for account_id, job in self._running_jobs:
+            if job.insights_throttle is not None:
+                throttles[account_id] = max(job.insights_throttle, throttles.get(account_id, 0))
+        self._throttles.update(throttles)
+
+    def _is_throttled(self, account_id: str) -> bool:
+        return self._throttles.get(account_id, 0) >= self.THROTTLE_LIMIT
+
     def _wait_throttle_limit_down(self):
-        while self._get_current_throttle_value() > self.THROTTLE_LIMIT:
-            logger.info(f"Current throttle is {self._api.api.ads_insights_throttle}, wait {self.JOB_STATUS_UPDATE_SLEEP_SECONDS} seconds")
+        """Wait while every account with running or pending jobs is throttled."""
+        account_ids = list(dict.fromkeys([*self._jobs, *(account_id for account_id, _ in self._running_jobs)]))
+        while account_ids and all(self._is_throttled(account_id) for account_id in account_ids):
+            logger.info(f"Current throttle is {self._throttles}, wait {self.JOB_STATUS_UPDATE_SLEEP_SECONDS} seconds")
             time.sleep(self.JOB_STATUS_UPDATE_SLEEP_SECONDS)
-            self._update_api_throttle_limit()
+            for account_id in account_ids:
+                self._update_account_throttle(account_id)
 
     def _get_current_throttle_value(self) -> float:
         """
@@ -146,10 +225,14 @@ class InsightAsyncJobManager:
 
         return min(throttle.per_account, throttle.per_application)
 
-    def _update_api_throttle_limit(self):
+    def _update_api_throttle_limit(self, account_id: str):
         """
         Sends <ACCOUNT_ID>/insights GET request with no parameters, so it would
         respond with empty list of data so api use "x-fb-ads-insights-throttle"
         header to update current insights throttle limit.
         """
-        self._api.get_account(account_id=self._account_id).get_insights()
+        self._api.get_account(account_id=account_id).get_insights()
+
+    def _update_account_throttle(self, account_id: str):
+        self._update_api_throttle_limit(account_id)
+        self._throttles[account_id] = self._get_current_throttle_value()
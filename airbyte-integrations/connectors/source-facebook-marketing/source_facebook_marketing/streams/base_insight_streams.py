@@ -76,6 +76,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         insights_lookback_window: int = None,
         insights_job_timeout: int = 60,
         level: str = "ad",
+        prefetch_result_pages: bool = True,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -94,6 +95,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         self._new_class_name = name
         self._insights_lookback_window = insights_lookback_window
         self._insights_job_timeout = insights_job_timeout
+        self._prefetch_result_pages = prefetch_result_pages
         self.level = level
         self.entity_prefix = level
 
@@ -161,8 +163,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         account_id = stream_slice["account_id"]
 
         try:
-            for obj in job.get_result():
-                data = obj.export_all_data()
+            for data in job.get_result_data():
                 if self._response_data_is_valid(data):
                     self._add_account_id(data, account_id)
                     yield self._transform_breakdown(data)
@@ -252,7 +253,8 @@ class AdsInsights(FBMarketingIncrementalStream):
         :return:
         """
 
-        self._next_cursor_values = self._get_start_date()
+        # jobs of all the accounts are generated together, so only the cursor of this account is reset
+        self._next_cursor_values[account_id] = self._get_start_date()[account_id]
         for ts_start in self._date_intervals(account_id):
             if (
                 ts_start in self._completed_slices.get(account_id, [])
@@ -267,6 +269,7 @@ class AdsInsights(FBMarketingIncrementalStream):
                 interval=interval,
                 params=params,
                 job_timeout=self.insights_job_timeout,
+                prefetch_result_pages=self._prefetch_result_pages,
             )
 
     def check_breakdowns(self, account_id: str):
@@ -294,6 +297,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Optional[Mapping[str, Any]]]:
         """Slice by date periods and schedule async job for each period, run at most MAX_ASYNC_JOBS jobs at the same time.
+        Jobs of all the accounts are scheduled by the same manager, so they run concurrently.
         This solution for Async was chosen because:
         1. we should commit state after each successful job
         2. we should run as many job as possible before checking for result
@@ -308,17 +312,18 @@ class AdsInsights(FBMarketingIncrementalStream):
         if stream_state:
             self.state = stream_state
 
-        for account_id in self._account_ids:
-            try:
-                manager = InsightAsyncJobManager(
-                    api=self._api,
-                    jobs=self._generate_async_jobs(params=self.request_params(), account_id=account_id),
-                    account_id=account_id,
-                )
-                for job in manager.completed_jobs():
-                    yield {"insight_job": job, "account_id": account_id}
-            except FacebookRequestError as exc:
-                raise traced_exception(exc)
+        try:
+            manager = InsightAsyncJobManager(
+                api=self._api,
+                jobs={
+                    account_id: self._generate_async_jobs(params=self.request_params(), account_id=account_id)
+                    for account_id in sorted(self._account_ids)
+                },
+            )
+            for account_id, job in manager.completed_jobs_by_account():
+                yield {"insight_job": job, "account_id": account_id}
+        except FacebookRequestError as exc:
+            raise traced_exception(exc)
 
     def _get_start_date(self) -> Mapping[str, pendulum.Date]:
         """Get start date to begin sync with. It is not that trivial as it might seem.
@@ -396,7 +396,6 @@ class TestFullRefresh(TestCase):
         http_mocker.get(get_account_request().with_account_id(account_id_1).build(), get_account_response(account_id=account_id_1))
         http_mocker.get(_update_api_throttle_limit_request().with_account_id(account_id_1).build(), api_throttle_limit_response)
         http_mocker.post(_job_start_request().with_account_id(account_id_1).build(), _job_start_response(report_run_id_1))
-        http_mocker.post(_job_status_request(report_run_id_1).build(), _job_status_response(job_id_1, account_id=account_id_1))
         http_mocker.get(
             _get_insights_request(job_id_1).build(),
             _insights_response().with_record(_ads_insights_action_product_id_record()).build(),
@@ -405,12 +404,16 @@ class TestFullRefresh(TestCase):
         http_mocker.get(get_account_request().with_account_id(account_id_2).build(), get_account_response(account_id=account_id_2))
         http_mocker.get(_update_api_throttle_limit_request().with_account_id(account_id_2).build(), api_throttle_limit_response)
         http_mocker.post(_job_start_request().with_account_id(account_id_2).build(), _job_start_response(report_run_id_2))
-        http_mocker.post(_job_status_request(report_run_id_2).build(), _job_status_response(job_id_2, account_id=account_id_2))
         http_mocker.get(
             _get_insights_request(job_id_2).build(),
             _insights_response().with_record(_ads_insights_action_product_id_record()).build(),
         )
 
+        # jobs of both accounts run concurrently, so their status is checked in the same batch
+        http_mocker.post(
+            _job_status_request([report_run_id_1, report_run_id_2]).build(), _job_status_response([job_id_1, job_id_2])
+        )
+
         output = self._read(config().with_account_ids([account_id_1, account_id_2]))
         assert len(output.records) == 2
 
@@ -501,7 +504,6 @@ class TestIncremental(TestCase):
             _job_start_request(since=start_date, until=end_date).with_account_id(account_id_1).build(),
             _job_start_response(report_run_id_1),
         )
-        http_mocker.post(_job_status_request(report_run_id_1).build(), _job_status_response(job_id_1, account_id=account_id_1))
         http_mocker.get(
             _get_insights_request(job_id_1).build(),
             _insights_response().with_record(_ads_insights_action_product_id_record()).build(),
@@ -513,12 +515,16 @@ class TestIncremental(TestCase):
             _job_start_request(since=start_date, until=end_date).with_account_id(account_id_2).build(),
             _job_start_response(report_run_id_2),
         )
-        http_mocker.post(_job_status_request(report_run_id_2).build(), _job_status_response(job_id_2, account_id=account_id_2))
         http_mocker.get(
             _get_insights_request(job_id_2).build(),
             _insights_response().with_record(_ads_insights_action_product_id_record()).build(),
         )
 
+        # jobs of both accounts run concurrently, so their status is checked in the same batch
+        http_mocker.post(
+            _job_status_request([report_run_id_1, report_run_id_2]).build(), _job_status_response([job_id_1, job_id_2])
+        )
+
         output = self._read(config().with_account_ids([account_id_1, account_id_2]).with_start_date(start_date).with_end_date(end_date))
         cursor_value_from_state_account_1 = (
             AirbyteStreamStateSerializer.dump(output.most_recent_state).get("stream_state").get(account_id_1, {}).get(_CURSOR_FIELD)
@@ -4,6 +4,7 @@
 
 import copy
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterator
 
 import freezegun
@@ -251,6 +252,9 @@ class TestInsightAsyncJob:
             "date_start": "2021-02-24",
             "date_stop": "2021-02-24",
         }
+        response.headers.return_value = [
+            {"name": "X-FB-Ads-Insights-Throttle", "value": '{"app_id_util_pct": 10, "acc_id_util_pct": 50}'},
+        ]
         response.body.return_value = "Some error"
         batch_mock = mocker.Mock(spec=FacebookAdsApiBatch)
 
@@ -262,6 +266,8 @@ class TestInsightAsyncJob:
 
         kwargs["success"](response)
         assert started_job.completed
+        # the throttle of the account is reported by the status response
+        assert started_job.insights_throttle == 10
 
         kwargs["failure"](response)
 
@@ -344,6 +350,37 @@ class TestInsightAsyncJob:
         # in case this is not retried, an error will be raised
         job.get_result()
 
+    @pytest.mark.parametrize("prefetch_result_pages", [True, False], ids=["prefetch", "serial"])
+    def test_get_result_data(self, job, api, mocker, prefetch_result_pages):
+        job._prefetch_result_pages = prefetch_result_pages
+        executor = mocker.patch("source_facebook_marketing.streams.async_job.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+        job.start()
+        api.call.reset_mock()
+        api.call().json.side_effect = [
+            {"data": [{"some_data": 123}], "paging": {"cursors": {"after": "page2"}, "next": "https://next"}},
+            {"data": [{"some_data": 77, "actions": [{"action_type": "like", "value": "1"}]}], "paging": {"cursors": {"after": "end"}}},
+        ]
+
+        records = list(job.get_result_data())
+
+        assert records == [{"some_data": 123}, {"some_data": 77, "actions": [{"action_type": "like", "value": "1"}]}]
+        assert [call.kwargs["params"] for call in api.call.call_args_list[1:]] == [{"limit": 100}, {"limit": 100, "after": "page2"}]
+        assert api.call.call_args_list[1].args == ("GET", ("123", "insights"))
+        assert executor.called == prefetch_result_pages
+
+    def test_get_result_data_retried(self, job, api):
+        job.start()
+        api.call().json.side_effect = [{"error": "unexpected"}, {"data": [{"some_data": 123}]}]
+
+        assert list(job.get_result_data()) == [{"some_data": 123}]
+
+    def test_get_result_data_when_job_is_not_started(self, job):
+        with pytest.raises(
+            RuntimeError,
+            match=r"Incorrect usage of get_result_data - the job is not started or failed",
+        ):
+            next(job.get_result_data())
+
     def test_get_result_when_job_is_not_started(self, job):
         with pytest.raises(
             RuntimeError,
@@ -406,6 +443,7 @@ class TestInsightAsyncJob:
         assert all(j.interval == job.interval for j in small_jobs)
         for i, small_job in enumerate(small_jobs, start=1):
             assert small_job._params["time_range"] == job._params["time_range"]
+            assert small_job._prefetch_result_pages == job._prefetch_result_pages
             assert str(small_job) == f"InsightAsyncJob(id=<None>, {next_edge_class(i)}, time_range={job.interval}, breakdowns={[]})"
 
     def test_split_job_smallest(self, mocker, api):
@@ -480,6 +518,15 @@ class TestParentAsyncJob:
         assert isinstance(generator, Iterator)
         assert list(generator) == list(range(3, 8)) + list(range(4, 11))
 
+    def test_get_result_data(self, parent_job, grouped_jobs):
+        """Retrieve result of the finished job as plain records."""
+        for job in grouped_jobs:
+            job.get_result_data.return_value = []
+        grouped_jobs[0].get_result_data.return_value = [{"a": 1}]
+        grouped_jobs[6].get_result_data.return_value = [{"a": 2}, {"a": 3}]
+
+        assert list(parent_job.get_result_data()) == [{"a": 1}, {"a": 2}, {"a": 3}]
+
     def test_split_job(self, parent_job, grouped_jobs, mocker):
         grouped_jobs[0].failed = True
         grouped_jobs[0].split_job.return_value = [
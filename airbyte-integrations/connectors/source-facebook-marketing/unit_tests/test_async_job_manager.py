@@ -38,8 +38,8 @@ class TestInsightAsyncManager:
     def test_jobs_completed_immediately(self, api, mocker, time_mock, some_config):
         """Manager should emmit jobs without waiting if they completed"""
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False),
         ]
         manager = InsightAsyncJobManager(api=api, jobs=jobs, account_id=some_config["account_ids"][0])
         completed_jobs = list(manager.completed_jobs())
@@ -58,8 +58,8 @@ class TestInsightAsyncManager:
 
         update_job_mock.side_effect = update_job_behaviour()
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
         ]
         manager = InsightAsyncJobManager(api=api, jobs=jobs, account_id=some_config["account_ids"][0])
 
@@ -69,7 +69,8 @@ class TestInsightAsyncManager:
 
         job = next(manager.completed_jobs(), None)
         assert job == jobs[0]
-        time_mock.sleep.assert_called_with(InsightAsyncJobManager.JOB_STATUS_UPDATE_SLEEP_SECONDS)
+        # the job was checked twice, so the wait is doubled
+        time_mock.sleep.assert_called_once_with(InsightAsyncJobManager.MIN_JOB_STATUS_UPDATE_SLEEP_SECONDS * 2)
 
         job = next(manager.completed_jobs(), None)
         assert job is None
@@ -86,8 +87,8 @@ class TestInsightAsyncManager:
 
         update_job_mock.side_effect = update_job_behaviour()
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
         ]
         manager = InsightAsyncJobManager(api=api, jobs=jobs, account_id=some_config["account_ids"][0])
 
@@ -111,12 +112,12 @@ class TestInsightAsyncManager:
 
         update_job_mock.side_effect = update_job_behaviour()
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
         ]
         sub_jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
         ]
         sub_jobs[0].get_result.return_value = [1, 2]
         sub_jobs[1].get_result.return_value = [3, 4]
@@ -144,8 +145,8 @@ class TestInsightAsyncManager:
 
         update_job_mock.side_effect = update_job_behaviour()
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
         ]
         manager = InsightAsyncJobManager(api=api, jobs=jobs, account_id=some_config["account_ids"][0])
 
@@ -166,14 +167,15 @@ class TestInsightAsyncManager:
 
         update_job_mock.side_effect = update_job_behaviour()
         sub_jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False),
         ]
         jobs = [
-            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True),
+            mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=True),
             mocker.Mock(
                 spec=ParentAsyncJob,
                 _jobs=sub_jobs,
+                insights_throttle=None,
                 attempt_number=1,
                 failed=False,
                 completed=False,
@@ -183,3 +185,97 @@ class TestInsightAsyncManager:
 
         with pytest.raises(JobException):
             next(manager.completed_jobs(), None)
+
+    def test_jobs_of_accounts_run_concurrently(self, api, mocker, time_mock):
+        """Manager should take jobs from the accounts in turn"""
+        jobs = {
+            "account_1": [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False) for _ in range(2)],
+            "account_2": [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False)],
+        }
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+
+        completed_jobs = list(manager.completed_jobs_by_account())
+
+        assert completed_jobs == [
+            ("account_1", jobs["account_1"][0]),
+            ("account_2", jobs["account_2"][0]),
+            ("account_1", jobs["account_1"][1]),
+        ]
+        time_mock.sleep.assert_not_called()
+
+    def test_throttled_account_does_not_block_other_accounts(self, api, mocker, time_mock):
+        """Manager should start jobs of the accounts within the throttle limit and wait for the throttled ones"""
+        throttles = {"account_1": [100, 100], "account_2": []}
+
+        def get_account(account_id):
+            throttle = throttles[account_id].pop(0) if throttles[account_id] else 0
+            api.api.ads_insights_throttle = MyFacebookAdsApi.Throttle(throttle, throttle)
+            return mocker.Mock()
+
+        api.get_account.side_effect = get_account
+        jobs = {
+            "account_1": [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False)],
+            "account_2": [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False) for _ in range(2)],
+        }
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+
+        completed_jobs = list(manager.completed_jobs_by_account())
+
+        assert completed_jobs == [
+            ("account_2", jobs["account_2"][0]),
+            ("account_2", jobs["account_2"][1]),
+            ("account_1", jobs["account_1"][0]),
+        ]
+        time_mock.sleep.assert_called_once_with(InsightAsyncJobManager.JOB_STATUS_UPDATE_SLEEP_SECONDS)
+
+    def test_job_status_polling_backs_off(self, api, mocker, time_mock, update_job_mock, some_config):
+        """Manager should check young jobs often and wait longer for the jobs running for a long time"""
+
+        def update_job_behaviour():
+            yield from range(5)
+            jobs[0].completed = True
+            yield
+
+        update_job_mock.side_effect = update_job_behaviour()
+        jobs = [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False)]
+        manager = InsightAsyncJobManager(api=api, jobs=jobs, account_id=some_config["account_ids"][0])
+
+        assert list(manager.completed_jobs()) == jobs
+        assert [call.args[0] for call in time_mock.sleep.call_args_list] == [5, 10, 20, 30, 30]
+
+    def test_throttle_is_reused_from_job_responses(self, api, mocker, time_mock, update_job_mock):
+        """Manager should request the throttle only for the accounts about to receive a job, when it's not known from the job responses"""
+
+        def update_job_behaviour():
+            jobs["account_1"][0].insights_throttle = 100
+            jobs["account_2"][0].completed = True
+            yield
+            jobs["account_1"][0].insights_throttle = 10
+            jobs["account_1"][0].completed = True
+            yield
+            jobs["account_1"][1].completed = True
+            yield
+
+        update_job_mock.side_effect = update_job_behaviour()
+        jobs = {
+            "account_1": [
+                mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False) for _ in range(2)
+            ],
+            "account_2": [mocker.Mock(spec=InsightAsyncJob, insights_throttle=None, attempt_number=1, failed=False, completed=False)],
+        }
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+        manager.MAX_JOBS_IN_QUEUE = 2
+
+        completed_jobs = list(manager.completed_jobs_by_account())
+
+        assert completed_jobs == [
+            ("account_2", jobs["account_2"][0]),
+            ("account_1", jobs["account_1"][0]),
+            ("account_1", jobs["account_1"][1]),
+        ]
+        # the throttle is requested once for each account, before the first job is started
+        assert [call.kwargs["account_id"] for call in api.get_account.call_args_list] == ["account_1", "account_2"]
+        # the other account is not throttled, so there is no need to wait for the throttled one
+        assert all(call.args[0] != InsightAsyncJobManager.JOB_STATUS_UPDATE_SLEEP_SECONDS for call in time_mock.sleep.call_args_list)
+        # the second job of the throttled account is started once the job response reports the throttle is down
+        jobs["account_1"][1].start.assert_called_once()
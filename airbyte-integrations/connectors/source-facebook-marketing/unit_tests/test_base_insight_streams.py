@@ -113,9 +113,7 @@ class TestBaseInsightsStream:
             if read slice 2, 3, 1 state changed to 3
         """
         job = mocker.Mock(spec=InsightAsyncJob)
-        rec = mocker.Mock()
-        rec.export_all_data.return_value = {}
-        job.get_result.return_value = [rec, rec, rec]
+        job.get_result_data.return_value = [{}, {}, {}]
         job.interval = pendulum.Period(pendulum.date(2010, 1, 1), pendulum.date(2010, 1, 1))
         stream = AdsInsights(
             api=api,
@@ -142,11 +140,8 @@ class TestBaseInsightsStream:
         2. if read slice 2, 3 state not changed
             if read slice 2, 3, 1 state changed to 3
         """
-        rec = mocker.Mock()
-        rec.export_all_data.return_value = {}
-
         job = mocker.Mock(spec=AsyncJob)
-        job.get_result.return_value = [rec, rec, rec]
+        job.get_result_data.return_value = [{}, {}, {}]
         job.interval = pendulum.Period(pendulum.date(2010, 1, 1), pendulum.date(2010, 1, 1))
         stream = AdsInsights(
             api=api,
@@ -169,14 +164,8 @@ class TestBaseInsightsStream:
         assert len(records) == 3
 
     def test_read_records_add_account_id(self, mocker, api, some_config):
-        rec_without_account = mocker.Mock()
-        rec_without_account.export_all_data.return_value = {}
-
-        rec_with_account = mocker.Mock()
-        rec_with_account.export_all_data.return_value = {"account_id": "some_account_id"}
-
         job = mocker.Mock(spec=AsyncJob)
-        job.get_result.return_value = [rec_without_account, rec_with_account]
+        job.get_result_data.return_value = [{}, {"account_id": "some_account_id"}]
         job.interval = pendulum.Period(pendulum.date(2010, 1, 1), pendulum.date(2010, 1, 1))
         stream = AdsInsights(
             api=api,
@@ -319,7 +308,7 @@ class TestBaseInsightsStream:
             end_date=end_date,
             insights_lookback_window=28,
         )
-        async_manager_mock.completed_jobs.return_value = [1, 2, 3]
+        async_manager_mock.completed_jobs_by_account.return_value = [("unknown_account", 1), ("unknown_account", 2), ("unknown_account", 3)]
 
         slices = list(stream.stream_slices(stream_state=None, sync_mode=SyncMode.incremental))
 
@@ -330,7 +319,7 @@ class TestBaseInsightsStream:
         ]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
-        generated_jobs = list(kwargs["jobs"])
+        generated_jobs = list(kwargs["jobs"]["unknown_account"])
         assert len(generated_jobs) == (end_date - start_date).days + 1
         assert generated_jobs[0].interval.start == start_date.date()
         assert generated_jobs[1].interval.start == start_date.date() + duration(days=1)
@@ -346,7 +335,7 @@ class TestBaseInsightsStream:
             end_date=end_date,
             insights_lookback_window=28,
         )
-        async_manager_mock.completed_jobs.return_value = [1, 2, 3]
+        async_manager_mock.completed_jobs_by_account.return_value = [("unknown_account", 1), ("unknown_account", 2), ("unknown_account", 3)]
 
         slices = list(stream.stream_slices(stream_state=None, sync_mode=SyncMode.incremental))
 
@@ -357,7 +346,7 @@ class TestBaseInsightsStream:
         ]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
-        generated_jobs = list(kwargs["jobs"])
+        generated_jobs = list(kwargs["jobs"]["unknown_account"])
         assert len(generated_jobs) == (end_date - start_date).days + 1
         assert generated_jobs[0].interval.start == start_date.date()
         assert generated_jobs[1].interval.start == start_date.date() + duration(days=1)
@@ -374,7 +363,7 @@ class TestBaseInsightsStream:
             end_date=end_date,
             insights_lookback_window=28,
         )
-        async_manager_mock.completed_jobs.return_value = [1, 2, 3]
+        async_manager_mock.completed_jobs_by_account.return_value = [("unknown_account", 1), ("unknown_account", 2), ("unknown_account", 3)]
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
@@ -385,7 +374,7 @@ class TestBaseInsightsStream:
         ]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
-        generated_jobs = list(kwargs["jobs"])
+        generated_jobs = list(kwargs["jobs"]["unknown_account"])
         # assert that we sync all periods including insight_lookback_period
         assert len(generated_jobs) == (end_date.date() - start_date).days + 1
         assert generated_jobs[0].interval.start == start_date.date()
@@ -404,7 +393,7 @@ class TestBaseInsightsStream:
             end_date=end_date,
             insights_lookback_window=28,
         )
-        async_manager_mock.completed_jobs.return_value = [1, 2, 3]
+        async_manager_mock.completed_jobs_by_account.return_value = [("unknown_account", 1), ("unknown_account", 2), ("unknown_account", 3)]
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
@@ -415,11 +404,34 @@ class TestBaseInsightsStream:
         ]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
-        generated_jobs = list(kwargs["jobs"])
+        generated_jobs = list(kwargs["jobs"]["unknown_account"])
         assert len(generated_jobs) == (end_date.date() - start_date).days + 1
         assert generated_jobs[0].interval.start == start_date.date()
         assert generated_jobs[1].interval.start == start_date.date() + duration(days=1)
 
+    def test_stream_slices_jobs_of_accounts_generated_together(self, api, async_manager_mock, mocker, start_date):
+        """Generating jobs of one account should not reset the cursor of the other accounts"""
+        mocker.patch.object(api, "get_account")
+        stream = AdsInsights(
+            api=api,
+            account_ids=["account_1", "account_2"],
+            start_date=start_date,
+            end_date=start_date + duration(days=2),
+            insights_lookback_window=28,
+        )
+        async_manager_mock.completed_jobs_by_account.return_value = [("account_2", 1), ("account_1", 2)]
+
+        slices = list(stream.stream_slices(stream_state=None, sync_mode=SyncMode.incremental))
+
+        assert slices == [{"account_id": "account_2", "insight_job": 1}, {"account_id": "account_1", "insight_job": 2}]
+        async_manager_mock.assert_called_once()
+        args, kwargs = async_manager_mock.call_args
+        account_1_jobs, account_2_jobs = kwargs["jobs"]["account_1"], kwargs["jobs"]["account_2"]
+        next(account_1_jobs)
+        stream._next_cursor_values["account_1"] = start_date.date() + duration(days=1)
+        assert len(list(account_2_jobs)) == 3
+        assert stream._next_cursor_values["account_1"] == start_date.date() + duration(days=1)
+
     @pytest.mark.parametrize("state_format", ["old_format", "new_format"])
     def test_stream_slices_with_state_and_slices(self, api, async_manager_mock, start_date, some_config, state_format):
         """Stream will use cursor_value from state, but will skip saved slices"""
@@ -451,7 +463,7 @@ class TestBaseInsightsStream:
             end_date=end_date,
             insights_lookback_window=28,
         )
-        async_manager_mock.completed_jobs.return_value = [1, 2, 3]
+        async_manager_mock.completed_jobs_by_account.return_value = [("unknown_account", 1), ("unknown_account", 2), ("unknown_account", 3)]
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
@@ -462,7 +474,7 @@ class TestBaseInsightsStream:
         ]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
-        generated_jobs = list(kwargs["jobs"])
+        generated_jobs = list(kwargs["jobs"]["unknown_account"])
         assert (
             len(generated_jobs) == (end_date.date() - (cursor_value.date() - stream.insights_lookback_period)).days + 1
         ), "should be 37 slices because we ignore slices which are within insights_lookback_period"
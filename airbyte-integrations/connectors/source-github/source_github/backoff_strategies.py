@@ -39,7 +39,8 @@ class GithubStreamABCBackoffStrategy(BackoffStrategy):
         if backoff_time_in_seconds < 60 * 10:  # type: ignore[operator]
             return backoff_time_in_seconds
         else:
-            self.stream._http_client._session.auth.update_token()  # New token will be used in next request
+            # The token limits and its retry time are refreshed from the rate limit headers of this response,
+            # so an available token with remaining requests will be used in next request
             return 1
 
 
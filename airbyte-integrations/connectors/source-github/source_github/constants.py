@@ -7,3 +7,5 @@ DEFAULT_PAGE_SIZE_FOR_LARGE_STREAM = 10
 DEFAULT_PAGE_SIZE = 100
 PERSONAL_ACCESS_TOKEN_TITLE = "Personal Access Token"
 ACCESS_TOKEN_TITLE = "Access Token"
+# Number of threads reading the organizations and repositories while checking the repositories from the config
+MAX_WORKERS = 10
@@ -3,17 +3,52 @@
 #
 
 import heapq
+import inspect
 import itertools
-from typing import Optional
+import json
+import re
+from functools import lru_cache, wraps
+from typing import Callable, Optional
 
 import sgqlc.operation
 from sgqlc.operation import Selector
 
-from . import github_schema
 
+_PLACEHOLDER = re.compile(r'"__query_variable_(\w+)__"')
 
-_schema = github_schema
-_schema_root = _schema.github_schema
+
+@lru_cache(maxsize=None)
+def get_schema_root():
+    # `github_schema` declares ~41k lines of types, it is imported with the first query instead of with the connector,
+    # so spec, check and discover and the streams without GraphQL queries don't pay for it.
+    from . import github_schema
+
+    return github_schema.github_schema
+
+
+def query_template(*variables: str) -> Callable:
+    """
+    Build the query only once for every query shape: string arguments listed in `variables` are rendered as
+    placeholders, which are replaced by the json encoded values of every call. Other arguments are a part of the shape.
+    """
+
+    def decorator(build_query: Callable) -> Callable:
+        signature = inspect.signature(build_query)
+        render = lru_cache(maxsize=128)(build_query)
+
+        @wraps(build_query)
+        def wrapper(*args, **kwargs) -> str:
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            values = {name: value for name, value in arguments.arguments.items() if name in variables and value}
+            query = render(
+                *(f"__query_variable_{name}__" if name in values else value for name, value in arguments.arguments.items())
+            )
+            return _PLACEHOLDER.sub(lambda match: json.dumps(values[match.group(1)]), query)
+
+        return wrapper
+
+    return decorator
 
 
 def select_user_fields(user):
@@ -27,12 +62,13 @@ def select_user_fields(user):
     )
 
 
+@query_template("owner", "name", "after")
 def get_query_pull_requests(owner, name, first, after, direction):
     kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": direction}}
     if after:
         kwargs["after"] = after
 
-    op = sgqlc.operation.Operation(_schema_root.query_type)
+    op = sgqlc.operation.Operation(get_schema_root().query_type)
     repository = op.repository(owner=owner, name=name)
     repository.name()
     repository.owner.login()
@@ -56,18 +92,19 @@ def get_query_pull_requests(owner, name, first, after, direction):
     reviews = pull_requests.nodes.reviews(first=100, __alias__="review_comments")
     reviews.total_count()
     reviews.nodes.comments.__fields__(total_count=True)
-    user = pull_requests.nodes.merged_by(__alias__="merged_by").__as__(_schema_root.User)
+    user = pull_requests.nodes.merged_by(__alias__="merged_by").__as__(get_schema_root().User)
     select_user_fields(user)
     pull_requests.page_info.__fields__(has_next_page=True, end_cursor=True)
     return str(op)
 
 
+@query_template("owner", "name", "after")
 def get_query_projectsV2(owner, name, first, after, direction):
     kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": direction}}
     if after:
         kwargs["after"] = after
 
-    op = sgqlc.operation.Operation(_schema_root.query_type)
+    op = sgqlc.operation.Operation(get_schema_root().query_type)
     repository = op.repository(owner=owner, name=name)
     repository.name()
     repository.owner.login()
@@ -96,8 +133,9 @@ def get_query_projectsV2(owner, name, first, after, direction):
     return str(op)
 
 
+@query_template("owner", "name", "after")
 def get_query_reviews(owner, name, first, after, number=None):
-    op = sgqlc.operation.Operation(_schema_root.query_type)
+    op = sgqlc.operation.Operation(get_schema_root().query_type)
     repository = op.repository(owner=owner, name=name)
     repository.name()
     repository.owner.login()
@@ -129,13 +167,14 @@ def get_query_reviews(owner, name, first, after, number=None):
         updated_at="updated_at",
     )
     reviews.nodes.commit.oid()
-    user = reviews.nodes.author(__alias__="user").__as__(_schema_root.User)
+    user = reviews.nodes.author(__alias__="user").__as__(get_schema_root().User)
     select_user_fields(user)
     return str(op)
 
 
+@query_template("owner", "name", "after")
 def get_query_issue_reactions(owner, name, first, after, number=None):
-    op = sgqlc.operation.Operation(_schema_root.query_type)
+    op = sgqlc.operation.Operation(get_schema_root().query_type)
     repository = op.repository(owner=owner, name=name)
     repository.name()
     repository.owner.login()
@@ -174,6 +213,7 @@ class QueryReactions:
     AVERAGE_COMMENTS = 2
     AVERAGE_REACTIONS = 2
 
+    @query_template("owner", "name", "after")
     def get_query_root_repository(self, owner: str, name: str, first: int, after: Optional[str] = None):
         """
         Get GraphQL query which allows fetching reactions starting from the repository:
@@ -208,6 +248,7 @@ class QueryReactions:
         self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
         return str(op)
 
+    @query_template("node_id", "after")
     def get_query_root_pull_request(self, node_id: str, first: int, after: str):
         """
         Get GraphQL query which allows fetching reactions starting from the pull_request:
@@ -223,7 +264,7 @@ class QueryReactions:
         }
         """
         op = self._get_operation()
-        pull_request = op.node(id=node_id).__as__(_schema_root.PullRequest)
+        pull_request = op.node(id=node_id).__as__(get_schema_root().PullRequest)
         pull_request.id(__alias__="node_id")
         pull_request.repository.name()
         pull_request.repository.owner.login()
@@ -233,6 +274,7 @@ class QueryReactions:
         self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
         return str(op)
 
+    @query_template("node_id", "after")
     def get_query_root_review(self, node_id: str, first: int, after: str):
         """
         Get GraphQL query which allows fetching reactions starting from the review:
@@ -246,7 +288,7 @@ class QueryReactions:
         }
         """
         op = self._get_operation()
-        review = op.node(id=node_id).__as__(_schema_root.PullRequestReview)
+        review = op.node(id=node_id).__as__(get_schema_root().PullRequestReview)
         review.id(__alias__="node_id")
         review.repository.name()
         review.repository.owner.login()
@@ -255,6 +297,7 @@ class QueryReactions:
         self._select_reactions(comments.nodes, first=self.AVERAGE_REACTIONS)
         return str(op)
 
+    @query_template("node_id", "after")
     def get_query_root_comment(self, node_id: str, first: int, after: str):
         """
         Get GraphQL query which allows fetching reactions starting from the comment:
@@ -266,7 +309,7 @@ class QueryReactions:
         }
         """
         op = self._get_operation()
-        comment = op.node(id=node_id).__as__(_schema_root.PullRequestReviewComment)
+        comment = op.node(id=node_id).__as__(get_schema_root().PullRequestReviewComment)
         comment.id(__alias__="node_id")
         comment.database_id(__alias__="id")
         comment.repository.name()
@@ -308,7 +351,7 @@ class QueryReactions:
         return reviews
 
     def _get_operation(self):
-        return sgqlc.operation.Operation(_schema_root.query_type)
+        return sgqlc.operation.Operation(get_schema_root().query_type)
 
 
 class CursorStorage:
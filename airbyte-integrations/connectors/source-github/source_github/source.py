@@ -90,23 +90,32 @@ class SourceGithub(AbstractSource):
         if unchecked_orgs:
             org_names = [org.split("/")[0] for org in unchecked_orgs]
             pattern = "|".join([f"({org.replace('*', '.*')})" for org in unchecked_orgs])
-            stream = Repositories(authenticator=authenticator, organizations=org_names, api_url=config.get("api_url"), pattern=pattern)
-            stream.exit_on_rate_limit = True if is_check_connection else False
-            for record in read_full_refresh(stream):
+
+            def repositories_stream() -> Repositories:
+                stream = Repositories(authenticator=authenticator, organizations=org_names, api_url=config.get("api_url"), pattern=pattern)
+                stream.exit_on_rate_limit = True if is_check_connection else False
+                return stream
+
+            for record in read_full_refresh(repositories_stream(), max_workers=constants.MAX_WORKERS, stream_factory=repositories_stream):
                 repositories.add(record["full_name"])
                 organizations.add(record["organization"])
 
         unchecked_repos = unchecked_repos - repositories
         if unchecked_repos:
-            stream = RepositoryStats(
-                authenticator=authenticator,
-                repositories=list(unchecked_repos),
-                api_url=config.get("api_url"),
-                # This parameter is deprecated and in future will be used sane default, page_size: 10
-                page_size_for_large_streams=config.get("page_size_for_large_streams", constants.DEFAULT_PAGE_SIZE_FOR_LARGE_STREAM),
-            )
-            stream.exit_on_rate_limit = True if is_check_connection else False
-            for record in read_full_refresh(stream):
+            def repository_stats_stream() -> RepositoryStats:
+                stream = RepositoryStats(
+                    authenticator=authenticator,
+                    repositories=list(unchecked_repos),
+                    api_url=config.get("api_url"),
+                    # This parameter is deprecated and in future will be used sane default, page_size: 10
+                    page_size_for_large_streams=config.get("page_size_for_large_streams", constants.DEFAULT_PAGE_SIZE_FOR_LARGE_STREAM),
+                )
+                stream.exit_on_rate_limit = True if is_check_connection else False
+                return stream
+
+            for record in read_full_refresh(
+                repository_stats_stream(), max_workers=constants.MAX_WORKERS, stream_factory=repository_stats_stream
+            ):
                 repositories.add(record["full_name"])
                 organization = record.get("organization", {}).get("login")
                 if organization:
@@ -237,6 +237,40 @@ class GithubStream(GithubStreamABC):
         )
 
 
+class ConditionalRequestsMixin:
+    """
+    Streams reading data that rarely changes revalidate the cached pages with conditional requests (`If-None-Match` /
+    `If-Modified-Since`) instead of requesting them again. GitHub answers `304 Not Modified` for unchanged pages
+    without counting the request against the rate limit, the page is then replayed from the cache.
+    The pages are kept by the request cache of the CDK, which is shared in memory by all the streams of the sync,
+    so only the pages read again during the same sync are revalidated. The pages of the previous syncs are
+    revalidated only when `REQUEST_CACHE_PATH` points to a directory kept between the syncs, which the connector
+    doesn't manage.
+    """
+
+    use_cache = True
+    _pages_count = 0
+    _cached_pages_count = 0
+
+    def request_headers(self, **kwargs) -> Mapping[str, Any]:
+        # `max-age=0` makes the request cache revalidate the cached page with GitHub instead of replaying it as is
+        return {**super().request_headers(**kwargs), "Cache-Control": "max-age=0"}
+
+    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        self._pages_count = self._cached_pages_count = 0
+        yield from super().stream_slices(**kwargs)
+        if self._pages_count:
+            self.logger.info(
+                f"Stream `{self.name}`: {self._cached_pages_count} of {self._pages_count} pages were not modified "
+                f"and replayed from the cache ({self._cached_pages_count / self._pages_count:.0%} hit rate)."
+            )
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        self._pages_count += 1
+        self._cached_pages_count += getattr(response, "from_cache", False)
+        yield from super().parse_response(response, **kwargs)
+
+
 class SemiIncrementalMixin(CheckpointMixin):
     """
     Semi incremental streams are also incremental but with one difference, they:
@@ -362,13 +396,13 @@ class RepositoryStats(GithubStream):
         yield response.json()
 
 
-class Assignees(GithubStream):
+class Assignees(ConditionalRequestsMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/issues/assignees?apiVersion=2022-11-28#list-assignees
     """
 
 
-class Branches(GithubStream):
+class Branches(ConditionalRequestsMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/branches/branches?apiVersion=2022-11-28#list-branches
     """
@@ -379,13 +413,13 @@ class Branches(GithubStream):
         return f"repos/{stream_slice['repository']}/branches"
 
 
-class Collaborators(GithubStream):
+class Collaborators(ConditionalRequestsMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/collaborators/collaborators?apiVersion=2022-11-28#list-repository-collaborators
     """
 
 
-class IssueLabels(GithubStream):
+class IssueLabels(ConditionalRequestsMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/issues/labels?apiVersion=2022-11-28#list-labels-for-a-repository
     """
@@ -447,7 +481,7 @@ class Repositories(SemiIncrementalMixin, Organizations):
                 yield record
 
 
-class Tags(GithubStream):
+class Tags(ConditionalRequestsMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/repos/repos?apiVersion=2022-11-28#list-repository-tags
     """
@@ -2,10 +2,12 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import threading
 import time
-from dataclasses import dataclass
-from itertools import cycle
-from typing import Any, List, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, List, Mapping, Optional
 
 import pendulum
 import requests
@@ -27,12 +29,33 @@ def getter(D: dict, key_or_keys, strict=True):
     return D
 
 
-def read_full_refresh(stream_instance: Stream):
+def read_full_refresh(stream_instance: Stream, max_workers: int = 1, stream_factory: Optional[Callable[[], Stream]] = None):
+    """
+    Read all the records of the stream. With `max_workers` the slices are read by a pool of threads, each of them reading
+    with its own stream instance made by `stream_factory`, since the streams keep per-read state.
+    """
     slices = stream_instance.stream_slices(sync_mode=SyncMode.full_refresh)
-    for _slice in slices:
-        records = stream_instance.read_records(stream_slice=_slice, sync_mode=SyncMode.full_refresh)
-        for record in records:
-            yield record
+    if max_workers <= 1 or stream_factory is None:
+        for _slice in slices:
+            records = stream_instance.read_records(stream_slice=_slice, sync_mode=SyncMode.full_refresh)
+            for record in records:
+                yield record
+        return
+
+    worker_streams = threading.local()
+
+    def read_slice(_slice):
+        if not hasattr(worker_streams, "stream"):
+            worker_streams.stream = stream_factory()
+        return list(worker_streams.stream.read_records(stream_slice=_slice, sync_mode=SyncMode.full_refresh))
+
+    # slices are read by a pool of threads, but the records are still returned in the order of the slices
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for records in executor.map(read_slice, slices):
+            yield from records
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 
 class GitHubAPILimitException(Exception):
@@ -43,27 +66,34 @@ class GitHubAPILimitException(Exception):
 class Token:
     count_rest: int = 5000
     count_graphql: int = 5000
-    reset_at_rest: pendulum.DateTime = pendulum.now()
-    reset_at_graphql: pendulum.DateTime = pendulum.now()
+    reset_at_rest: pendulum.DateTime = field(default_factory=pendulum.now)
+    reset_at_graphql: pendulum.DateTime = field(default_factory=pendulum.now)
+    # The token is not used before this time, which is set by the `Retry-After` header of secondary rate limits
+    retry_at: pendulum.DateTime = field(default_factory=pendulum.now)
 
 
 class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
     """
-    Each token in the cycle is checked against the rate limiter.
-    If a token exceeds the capacity limit, the system switches to another token.
+    Each request gets the token with the most remaining requests for the API it calls (REST or GraphQL).
+    Token limits are counted down per request and refreshed from the rate limit headers of the responses.
+    A token which hit a secondary rate limit is not used until the time given by the `Retry-After` header.
     If all tokens are exhausted, the system will enter a sleep state until
     the first token becomes available again.
+    Token limits are shared by all the threads making requests, so they are only changed under a lock,
+    which is not held while sleeping or requesting the token limits.
     """
 
     DURATION = pendulum.duration(seconds=3600)  # Duration at which the current rate limit window resets
+    # Maps the `X-RateLimit-Resource` response header to the token limit attributes
+    RESOURCES = {"core": ("count_rest", "reset_at_rest"), "graphql": ("count_graphql", "reset_at_graphql")}
 
     def __init__(self, tokens: List[str], auth_method: str = "token", auth_header: str = "Authorization"):
         self._auth_method = auth_method
         self._auth_header = auth_header
         self._tokens = {t: Token() for t in tokens}
+        self._lock = threading.Lock()
         self.check_all_tokens()
-        self._tokens_iter = cycle(self._tokens)
-        self._active_token = next(self._tokens_iter)
+        self._active_token = next(iter(self._tokens))
         self._max_time = 60 * 10  # 10 minutes as default
 
     @property
@@ -78,16 +108,22 @@ class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
 
     def __call__(self, request):
         """Attach the HTTP headers required to authenticate on the HTTP request"""
+        count_attr, reset_attr = self.RESOURCES["graphql" if "graphql" in request.path_url else "core"]
         while True:
-            current_token = self._tokens[self.current_active_token]
-            if "graphql" in request.path_url:
-                if self.process_token(current_token, "count_graphql", "reset_at_graphql"):
-                    break
-            else:
-                if self.process_token(current_token, "count_rest", "reset_at_rest"):
+            with self._lock:
+                if self.process_token(count_attr, reset_attr):
+                    auth_header = self.get_auth_header()
+                    token = self.current_active_token
                     break
+                min_time_to_wait = self.get_time_to_wait(count_attr, reset_attr)
 
-        request.headers.update(self.get_auth_header())
+            if min_time_to_wait >= self.max_time:
+                raise GitHubAPILimitException(f"Rate limits for all tokens ({count_attr}) were reached")
+            time.sleep(min_time_to_wait if min_time_to_wait > 0 else 0)
+            self.check_all_tokens()
+
+        request.headers.update(auth_header)
+        request.register_hook("response", partial(self.update_token_limits, token))
 
         return request
 
@@ -95,9 +131,6 @@ class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
     def current_active_token(self) -> str:
         return self._active_token
 
-    def update_token(self) -> None:
-        self._active_token = next(self._tokens_iter)
-
     @property
     def token(self) -> str:
         token = self.current_active_token
@@ -121,34 +154,73 @@ class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
             .json()
             .get("resources")
         )
-        token_info = self._tokens[token]
-        remaining_info_core = rate_limit_info.get("core")
-        token_info.count_rest, token_info.reset_at_rest = (
-            remaining_info_core.get("remaining"),
-            pendulum.from_timestamp(remaining_info_core.get("reset")),
-        )
+        with self._lock:
+            token_info = self._tokens[token]
+            remaining_info_core = rate_limit_info.get("core")
+            token_info.count_rest, token_info.reset_at_rest = (
+                remaining_info_core.get("remaining"),
+                pendulum.from_timestamp(remaining_info_core.get("reset")),
+            )
 
-        remaining_info_graphql = rate_limit_info.get("graphql")
-        token_info.count_graphql, token_info.reset_at_graphql = (
-            remaining_info_graphql.get("remaining"),
-            pendulum.from_timestamp(remaining_info_graphql.get("reset")),
-        )
+            remaining_info_graphql = rate_limit_info.get("graphql")
+            token_info.count_graphql, token_info.reset_at_graphql = (
+                remaining_info_graphql.get("remaining"),
+                pendulum.from_timestamp(remaining_info_graphql.get("reset")),
+            )
 
     def check_all_tokens(self):
         for token in self._tokens:
             self._check_token_limits(token)
 
-    def process_token(self, current_token, count_attr, reset_attr):
+    def process_token(self, count_attr, reset_attr):
+        """Make the available token with the most remaining requests active and count the request, must be called under the lock"""
+        now = pendulum.now()
+        available_tokens = [token for token, token_info in self._tokens.items() if token_info.retry_at <= now]
+        if not available_tokens:
+            return False
+
+        token = max(available_tokens, key=lambda t: getattr(self._tokens[t], count_attr))
+        current_token = self._tokens[token]
         if getattr(current_token, count_attr) > 0:
+            self._active_token = token
             setattr(current_token, count_attr, getattr(current_token, count_attr) - 1)
             return True
-        elif all(getattr(x, count_attr) == 0 for x in self._tokens.values()):
-            min_time_to_wait = min((getattr(x, reset_attr) - pendulum.now()).in_seconds() for x in self._tokens.values())
-            if min_time_to_wait < self.max_time:
-                time.sleep(min_time_to_wait if min_time_to_wait > 0 else 0)
-                self.check_all_tokens()
-            else:
-                raise GitHubAPILimitException(f"Rate limits for all tokens ({count_attr}) were reached")
-        else:
-            self.update_token()
+        # the available token with the most remaining requests is exhausted, so all available tokens are exhausted
         return False
+
+    def get_time_to_wait(self, count_attr, reset_attr) -> int:
+        """Seconds until the first token is available again, must be called under the lock"""
+        now = pendulum.now()
+        times_to_wait = []
+        for token_info in self._tokens.values():
+            time_to_wait = (token_info.retry_at - now).in_seconds()
+            if getattr(token_info, count_attr) <= 0:
+                time_to_wait = max(time_to_wait, (getattr(token_info, reset_attr) - now).in_seconds())
+            times_to_wait.append(time_to_wait)
+        return min(times_to_wait)
+
+    def update_token_limits(self, token: str, response: requests.Response, **kwargs) -> requests.Response:
+        """Refresh the token limits from the rate limit headers GitHub sends with every response"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            # the token hit a secondary rate limit, the other tokens are used until it can be retried
+            with self._lock:
+                self._tokens[token].retry_at = pendulum.now().add(seconds=float(retry_after))
+
+        limit_attrs = self.RESOURCES.get(response.headers.get("X-RateLimit-Resource"))
+        remaining, reset = response.headers.get("X-RateLimit-Remaining"), response.headers.get("X-RateLimit-Reset")
+        if not limit_attrs or remaining is None or reset is None:
+            return response
+
+        count_attr, reset_attr = limit_attrs
+        remaining, reset_at = int(remaining), pendulum.from_timestamp(int(reset))
+        with self._lock:
+            token_info = self._tokens[token]
+            if reset_at > getattr(token_info, reset_attr):
+                # the rate limit window has been reset since the limits were refreshed
+                setattr(token_info, count_attr, remaining)
+                setattr(token_info, reset_attr, reset_at)
+            else:
+                # responses of concurrent requests can come out of order, so the smallest remaining count is the latest one
+                setattr(token_info, count_attr, min(getattr(token_info, count_attr), remaining))
+        return response
@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 import pendulum
 import pytest
+import requests
 import responses
 from freezegun import freeze_time
 from source_github import SourceGithub
@@ -30,6 +31,7 @@ def test_authenticator_counter(rate_limit_mock_response):
     This test ensures that the rate limiter:
      1. correctly handles the available limits from GitHub API and saves it.
      2. correctly counts the number of requests made.
+     3. hands each request the token with the most remaining requests.
     """
     authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
 
@@ -39,14 +41,14 @@ def test_authenticator_counter(rate_limit_mock_response):
     responses.add("GET", "https://api.github.com/orgs/org1", json={"id": 1})
     responses.add("GET", "https://api.github.com/orgs/org2", json={"id": 2})
     list(read_full_refresh(stream))
-    assert authenticator._tokens["token1"].count_rest == 4998
+    assert [x.count_rest for x in authenticator._tokens.values()] == [4999, 4999, 5000]
 
 
 @responses.activate
 def test_multiple_token_authenticator_with_rate_limiter():
     """
     This test ensures that:
-     1. The rate limiter iterates over all tokens one-by-one after the previous is fully drained.
+     1. The rate limiter spreads the requests over all tokens until all of them are drained.
      2. Counter is set to zero after 1500 requests were made. (500 available requests per key were set as default)
      3. Exception is handled and log warning message could be found in output. Connector does not raise AirbyteTracedException because there might be GraphQL streams with remaining request we still can read.
     """
@@ -145,4 +147,81 @@ def test_multiple_token_authenticator_with_rate_limiter_and_sleep(sleep_mock, ca
 
     list(read_full_refresh(stream))
     sleep_mock.assert_called_once_with(ACCEPTED_WAITING_TIME_IN_SECONDS)
-    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(500, 500), (500, 500), (498, 500)]
+    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(499, 500), (499, 500), (500, 500)]
+
+
+@responses.activate
+def test_authenticator_updates_limits_from_response_headers(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2"])
+    stream = Organizations(organizations=["org1"], authenticator=authenticator)
+    reset = pendulum.datetime(2099, 1, 1).int_timestamp
+    responses.add(
+        "GET",
+        "https://api.github.com/orgs/org1",
+        json={"id": 1},
+        headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(reset)},
+    )
+
+    list(read_full_refresh(stream))
+
+    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(10, 5000), (5000, 5000)]
+    # the next requests get the token with the most remaining requests
+    list(read_full_refresh(stream))
+    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(10, 5000), (10, 5000)]
+
+
+@responses.activate
+def test_authenticator_counts_concurrent_requests(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
+    worker_streams = []
+
+    def organizations_stream():
+        stream = Organizations(organizations=[f"org{i}" for i in range(30)], authenticator=authenticator)
+        worker_streams.append(stream)
+        return stream
+
+    for i in range(30):
+        responses.add("GET", f"https://api.github.com/orgs/org{i}", json={"id": i})
+
+    records = list(read_full_refresh(organizations_stream(), max_workers=10, stream_factory=organizations_stream))
+
+    assert [record["id"] for record in records] == list(range(30))
+    assert [x.count_rest for x in authenticator._tokens.values()] == [4990, 4990, 4990]
+    # each worker reads its slices with its own stream instance
+    assert 1 < len(worker_streams) <= 11
+
+
+@freeze_time("2021-01-01 12:00:00")
+@responses.activate
+def test_authenticator_skips_token_until_retry_after(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2"])
+    response = requests.Response()
+    response.status_code = 403
+    response.headers["Retry-After"] = "120"
+
+    authenticator.update_token_limits("token1", response)
+
+    assert authenticator._tokens["token1"].retry_at == pendulum.now().add(seconds=120)
+    # the token with the most remaining requests is skipped until it can be retried
+    request = requests.Request("GET", "https://api.github.com/orgs/org1").prepare()
+    assert [authenticator(request.copy()).headers["Authorization"] for _ in range(3)] == ["token token2"] * 3
+
+
+@freeze_time("2021-01-01 12:00:00")
+@responses.activate
+@patch("time.sleep")
+def test_authenticator_waits_for_retry_after_without_lock(sleep_mock, rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1"])
+    authenticator._tokens["token1"].retry_at = pendulum.now().add(seconds=30)
+
+    def sleep(seconds):
+        # the other threads can use the authenticator while this one is waiting
+        assert not authenticator._lock.locked()
+        authenticator._tokens["token1"].retry_at = pendulum.now()
+
+    sleep_mock.side_effect = sleep
+    stream = Organizations(organizations=["org1"], authenticator=authenticator)
+    responses.add("GET", "https://api.github.com/orgs/org1", json={"id": 1})
+
+    assert list(read_full_refresh(stream)) == [{"id": 1}]
+    sleep_mock.assert_called_once_with(30)
@@ -3,6 +3,8 @@
 #
 
 import json
+import subprocess
+import sys
 from http import HTTPStatus
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -13,6 +15,7 @@ import responses
 from requests import HTTPError
 from responses import matchers
 from source_github import SourceGithub, constants
+from source_github.graphql import get_query_reviews
 from source_github.streams import (
     Branches,
     Collaborators,
@@ -54,6 +57,7 @@ from source_github.utils import read_full_refresh
 from airbyte_cdk.models import ConfiguredAirbyteCatalog, SyncMode
 from airbyte_cdk.sources.streams.http.error_handlers import ErrorHandler, ErrorResolution, HttpStatusErrorHandler, ResponseAction
 from airbyte_cdk.sources.streams.http.exceptions import BaseBackoffException, UserDefinedBackoffException
+from airbyte_cdk.sources.streams.http.requests_native_auth import TokenAuthenticator
 from airbyte_protocol.models import FailureType
 
 from .utils import ProjectsResponsesAPI, read_incremental
@@ -1004,6 +1008,35 @@ def test_streams_read_full_refresh():
     assert records == [{"repository": "organization/repository", "starred_at": "2022-02-02T00:00:00Z", "user": {"id": 2}, "user_id": 2}]
 
 
+@responses.activate
+def test_stream_conditional_requests(caplog):
+    repository_args = {"repositories": ["organization/repository"], "page_size_for_large_streams": 100}
+    url = "https://api.github.com/repos/organization/repository/tags"
+    stream = Tags(authenticator=TokenAuthenticator("token_1"), **repository_args)
+    stream._http_client.clear_cache()
+
+    responses.add("GET", url, json=[{"name": "v1"}], headers={"ETag": '"etag_1"'})
+    responses.add("GET", url, status=requests.codes.NOT_MODIFIED, headers={"ETag": '"etag_1"'})
+    responses.add("GET", url, json=[{"name": "v1"}], headers={"ETag": '"etag_2"'})
+    expected_records = [{"name": "v1", "repository": "organization/repository"}]
+
+    assert list(read_full_refresh(stream)) == expected_records
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+    # the next sync revalidates the page with its ETag and replays the cached page on 304
+    stream = Tags(authenticator=TokenAuthenticator("token_1"), **repository_args)
+    assert list(read_full_refresh(stream)) == expected_records
+    assert responses.calls[1].request.headers["If-None-Match"] == '"etag_1"'
+    assert "1 of 1 pages were not modified and replayed from the cache (100% hit rate)" in caplog.text
+
+    # a modified page is read again, GitHub decides whether the page is modified for the token of the request
+    stream = Tags(authenticator=TokenAuthenticator("token_2"), **repository_args)
+    assert list(read_full_refresh(stream)) == expected_records
+    assert responses.calls[2].request.headers["If-None-Match"] == '"etag_1"'
+    assert responses.calls[2].request.headers["Authorization"] == "Bearer token_2"
+    assert len(responses.calls) == 3
+
+
 @responses.activate
 def test_stream_reviews_incremental_read():
     repository_args_with_start_date = {
@@ -1620,3 +1653,25 @@ def test_pull_request_stats():
 
     list(read_full_refresh(stream))
     assert query == expected_query
+
+
+def test_graphql_query_template():
+    query = get_query_reviews(owner="airbytehq", name='air"byte', first=10, after="Y3Vyc29y")
+    assert 'repository(owner: "airbytehq", name: "air\\"byte")' in query
+    assert 'pullRequests(first: 10, orderBy: {field: UPDATED_AT, direction: ASC}, after: "Y3Vyc29y")' in query
+
+    # the query built for the same shape is reused with the values of the next page
+    query = get_query_reviews(owner="airbytehq", name="airbyte", first=10, after="bmV4dA==", number=5)
+    assert 'repository(owner: "airbytehq", name: "airbyte")' in query
+    assert 'pullRequest(number: 5)' in query
+    assert 'reviews(first: 10, after: "bmV4dA==")' in query
+    assert "after" not in get_query_reviews(owner="airbytehq", name="airbyte", first=10, after=None)
+
+
+def test_github_schema_is_imported_with_first_query():
+    code = (
+        "import sys, source_github; assert 'source_github.github_schema' not in sys.modules; "
+        "from source_github.graphql import get_query_reviews; get_query_reviews('owner', 'name', 10, None); "
+        "assert 'source_github.github_schema' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
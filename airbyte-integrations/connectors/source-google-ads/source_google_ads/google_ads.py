@@ -4,14 +4,18 @@
 
 
 from enum import Enum
-from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 import backoff
 from google.ads.googleads.client import GoogleAdsClient
-from google.ads.googleads.v18.services.types.google_ads_service import GoogleAdsRow, SearchGoogleAdsResponse
+from google.ads.googleads.v18.services.types.google_ads_service import GoogleAdsRow
 from google.api_core.exceptions import InternalServerError, ServerError, ServiceUnavailable, TooManyRequests
 from google.auth import exceptions
 from google.protobuf import json_format
+from google.protobuf.descriptor import FieldDescriptor
 from google.protobuf.message import Message
 from proto.marshal.collections import Repeated, RepeatedComposite
 
@@ -109,7 +113,41 @@ class GoogleAds:
         query: str,
         customer_id: str,
         login_customer_id: str = "default",
-    ) -> Iterator[SearchGoogleAdsResponse]:
+    ) -> Iterator[Iterable[GoogleAdsRow]]:
+        """
+        Read the query results with a server-streaming request, which returns all the rows in a single call instead of
+        requesting them page by page. The rows are returned by the batches they are streamed in.
+        The first batch is read here, so the request is retried when the stream fails before returning any rows.
+        """
+        client = self.get_client(login_customer_id)
+        search_request = client.get_type("SearchGoogleAdsStreamRequest")
+        search_request.query = query
+        search_request.customer_id = customer_id
+        response_stream = iter(self.ga_service(login_customer_id).search_stream(search_request))
+        first_response = next(response_stream, None)
+        if first_response is None:
+            return iter(())
+        return (response.results for response in chain([first_response], response_stream))
+
+    @backoff.on_exception(
+        backoff.expo,
+        (InternalServerError, ServerError, ServiceUnavailable, TooManyRequests),
+        on_backoff=lambda details: logger.info(
+            f"Caught retryable error after {details['tries']} tries. Waiting {details['wait']} seconds then retrying..."
+        ),
+        on_giveup=on_give_up,
+        max_tries=5,
+    )
+    def send_paged_request(
+        self,
+        query: str,
+        customer_id: str,
+        login_customer_id: str = "default",
+    ) -> Iterator[Iterable[GoogleAdsRow]]:
+        """
+        Read the query results page by page. The pager requests the next page with its page token only once the rows
+        of the current one are read, so the reading can be resumed at the page which failed.
+        """
         client = self.get_client(login_customer_id)
         search_request = client.get_type("SearchGoogleAdsRequest")
         search_request.query = query
@@ -264,9 +302,62 @@ class GoogleAds:
 
         return field_value
 
+    @staticmethod
+    def _compile_field_getter(field: str) -> Optional[Callable[[Message], Any]]:
+        """
+        Resolve the field path against the GoogleAdsRow protobuf descriptor once, so the value can be read
+        from the raw protobuf row the same way get_field_value reads it from the proto-plus wrappers.
+        Returns None for the fields that are not resolved or are serialized as proto-plus objects,
+        those are left to get_field_value.
+        """
+        descriptor = GoogleAdsRow.meta.pb.DESCRIPTOR
+        field_descriptor = None
+        for level_attr in field.split("."):
+            if descriptor is None or (field_descriptor and field_descriptor.label == FieldDescriptor.LABEL_REPEATED):
+                return None
+            field_descriptor = descriptor.fields_by_name.get(level_attr)
+            if field_descriptor is None:
+                return None
+            descriptor = field_descriptor.message_type
+
+        get_value = attrgetter(field)
+        if field_descriptor.label == FieldDescriptor.LABEL_REPEATED:
+            if field_descriptor.message_type:
+                return lambda row: [json_format.MessageToJson(value, indent=0).replace("\n", "") for value in get_value(row)]
+            return lambda row: [str(value) for value in get_value(row)]
+        if field_descriptor.enum_type:
+            enum_names = {value.number: value.name for value in field_descriptor.enum_type.values}
+
+            def get_enum_name(row: Message) -> Any:
+                value = get_value(row)
+                return enum_names.get(value, value)
+
+            return get_enum_name
+        if field_descriptor.message_type or field_descriptor.type == FieldDescriptor.TYPE_BYTES:
+            return None
+        return get_value
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_row_parser(fields: Tuple[str, ...]) -> Callable[[GoogleAdsRow], MutableMapping[str, Any]]:
+        """
+        Build the record parser for the fields of a query once: field paths are resolved to protobuf descriptors
+        and enum names are looked up in precomputed tables, so rows are read from the raw protobuf message
+        instead of walking the proto-plus wrappers field by field.
+        """
+        field_getters = [(field, GoogleAds._compile_field_getter(field)) for field in fields]
+
+        def parse_row(result: GoogleAdsRow) -> MutableMapping[str, Any]:
+            if not isinstance(result, GoogleAdsRow):
+                return {field: GoogleAds.get_field_value(result, field, {}) for field in fields}
+            row = result._pb
+            return {
+                field: get_value(row) if get_value else GoogleAds.get_field_value(result, field, {}) for field, get_value in field_getters
+            }
+
+        return parse_row
+
     @staticmethod
     def parse_single_result(schema: Mapping[str, Any], result: GoogleAdsRow):
-        props = schema.get("properties")
-        fields = GoogleAds.get_fields_from_schema(schema)
-        single_record = {field: GoogleAds.get_field_value(result, field, props.get(field)) for field in fields}
-        return single_record
+        fields = tuple(GoogleAds.get_fields_from_schema(schema))
+        return GoogleAds.get_row_parser(fields)(result)
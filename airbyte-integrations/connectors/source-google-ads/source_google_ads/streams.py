@@ -4,13 +4,14 @@
 
 
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping, Optional
 
 import backoff
 import pendulum
 from google.ads.googleads.errors import GoogleAdsException
 from google.ads.googleads.v18.services.services.google_ads_service.pagers import SearchPager
-from google.ads.googleads.v18.services.types.google_ads_service import SearchGoogleAdsResponse
+from google.ads.googleads.v18.services.types.google_ads_service import GoogleAdsRow
 from google.api_core.exceptions import InternalServerError, ServerError, ServiceUnavailable, TooManyRequests, Unauthenticated
 
 from airbyte_cdk.models import FailureType, SyncMode
@@ -25,10 +26,13 @@ from .utils import ExpiredPageTokenError, chunk_date_range, detached, generator_
 
 class GoogleAdsStream(Stream, ABC):
     CATCH_CUSTOMER_NOT_ENABLED_ERROR = True
+    # number of slices requested in the background while the records of the current slice are read
+    max_prefetched_slices = 2
 
     def __init__(self, api: GoogleAds, customers: List[CustomerModel]):
         self.google_ads_client = api
         self.customers = customers
+        self._prefetched_records = {}
 
     def get_query(self, stream_slice: Mapping[str, Any]) -> str:
         fields = GoogleAds.get_fields_from_schema(self.get_json_schema())
@@ -37,12 +41,43 @@ class GoogleAdsStream(Stream, ABC):
         return query
 
     def parse_response(self, response: SearchPager, stream_slice: Optional[Mapping[str, Any]] = None) -> Iterable[Mapping]:
+        schema = self.get_json_schema()
         for result in response:
-            yield self.google_ads_client.parse_single_result(self.get_json_schema(), result)
+            yield self.google_ads_client.parse_single_result(schema, result)
 
     def stream_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Optional[Mapping[str, any]]]:
-        for customer in self.customers:
-            yield {"customer_id": customer.id, "login_customer_id": customer.login_customer_id}
+        customer_slices = ({"customer_id": customer.id, "login_customer_id": customer.login_customer_id} for customer in self.customers)
+        yield from self.prefetch_slices(customer_slices)
+
+    def prefetch_slices(self, stream_slices: Iterable[Optional[Mapping[str, Any]]]) -> Iterable[Optional[Mapping[str, Any]]]:
+        """
+        Start requesting the records of the next slices in the background before yielding the current one,
+        so reading many customers and date ranges is not limited to one request in flight.
+        At most `max_prefetched_slices` + 1 requests are started ahead of reading,
+        they are picked up by `request_records_job` when the slice with the same query is read.
+        """
+        if not self.max_prefetched_slices:
+            yield from stream_slices
+            return
+
+        pending_slices = deque()
+        try:
+            for stream_slice in stream_slices:
+                if stream_slice and len(self._prefetched_records) <= self.max_prefetched_slices:
+                    customer_id, login_customer_id = stream_slice["customer_id"], stream_slice["login_customer_id"]
+                    query = self.get_query(stream_slice)
+                    self._prefetched_records[(customer_id, login_customer_id, query)] = self.request_records(
+                        customer_id, login_customer_id, query, stream_slice
+                    )
+                pending_slices.append(stream_slice)
+                if len(pending_slices) > self.max_prefetched_slices:
+                    yield pending_slices.popleft()
+            yield from pending_slices
+        finally:
+            # the slices are not read to the end, stop the requests of the slices which are not going to be read
+            for records in self._prefetched_records.values():
+                records.close()
+            self._prefetched_records.clear()
 
     @generator_backoff(
         wait_gen=backoff.constant,
@@ -53,10 +88,13 @@ class GoogleAdsStream(Stream, ABC):
         ),
         interval=1,
     )
-    @detached(timeout_minutes=5)
     def request_records_job(self, customer_id, login_customer_id, query, stream_slice):
-        response_records = self.google_ads_client.send_request(query=query, customer_id=customer_id, login_customer_id=login_customer_id)
-        yield from self.parse_records_with_backoff(response_records, stream_slice)
+        records = self._prefetched_records.pop((customer_id, login_customer_id, query), None)
+        yield from records or self.request_records(customer_id, login_customer_id, query, stream_slice)
+
+    @detached(timeout_minutes=5)
+    def request_records(self, customer_id, login_customer_id, query, stream_slice):
+        yield from self.read_query(query, stream_slice, customer_id=customer_id, login_customer_id=login_customer_id)
 
     def read_records(self, sync_mode, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
         if stream_slice is None:
@@ -73,6 +111,30 @@ class GoogleAdsStream(Stream, ABC):
             # Prevent sync failure
             logger.warning(f"Timeout: Failed to access {self.name} stream data. {str(exception)}")
 
+    def read_query(self, query: str, stream_slice: Optional[Mapping[str, Any]] = None, **request_kwargs) -> Iterable[Mapping[str, Any]]:
+        """
+        The request is retried by `send_request` when the stream of its results fails before any rows are returned.
+        Once rows are read the stream can't be resumed, the rows are not guaranteed to be streamed in the same order
+        by a new request. The query is then read again from the start page by page, so the records read before the error
+        are emitted again rather than lost, and the later errors are retried from the page which failed.
+        """
+        response_records = self.google_ads_client.send_request(query, **request_kwargs)
+        try:
+            yield from self.parse_records(response_records, stream_slice)
+        except (InternalServerError, ServerError, ServiceUnavailable, TooManyRequests) as error:
+            logger.warning(
+                f"The stream of the results of {self.name} was interrupted by a temporal error: {error}. "
+                f"Reading the query again page by page, the records read so far are emitted again."
+            )
+            response_records = self.google_ads_client.send_paged_request(query, **request_kwargs)
+            yield from self.parse_records_with_backoff(response_records, stream_slice)
+
+    def parse_records(
+        self, response_records: Iterator[Iterable[GoogleAdsRow]], stream_slice: Optional[Mapping[str, Any]] = None
+    ) -> Iterable[Mapping[str, Any]]:
+        for response in response_records:
+            yield from self.parse_response(response, stream_slice)
+
     @generator_backoff(
         wait_gen=backoff.expo,
         exception=(InternalServerError, ServerError, ServiceUnavailable, TooManyRequests),
@@ -84,10 +146,10 @@ class GoogleAdsStream(Stream, ABC):
         factor=5,
     )
     def parse_records_with_backoff(
-        self, response_records: Iterator[SearchGoogleAdsResponse], stream_slice: Optional[Mapping[str, Any]] = None
+        self, response_records: Iterator[Iterable[GoogleAdsRow]], stream_slice: Optional[Mapping[str, Any]] = None
     ) -> Iterable[Mapping[str, Any]]:
-        for response in response_records:
-            yield from self.parse_response(response, stream_slice)
+        """The pagers of the paged requests are iterated again after an error, continuing from the page which failed."""
+        yield from self.parse_records(response_records, stream_slice)
 
 
 class IncrementalGoogleAdsStream(GoogleAdsStream, CheckpointMixin, ABC):
@@ -131,6 +193,9 @@ class IncrementalGoogleAdsStream(GoogleAdsStream, CheckpointMixin, ABC):
             return default
 
     def stream_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Optional[MutableMapping[str, any]]]:
+        yield from self.prefetch_slices(self.date_range_slices(stream_state))
+
+    def date_range_slices(self, stream_state: Mapping[str, Any] = None) -> Iterable[Optional[MutableMapping[str, any]]]:
         for customer in self.customers:
             stream_state = stream_state or {}
             if stream_state.get(customer.id):
@@ -228,6 +293,8 @@ class CustomerClient(GoogleAdsStream):
     """
 
     primary_key = ["customer_client.id"]
+    # records are requested in read_records without request_records_job
+    max_prefetched_slices = 0
 
     def __init__(self, customer_status_filter: List[str], **kwargs):
         self.customer_status_filter = customer_status_filter
@@ -258,9 +325,7 @@ class CustomerClient(GoogleAdsStream):
         customer_id = stream_slice["customer_id"]
 
         try:
-            response_records = self.google_ads_client.send_request(self.get_query(stream_slice), customer_id=customer_id)
-
-            yield from self.parse_records_with_backoff(response_records, stream_slice)
+            yield from self.read_query(self.get_query(stream_slice), stream_slice, customer_id=customer_id)
         except GoogleAdsException as exception:
             traced_exception(exception, customer_id, self.CATCH_CUSTOMER_NOT_ENABLED_ERROR)
 
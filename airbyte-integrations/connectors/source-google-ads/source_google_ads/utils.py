@@ -215,67 +215,71 @@ class RunAsThread:
     The `RunAsThread` decorator is designed to run a generator function in a separate thread with a specified timeout.
     This is particularly useful when dealing with functions that involve potentially time-consuming operations,
     and you want to enforce a time limit for their execution.
+    The thread is started as soon as the decorated function is called, so it can produce data before the results are read.
     """
 
-    def __init__(self, timeout_minutes):
+    # Marks the end of the data produced by the generator function.
+    END_OF_DATA = object()
+
+    def __init__(self, timeout_minutes, max_queue_size=1000):
         """
         :param timeout_minutes: The maximum allowed time (in minutes) for the generator function to idle.
                                 If the timeout is reached, a TimeoutError is raised.
+        :param max_queue_size: The maximum number of values the thread can produce ahead of the reader,
+                               the thread blocks until the reader catches up.
         """
         self._timeout_seconds = timeout_minutes * 60
+        self._max_queue_size = max_queue_size
 
     def __call__(self, generator_func):
         @functools.wraps(generator_func)
         def wrapper(*args, **kwargs):
             """
-            The wrapper function sets up threading components, starts a separate thread to run the generator function.
-            It uses events and a queue for communication and synchronization between the main thread and the thread running the generator function.
+            The wrapper function starts a separate thread to run the generator function and returns a generator reading its results.
+            A bounded queue is used to hand the results over from the thread and an event to stop the thread when reading is stopped.
             """
-            # Event and Queue initialization
-            write_event = threading.Event()
             exit_event = threading.Event()
-            the_queue = queue.Queue()
+            the_queue = queue.Queue(maxsize=self._max_queue_size)
 
-            # Thread initialization and start
-            thread = threading.Thread(
-                target=self.target, args=(the_queue, write_event, exit_event, generator_func, args, kwargs), daemon=True
-            )
+            thread = threading.Thread(target=self.target, args=(the_queue, exit_event, generator_func, args, kwargs), daemon=True)
             thread.start()
 
-            # Records the starting time for the timeout calculation.
-            start_time = time.time()
-            while thread.is_alive() or not the_queue.empty():
-                # The main thread waits for the `write_event` to be set or until the specified timeout.
-                if the_queue.empty():
-                    write_event.wait(self._timeout_seconds)
-                try:
-                    # The main thread yields the result obtained from reading the queue.
-                    yield self.read(the_queue)
-                    # The timer is reset since a new result has been received, preventing the timeout from occurring.
-                    start_time = time.time()
-                except queue.Empty:
-                    # If exit_event is set it means that the generator function in the thread has completed its execution.
-                    if exit_event.is_set():
-                        break
-                    # Check if the timeout has been reached without new results.
-                    if time.time() - start_time > self._timeout_seconds:
-                        # The thread may continue to run for some time after reaching a timeout and even come to life and continue working.
-                        # That is why the exit event is set to signal the generator function to stop producing data.
-                        exit_event.set()
-                        raise TimeoutError(f"Method '{generator_func.__name__}' timed out after {self._timeout_seconds / 60.0} minutes")
-                    # The write event is cleared to reset it for the next iteration.
-                    write_event.clear()
+            return DetachedResults(self.read(the_queue, exit_event, generator_func.__name__), exit_event)
 
         return wrapper
 
-    def target(self, the_queue, write_event, exit_event, func, args, kwargs):
+    def read(self, the_queue, exit_event, func_name):
+        """
+        Yields the values from the queue until the generator function completes, raising the exceptions it has written to the queue.
+        :param the_queue: A queue used for communication between the main thread and the thread running the generator function.
+        :param exit_event: An event indicating whether the generator function should stop producing data.
+        :param func_name: The name of the generator function used in the timeout message.
+        :return: a generator of the values produced by the generator function
+        """
+        try:
+            while True:
+                try:
+                    # Blocks until the thread produces a value or the generator function idles longer than the timeout.
+                    value = the_queue.get(timeout=self._timeout_seconds)
+                except queue.Empty:
+                    raise TimeoutError(f"Method '{func_name}' timed out after {self._timeout_seconds / 60.0} minutes")
+                if value is self.END_OF_DATA:
+                    return
+                if isinstance(value, Exception):
+                    raise value
+                yield value
+        finally:
+            # The thread may continue to run after a timeout or when the results are not read to the end,
+            # that is why the exit event is set to signal the generator function to stop producing data.
+            exit_event.set()
+
+    def target(self, the_queue, exit_event, func, args, kwargs):
         """
         This is a target function for the thread.
         It runs the actual generator function, writing its results to a queue.
         Exceptions raised during execution are also written to the queue.
         :param the_queue: A queue used for communication between the main thread and the thread running the generator function.
-        :param write_event: An event signaling the availability of new data in the queue.
-        :param exit_event: An event indicating whether the generator function should stop producing data due to a timeout.
+        :param exit_event: An event indicating whether the generator function should stop producing data.
         :param func: The generator function to be executed.
         :param args: Positional arguments for the generator function.
         :param kwargs: Keyword arguments for the generator function.
@@ -283,45 +287,53 @@ class RunAsThread:
         """
         try:
             for value in func(*args, **kwargs):
-                # If the timeout has been reached we must stop producing any data
-                if exit_event.is_set():
-                    break
-                self.write(the_queue, value, write_event)
-            else:
-                # Notify the main thread that the generator function has completed its execution.
-                exit_event.set()
-                # Notify the main thread (even if the generator didn't produce any data) to prevent waiting for no reason.
-                if not write_event.is_set():
-                    write_event.set()
+                # If reading has been stopped we must stop producing any data
+                if not self.write(the_queue, value, exit_event):
+                    return
         except Exception as e:
-            self.write(the_queue, e, write_event)
+            self.write(the_queue, e, exit_event)
+        else:
+            # Notify the main thread that the generator function has completed its execution.
+            self.write(the_queue, self.END_OF_DATA, exit_event)
 
     @staticmethod
-    def write(the_queue, value, write_event):
+    def write(the_queue, value, exit_event):
         """
-        Puts a value into the queue and sets a write event to notify the main thread that new data is available.
+        Puts a value into the queue, blocking while the queue is full until the main thread reads from it.
         :param the_queue: A queue used for communication between the main thread and the thread running the generator function.
         :param value: The value to be put into the communication queue.
                       This can be any type of data produced by the generator function, including results or exceptions.
-        :param write_event: An event signaling the availability of new data in the queue.
-        :return: None
+        :param exit_event: An event indicating whether the generator function should stop producing data.
+        :return: False if reading has been stopped before the value was put into the queue, True otherwise
         """
-        the_queue.put(value)
-        write_event.set()
+        while not exit_event.is_set():
+            try:
+                the_queue.put(value, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-    @staticmethod
-    def read(the_queue, timeout=0.001):
-        """
-        Retrieves a value from the queue, handling the case where the value is an exception, and raising it.
-        :param the_queue: A queue used for communication between the main thread and the thread running the generator function.
-        :param timeout: A time in seconds to wait for a value to be available in the queue.
-                        If the timeout is reached and no new data is available, a `queue.Empty` exception is raised.
-        :return: a value retrieved from the queue
-        """
-        value = the_queue.get(block=True, timeout=timeout)
-        if isinstance(value, Exception):
-            raise value
-        return value
+
+class DetachedResults:
+    """
+    Iterator over the values produced by a generator function running in a thread started by `RunAsThread`.
+    Unlike closing a generator which hasn't been iterated yet, closing the results also stops the thread.
+    """
+
+    def __init__(self, reader: Generator, exit_event: threading.Event):
+        self._reader = reader
+        self._exit_event = exit_event
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._reader)
+
+    def close(self):
+        self._exit_event.set()
+        self._reader.close()
 
 
 detached = RunAsThread
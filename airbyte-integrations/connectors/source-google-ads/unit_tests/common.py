@@ -21,11 +21,19 @@ class MockSearchRequest:
     next_page_token = None
 
 
+class MockSearchStreamResponse:
+    def __init__(self, results):
+        self.results = results
+
+
 # Mocking Classes
 class MockGoogleAdsService:
     def search(self, search_request):
         return search_request
 
+    def search_stream(self, search_request):
+        return [MockSearchStreamResponse(results=[search_request])]
+
 
 class MockGoogleAdsClient:
     def __init__(self, credentials, **kwargs):
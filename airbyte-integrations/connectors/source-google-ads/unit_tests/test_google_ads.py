@@ -16,7 +16,7 @@ from source_google_ads.streams import chunk_date_range
 from airbyte_cdk.models import FailureType
 from airbyte_cdk.utils import AirbyteTracedException
 
-from .common import MockGoogleAdsClient, MockGoogleAdsService
+from .common import MockGoogleAdsClient, MockGoogleAdsService, MockSearchStreamResponse
 
 
 SAMPLE_SCHEMA = {
@@ -135,8 +135,42 @@ def test_send_request(mocker, customers):
     customer_id = next(iter(customers)).id
     response = list(google_ads_client.send_request(query, customer_id=customer_id))
 
-    assert response[0].customer_id == customer_id
-    assert response[0].query == query
+    assert response[0][0].customer_id == customer_id
+    assert response[0][0].query == query
+
+
+def test_send_request_retries_stream_failed_before_results(mocker, customers):
+    from google.api_core.exceptions import ServiceUnavailable
+
+    mocker.patch("time.sleep")
+    mocker.patch("source_google_ads.google_ads.GoogleAdsClient.load_from_dict", return_value=MockGoogleAdsClient(SAMPLE_CONFIG))
+    google_ads_client = GoogleAds(**SAMPLE_CONFIG)
+
+    def failed_stream():
+        raise ServiceUnavailable("Service is currently unavailable")
+        yield
+
+    mock_ga_service = mocker.Mock()
+    mock_ga_service.search_stream.side_effect = [failed_stream(), [MockSearchStreamResponse(results=["row"])]]
+    google_ads_client.ga_services["default"] = mock_ga_service
+
+    response = list(google_ads_client.send_request("Query", customer_id=next(iter(customers)).id))
+
+    assert response == [["row"]]
+    assert mock_ga_service.search_stream.call_count == 2
+
+
+def test_send_paged_request(mocker, customers):
+    mocker.patch("source_google_ads.google_ads.GoogleAdsClient.load_from_dict", return_value=MockGoogleAdsClient(SAMPLE_CONFIG))
+    google_ads_client = GoogleAds(**SAMPLE_CONFIG)
+    mock_ga_service = mocker.Mock()
+    mock_ga_service.search.return_value = ["row"]
+    google_ads_client.ga_services["default"] = mock_ga_service
+
+    response = google_ads_client.send_paged_request("Query", customer_id=next(iter(customers)).id)
+
+    assert response == [["row"]]
+    assert mock_ga_service.search.call_args.args[0].query == "Query"
 
 
 def test_get_fields_from_schema():
@@ -260,6 +294,52 @@ def test_parse_single_result():
     assert response == response
 
 
+def test_parse_single_result_matches_get_field_value():
+    ads_row = GoogleAdsRow(
+        ad_group_ad={
+            "ad": {
+                "id": 5,
+                "type_": "EXPANDED_TEXT_AD",
+                "final_urls": ["http://url_one.com", "https://url_two.com"],
+                "url_custom_parameters": [{"key": "k", "value": "v"}],
+                "legacy_app_install_ad": {"headline": "headline"},
+            }
+        },
+        campaign={"excluded_parent_asset_field_types": [2, 3]},
+        metrics={"ctr": 0.5, "clicks": 3},
+        segments={"ad_network_type": "SEARCH", "date": "2001-01-01"},
+    )
+    fields = [
+        "ad_group_ad.ad.id",
+        "ad_group_ad.ad.type",
+        "ad_group_ad.ad.final_urls",
+        "ad_group_ad.ad.url_custom_parameters",
+        "ad_group_ad.ad.legacy_app_install_ad",
+        "campaign.excluded_parent_asset_field_types",
+        "campaign.name",
+        "ad_group.id",
+        "metrics.ctr",
+        "metrics.clicks",
+        "segments.ad_network_type",
+        "segments.date",
+        "campaign.unknown_field",
+        "ad_group_ad.ad.final_urls.unknown_field",
+    ]
+    schema = {"properties": {field: {} for field in fields}}
+
+    response = GoogleAds.parse_single_result(schema, ads_row)
+
+    assert response == {field: GoogleAds.get_field_value(ads_row, field, {}) for field in fields}
+    assert response["ad_group_ad.ad.type"] == "EXPANDED_TEXT_AD"
+    assert response["segments.ad_network_type"] == "SEARCH"
+    assert response["campaign.unknown_field"] is None
+
+
+def test_get_row_parser_is_built_once_per_fields():
+    fields = ("segments.date", "metrics.clicks")
+    assert GoogleAds.get_row_parser(fields) is GoogleAds.get_row_parser(fields)
+
+
 def test_get_fields_metadata(mocker):
     # Mock the GoogleAdsClient to return our mock client
     mocker.patch("source_google_ads.google_ads.GoogleAdsClient", MockGoogleAdsClient)
@@ -19,6 +19,7 @@ from google.api_core.exceptions import (
 )
 from grpc import RpcError
 from source_google_ads.google_ads import GoogleAds
+from source_google_ads.models import CustomerModel
 from source_google_ads.streams import ClickView, ServiceAccounts
 
 from airbyte_cdk.models import FailureType, SyncMode
@@ -219,7 +220,7 @@ def test_retry_transient_errors(mocker, config, customers, error_cls):
     credentials = config["credentials"]
     credentials.update(use_proto_plus=True)
     api = GoogleAds(credentials=credentials)
-    mocked_search = mocker.patch.object(api.ga_services["default"], "search", side_effect=error_cls("Error message"))
+    mocked_search = mocker.patch.object(api.ga_services["default"], "search_stream", side_effect=error_cls("Error message"))
     incremental_stream_config = dict(
         api=api,
         conversion_window_days=config["conversion_window_days"],
@@ -246,7 +247,7 @@ def test_retry_503_raises_transient_error(mocker, config, customers):
     credentials.update(use_proto_plus=True)
     api = GoogleAds(credentials=credentials)
     mocked_search = mocker.patch.object(
-        api.ga_services["default"], "search", side_effect=ServiceUnavailable("Service is currently unavailable")
+        api.ga_services["default"], "search_stream", side_effect=ServiceUnavailable("Service is currently unavailable")
     )
     incremental_stream_config = dict(
         api=api,
@@ -278,7 +279,7 @@ def test_retry_500_raises_transient_error(mocker, config, customers):
     credentials = config["credentials"]
     credentials.update(use_proto_plus=True)
     api = GoogleAds(credentials=credentials)
-    mocked_search = mocker.patch.object(api.ga_services["default"], "search", side_effect=InternalServerError("Internal Error encountered"))
+    mocked_search = mocker.patch.object(api.ga_services["default"], "search_stream", side_effect=InternalServerError("Internal Error encountered"))
     incremental_stream_config = dict(
         api=api,
         conversion_window_days=config["conversion_window_days"],
@@ -319,3 +320,97 @@ def test_read_records_unauthenticated(mocker, customers, config):
     assert exc_info.value.message == (
         "Authentication failed for the customer 'customer_id'. Please try to Re-authenticate your credentials on set up Google Ads page."
     )
+
+
+def test_stream_slices_prefetch_records():
+    api = Mock()
+    api.send_request.side_effect = lambda query, customer_id, login_customer_id: [[{"customer.id": customer_id}]]
+    api.parse_single_result.side_effect = lambda schema, result: result
+    customers = [CustomerModel(id=str(customer_id), login_customer_id="default") for customer_id in range(5)]
+    stream = ServiceAccounts(api=api, customers=customers)
+
+    stream_slices = stream.stream_slices()
+    first_slice = next(stream_slices)
+    # the records of the next slices are requested before the first slice is read
+    assert len(stream._prefetched_records) == stream.max_prefetched_slices + 1
+
+    records = list(stream.read_records(SyncMode.full_refresh, first_slice))
+    for stream_slice in stream_slices:
+        records.extend(stream.read_records(SyncMode.full_refresh, stream_slice))
+
+    assert records == [{"customer.id": str(customer_id)} for customer_id in range(5)]
+    assert api.send_request.call_count == 5
+    assert stream._prefetched_records == {}
+
+
+def test_stream_slices_prefetch_stopped_when_slices_are_not_read():
+    api = Mock()
+    api.send_request.side_effect = lambda query, customer_id, login_customer_id: [[{"customer.id": customer_id}]]
+    api.parse_single_result.side_effect = lambda schema, result: result
+    customers = [CustomerModel(id=str(customer_id), login_customer_id="default") for customer_id in range(5)]
+    stream = ServiceAccounts(api=api, customers=customers)
+
+    stream_slices = stream.stream_slices()
+    next(stream_slices)
+    prefetched_records = list(stream._prefetched_records.values())
+    stream_slices.close()
+
+    assert stream._prefetched_records == {}
+    assert all(records._exit_event.is_set() for records in prefetched_records)
+
+
+def test_read_records_read_page_by_page_when_stream_is_interrupted(mocker):
+    mocker.patch("time.sleep")
+    api = Mock()
+
+    def response_stream():
+        yield [{"customer.id": "1"}, {"customer.id": "2"}]
+        raise ServiceUnavailable("Service is currently unavailable")
+
+    def pager():
+        yield {"customer.id": "1"}
+        yield {"customer.id": "2"}
+        yield {"customer.id": "3"}
+
+    api.send_request.side_effect = lambda query, customer_id, login_customer_id: response_stream()
+    api.send_paged_request.side_effect = lambda query, customer_id, login_customer_id: [pager()]
+    api.parse_single_result.side_effect = lambda schema, result: result
+    stream = ServiceAccounts(api=api, customers=[CustomerModel(id="1", login_customer_id="default")])
+
+    records = list(stream.read_records(SyncMode.full_refresh, {"customer_id": "1", "login_customer_id": "default"}))
+
+    # the records read before the error are emitted again by the paged request, instead of failing the sync
+    assert records == [{"customer.id": "1"}, {"customer.id": "2"}, {"customer.id": "1"}, {"customer.id": "2"}, {"customer.id": "3"}]
+    assert api.send_request.call_count == 1
+    assert api.send_paged_request.call_args.args[0] == api.send_request.call_args.args[0]
+
+
+def test_read_records_paged_request_resumed_at_failed_page(mocker):
+    mocker.patch("time.sleep")
+    api = Mock()
+
+    def response_stream():
+        yield [{"customer.id": "1"}]
+        raise ServiceUnavailable("Service is currently unavailable")
+
+    class Pager:
+        """Requests the second page only once, like the pager of the paged search resumed with its page token."""
+
+        def __init__(self):
+            self.pages = iter([[{"customer.id": "1"}], ServiceUnavailable("Service is currently unavailable"), [{"customer.id": "2"}]])
+
+        def __iter__(self):
+            for page in self.pages:
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+
+    api.send_request.side_effect = lambda query, customer_id, login_customer_id: response_stream()
+    api.send_paged_request.side_effect = lambda query, customer_id, login_customer_id: [Pager()]
+    api.parse_single_result.side_effect = lambda schema, result: result
+    stream = ServiceAccounts(api=api, customers=[CustomerModel(id="1", login_customer_id="default")])
+
+    records = list(stream.read_records(SyncMode.full_refresh, {"customer_id": "1", "login_customer_id": "default"}))
+
+    assert records == [{"customer.id": "1"}, {"customer.id": "1"}, {"customer.id": "2"}]
+    assert api.send_paged_request.call_count == 1
@@ -3,13 +3,15 @@
 #
 
 
+import threading
+import time
 from datetime import datetime
 from unittest.mock import Mock
 
 import backoff
 import pytest
 from source_google_ads import SourceGoogleAds
-from source_google_ads.utils import GAQL, generator_backoff
+from source_google_ads.utils import GAQL, RunAsThread, generator_backoff
 
 from airbyte_cdk.utils import AirbyteTracedException
 
@@ -202,3 +204,52 @@ def test_generator_backoff_retries_until_success():
     # Compare each expected call with the actual call
     for expected, actual in zip(expected_calls, actual_calls):
         assert expected == actual
+
+
+def test_run_as_thread_reads_values_and_raises_exceptions():
+    @RunAsThread(timeout_minutes=1)
+    def generator():
+        yield 1
+        yield 2
+        raise ValueError("Simulated failure")
+
+    records = []
+    with pytest.raises(ValueError, match="Simulated failure"):
+        for record in generator():
+            records.append(record)
+    assert records == [1, 2]
+
+
+def test_run_as_thread_blocks_producer_on_full_queue():
+    produced = []
+
+    @RunAsThread(timeout_minutes=1, max_queue_size=2)
+    def generator():
+        for value in range(10):
+            produced.append(value)
+            yield value
+
+    records = generator()
+    # the thread is started before the results are read and stops producing once the queue is full
+    time.sleep(0.5)
+    assert len(produced) == 3
+
+    assert list(records) == list(range(10))
+
+
+def test_run_as_thread_stops_producer_when_reading_stopped():
+    finished = threading.Event()
+
+    @RunAsThread(timeout_minutes=1, max_queue_size=1)
+    def generator():
+        try:
+            for value in range(10):
+                yield value
+        finally:
+            finished.set()
+
+    records = generator()
+    assert next(records) == 0
+    records.close()
+
+    assert finished.wait(5)
@@ -4,11 +4,16 @@
 
 import logging
 import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
 from io import IOBase
 from os import getenv
 from os.path import basename, dirname
-from typing import Dict, Iterable, List, Optional, Set, Tuple, cast
+from queue import Full, Queue
+from threading import Event, Lock
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, cast
+from zipfile import ZipInfo
 
 import boto3.session
 import pendulum
@@ -37,10 +42,28 @@ AWS_EXTERNAL_ID = getenv("AWS_ASSUME_ROLE_EXTERNAL_ID")
 
 class SourceS3StreamReader(AbstractFileBasedStreamReader):
     FILE_SIZE_LIMIT = 1_500_000_000
+    # the max number of prefixes listed at the same time, matches the default botocore connection pool size
+    LISTING_CONCURRENCY = 10
+    LISTING_DELIMITER = "/"
+    # the max number of zip central directories fetched at the same time, shared by all the listing workers
+    ZIP_DIRECTORY_CONCURRENCY = 5
+    # the max number of the listed file sizes and the parsed zip central directories kept, the least recently used are evicted
+    FILE_SIZES_CACHE_SIZE = 100_000
+    ZIP_DIRECTORIES_CACHE_SIZE = 1_000
+    # the max number of listed pages waiting to be consumed, the listing workers wait for the consumer once it's reached
+    LISTING_RESULTS_QUEUE_SIZE = 2 * LISTING_CONCURRENCY
+    # how often the listing workers waiting for the consumer check whether it has stopped, in seconds
+    LISTING_RESULTS_PUT_TIMEOUT = 0.1
 
     def __init__(self):
         super().__init__()
         self._s3_client = None
+        # the sizes of the listed files, so they don't have to be requested again
+        self._file_sizes: OrderedDict[str, int] = OrderedDict()
+        # the parsed zip central directories, keyed by the zip file key and its ETag
+        self._zip_directories: OrderedDict[Tuple[str, str], Tuple[List[ZipInfo], int]] = OrderedDict()
+        # the caches are filled by the listing workers concurrently
+        self._cache_lock = Lock()
 
     @property
     def config(self) -> Config:
@@ -69,6 +92,9 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
         if self._s3_client is None:
             client_kv_args = _get_s3_compatible_client_args(self.config) if self.config.endpoint else {}
+            # the listing workers and the zip central directories fetching share the connection pool, see `_list_prefixes`
+            pool_config = ClientConfig(max_pool_connections=self.LISTING_CONCURRENCY + self.ZIP_DIRECTORY_CONCURRENCY)
+            client_kv_args["config"] = client_kv_args["config"].merge(pool_config) if "config" in client_kv_args else pool_config
 
             # Set the region_name if it's provided in the config
             if self.config.region_name:
@@ -143,10 +169,12 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         total_n_keys = 0
 
         try:
-            for current_prefix in prefixes if prefixes else [None]:
-                for remote_file in self._page(s3, globs, self.config.bucket, current_prefix, seen, logger):
-                    total_n_keys += 1
-                    yield remote_file
+            for remote_file in self._list_prefixes(s3, globs, self.config.bucket, prefixes if prefixes else [None], logger):
+                if remote_file.uri in seen:
+                    continue
+                seen.add(remote_file.uri)
+                total_n_keys += 1
+                yield remote_file
 
             logger.info(f"Finished listing objects from S3. Found {total_n_keys} objects total ({len(seen)} unique objects).")
         except ClientError as exc:
@@ -192,7 +220,7 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
             s3_uri = self._construct_s3_uri(file)
             if isinstance(file, RemoteFileInsideArchive):
                 s3_file_object = smart_open.open(s3_uri, transport_params=params, mode="rb")
-                decompressed_stream = DecompressedStream(s3_file_object, file)
+                decompressed_stream = DecompressedStream(s3_file_object, file, read_ahead=True)
                 result = ZipContentReader(decompressed_stream, encoding)
             else:
                 result = smart_open.open(s3_uri, transport_params=params, mode=mode.value, encoding=encoding)
@@ -292,7 +320,10 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
     @override
     def file_size(self, file: RemoteFile) -> int:
-        s3_object: boto3.s3.Object = self.s3_client.get_object(
+        file_size = self._cache_get(self._file_sizes, file.uri)
+        if file_size is not None:
+            return file_size
+        s3_object = self.s3_client.head_object(
             Bucket=self.config.bucket,
             Key=file.uri,
         )
@@ -302,36 +333,125 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
     def _is_folder(file) -> bool:
         return file["Key"].endswith("/")
 
-    def _page(
-        self, s3: BaseClient, globs: List[str], bucket: str, prefix: Optional[str], seen: Set[str], logger: logging.Logger
+    def _list_prefixes(
+        self, s3: BaseClient, globs: List[str], bucket: str, prefixes: List[Optional[str]], logger: logging.Logger
     ) -> Iterable[RemoteFile]:
         """
-        Page through lists of S3 objects.
+        List the prefixes concurrently, yielding the matching files as soon as any of the listings returns them.
+
+        Each prefix is first listed with the delimiter, so the files right under the prefix are returned,
+        while the nested "folders" are fanned out to be listed independently by the other workers.
+        The files could be yielded more than once, when the prefixes overlap.
+        """
+        results: Queue = Queue(maxsize=self.LISTING_RESULTS_QUEUE_SIZE)
+        stopped = Event()
+        pending_lock = Lock()
+        pending = 0
+
+        def put(result: Any) -> None:
+            # the consumer doesn't read the results anymore once it's stopped, so the worker mustn't wait for it forever
+            while not stopped.is_set():
+                try:
+                    results.put(result, timeout=self.LISTING_RESULTS_PUT_TIMEOUT)
+                    return
+                except Full:
+                    continue
+
+        def submit(executor: ThreadPoolExecutor, current_prefix: Optional[str], fan_out: bool) -> None:
+            nonlocal pending
+            with pending_lock:
+                pending += 1
+            executor.submit(list_prefix, executor, current_prefix, fan_out)
+
+        def list_prefix(executor: ThreadPoolExecutor, current_prefix: Optional[str], fan_out: bool) -> None:
+            try:
+                if stopped.is_set():
+                    return
+                for remote_files, nested_prefixes in self._page(s3, globs, bucket, current_prefix, fan_out, logger, zip_executor):
+                    if stopped.is_set():
+                        break
+                    for nested_prefix in nested_prefixes:
+                        # the nested prefixes are listed entirely, no more fan-out is needed
+                        if self._prefix_may_match_globs(nested_prefix, globs):
+                            submit(executor, nested_prefix, False)
+                    put(remote_files)
+            except Exception as exc:
+                put(exc)
+            finally:
+                # the nested prefixes are always submitted before the prefix is reported as done
+                put(None)
+
+        # the zip central directories of all the listed prefixes are fetched by the single pool of workers,
+        # it's shut down once all the listing workers are done
+        with (
+            ThreadPoolExecutor(max_workers=self.ZIP_DIRECTORY_CONCURRENCY, thread_name_prefix="s3-zip-directory") as zip_executor,
+            ThreadPoolExecutor(max_workers=self.LISTING_CONCURRENCY, thread_name_prefix="s3-listing") as executor,
+        ):
+            try:
+                for current_prefix in prefixes:
+                    submit(executor, current_prefix, True)
+                while True:
+                    with pending_lock:
+                        if not pending:
+                            break
+                    result = results.get()
+                    if result is None:
+                        with pending_lock:
+                            pending -= 1
+                    elif isinstance(result, Exception):
+                        raise result
+                    else:
+                        yield from result
+            finally:
+                # the rest of the listings are not needed, if the consumer exits earlier or on error
+                stopped.set()
+
+    def _prefix_may_match_globs(self, prefix: str, globs: List[str]) -> bool:
+        """
+        The files under the prefix have at least as many "folders" as the prefix itself,
+        since only the `**` could match across the folders, the deeper prefixes are never matched by the shallower globs.
+        """
+        depth = prefix.count(self.LISTING_DELIMITER)
+        return any("**" in glob or glob.count(self.LISTING_DELIMITER) >= depth for glob in globs)
+
+    def _page(
+        self,
+        s3: BaseClient,
+        globs: List[str],
+        bucket: str,
+        prefix: Optional[str],
+        fan_out: bool,
+        logger: logging.Logger,
+        zip_executor: Optional[Executor] = None,
+    ) -> Iterable[Tuple[List[RemoteFile], List[str]]]:
+        """
+        Page through lists of S3 objects, yielding the matching files along with the nested prefixes of each page.
+        The nested prefixes are only returned, when the `fan_out` is requested.
         """
         total_n_keys_for_prefix = 0
-        kwargs = {"Bucket": bucket}
+        kwargs: Dict[str, Any] = {"Bucket": bucket}
+        if prefix:
+            kwargs["Prefix"] = prefix
+        if fan_out:
+            kwargs["Delimiter"] = self.LISTING_DELIMITER
         while True:
-            response = s3.list_objects_v2(Prefix=prefix, **kwargs) if prefix else s3.list_objects_v2(**kwargs)
+            response = s3.list_objects_v2(**kwargs)
             key_count = response.get("KeyCount")
             total_n_keys_for_prefix += key_count
             logger.info(f"Received {key_count} objects from S3 for prefix '{prefix}'.")
 
+            remote_files = []
             if "Contents" in response:
-                for file in response["Contents"]:
-                    if self._is_folder(file):
-                        continue
-
-                    for remote_file in self._handle_file(file):
-                        if (
-                            self.file_matches_globs(remote_file, globs)
-                            and self.is_modified_after_start_date(remote_file.last_modified)
-                            and remote_file.uri not in seen
-                        ):
-                            seen.add(remote_file.uri)
-                            yield remote_file
-            else:
+                files = [file for file in response["Contents"] if not self._is_folder(file)]
+                for remote_file in self._handle_files(files, zip_executor):
+                    if self.file_matches_globs(remote_file, globs) and self.is_modified_after_start_date(remote_file.last_modified):
+                        remote_files.append(remote_file)
+            elif not response.get("CommonPrefixes"):
                 logger.warning(f"Invalid response from S3; missing 'Contents' key. kwargs={kwargs}.")
 
+            nested_prefixes = [common_prefix["Prefix"] for common_prefix in response.get("CommonPrefixes", [])]
+            yield remote_files, nested_prefixes
+
             if next_token := response.get("NextContinuationToken"):
                 kwargs["ContinuationToken"] = next_token
             else:
@@ -344,15 +464,59 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
             return True
         return last_modified_date >= pendulum.parse(self.config.start_date).naive()
 
+    def _handle_files(self, files: List[Dict[str, Any]], zip_executor: Optional[Executor] = None) -> Iterable[RemoteFile]:
+        """
+        Handle the files of a single listing page, the zip files central directories are fetched concurrently, when the executor is given.
+        """
+        if not zip_executor or sum(1 for file in files if self._is_zip_file(file)) < 2:
+            for file in files:
+                yield from self._handle_file(file)
+            return
+
+        for remote_files in zip_executor.map(lambda file: list(self._handle_file(file)), files):
+            yield from remote_files
+
+    def _cache_get(self, cache: OrderedDict, key: Hashable) -> Optional[Any]:
+        with self._cache_lock:
+            if key not in cache:
+                return None
+            cache.move_to_end(key)
+            return cache[key]
+
+    def _cache_put(self, cache: OrderedDict, key: Hashable, value: Any, max_size: int) -> None:
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
+    @staticmethod
+    def _is_zip_file(file) -> bool:
+        return file["Key"].endswith(".zip")
+
     def _handle_file(self, file):
-        if file["Key"].endswith(".zip"):
+        if self._is_zip_file(file):
             yield from self._handle_zip_file(file)
         else:
             yield self._handle_regular_file(file)
 
-    def _handle_zip_file(self, file):
+    def _get_zip_files(self, file) -> Tuple[List[ZipInfo], int]:
+        """
+        Get the zip file members, the central directory is only parsed once for the same version (ETag) of the file.
+        """
+        etag = file.get("ETag")
+        zip_directory = self._cache_get(self._zip_directories, (file["Key"], etag)) if etag else None
+        if zip_directory is not None:
+            return zip_directory
+
         zip_handler = ZipFileHandler(self.s3_client, self.config)
-        zip_members, cd_start = zip_handler.get_zip_files(file["Key"])
+        zip_directory = zip_handler.get_zip_files(file["Key"], file.get("Size"))
+        if etag:
+            self._cache_put(self._zip_directories, (file["Key"], etag), zip_directory, self.ZIP_DIRECTORIES_CACHE_SIZE)
+        return zip_directory
+
+    def _handle_zip_file(self, file):
+        zip_members, cd_start = self._get_zip_files(file)
 
         for zip_member in zip_members:
             remote_file = RemoteFileInsideArchive(
@@ -367,6 +531,8 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
     def _handle_regular_file(self, file):
         remote_file = RemoteFile(uri=file["Key"], last_modified=file["LastModified"].astimezone(pytz.utc).replace(tzinfo=None))
+        if "Size" in file:
+            self._cache_put(self._file_sizes, remote_file.uri, file["Size"], self.FILE_SIZES_CACHE_SIZE)
         return remote_file
 
 
@@ -3,6 +3,7 @@
 import io
 import struct
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import IO, List, Optional, Tuple, Union
 
 from botocore.client import BaseClient
@@ -53,6 +54,8 @@ class ZipFileHandler:
         """
         self.s3_client = s3_client
         self.config = config
+        # The last chunk fetched from the end of the file, along with its start position
+        self._tail: Optional[Tuple[str, int, bytes]] = None
 
     def _fetch_data_from_s3(self, filename: str, start: int, size: Optional[int] = None) -> bytes:
         """
@@ -74,6 +77,7 @@ class ZipFileHandler:
         signature: bytes,
         initial_buffer_size: int = BUFFER_SIZE_DEFAULT,
         max_buffer_size: int = MAX_BUFFER_SIZE_DEFAULT,
+        file_size: Optional[int] = None,
     ) -> Optional[bytes]:
         """
         Search for a specific signature in the file by checking chunks of increasing size.
@@ -83,58 +87,80 @@ class ZipFileHandler:
         :param signature: The byte signature to search for.
         :param initial_buffer_size: Initial size of the buffer to search in.
         :param max_buffer_size: Maximum size of the buffer to search in.
+        :param file_size: The size of the file, if it's already known from the listing.
         :return: The chunk of data containing the signature or None if not found.
         """
         buffer_size = initial_buffer_size
-        file_size = self.s3_client.head_object(Bucket=self.config.bucket, Key=filename)["ContentLength"]
+        if file_size is None:
+            file_size = self.s3_client.head_object(Bucket=self.config.bucket, Key=filename)["ContentLength"]
 
         while buffer_size <= max_buffer_size:
-            chunk = self._fetch_data_from_s3(filename, file_size - buffer_size)
+            chunk_start = max(file_size - buffer_size, 0)
+            chunk = self._fetch_data_from_s3(filename, chunk_start)
+            self._tail = (filename, chunk_start, chunk)
             index = chunk.rfind(signature)
             if index != -1:
                 return chunk[index:]
             buffer_size *= 2
         return None
 
-    def _fetch_zip64_data(self, filename: str) -> bytes:
+    def _fetch_zip64_data(self, filename: str, file_size: Optional[int] = None) -> bytes:
         """
         Fetch the ZIP64 End of Central Directory (EOCD) data from a ZIP file.
 
         :param filename: The name of the file in S3.
+        :param file_size: The size of the file, if it's already known from the listing.
         :return: The ZIP64 EOCD data.
         """
-        chunk = self._find_signature(filename, self.ZIP64_LOCATOR_SIGNATURE)
+        chunk = self._find_signature(filename, self.ZIP64_LOCATOR_SIGNATURE, file_size=file_size)
         zip64_eocd_offset = struct.unpack_from("<Q", chunk, self.ZIP64_EOCD_OFFSET)[0]
         return self._fetch_data_from_s3(filename, zip64_eocd_offset, self.ZIP64_EOCD_SIZE)
 
-    def _get_central_directory_start(self, filename: str) -> int:
+    def _get_central_directory_start(self, filename: str, file_size: Optional[int] = None) -> int:
         """
         Determine the starting position of the central directory in the ZIP file.
         Adjusts for ZIP64 format if necessary.
 
         :param filename: The name of the file in S3.
+        :param file_size: The size of the file, if it's already known from the listing.
         :return: The starting position of the central directory.
         """
-        eocd_data = self._find_signature(filename, self.EOCD_SIGNATURE)
+        eocd_data = self._find_signature(filename, self.EOCD_SIGNATURE, file_size=file_size)
         central_dir_start = struct.unpack_from("<L", eocd_data, self.EOCD_CENTRAL_DIR_START_OFFSET)[0]
 
         # Check for ZIP64 format and adjust offsets if necessary
         if central_dir_start == 0xFFFFFFFF:
-            zip64_data = self._fetch_zip64_data(filename)
+            zip64_data = self._fetch_zip64_data(filename, file_size)
             central_dir_start = struct.unpack_from("<Q", zip64_data, self.ZIP64_CENTRAL_DIR_START_OFFSET)[0]
 
         return central_dir_start
 
-    def get_zip_files(self, filename: str) -> Tuple[List[zipfile.ZipInfo], int]:
+    def _fetch_central_directory(self, filename: str, central_dir_start: int) -> bytes:
+        """
+        Fetch the central directory, which spans till the end of the file.
+        It's taken from the chunk fetched while searching for the EOCD, when the chunk covers it entirely.
+
+        :param filename: The name of the file in S3.
+        :param central_dir_start: The starting position of the central directory.
+        :return: The central directory data.
+        """
+        if self._tail:
+            tail_filename, tail_start, tail = self._tail
+            if tail_filename == filename and tail_start <= central_dir_start:
+                return tail[central_dir_start - tail_start :]
+        return self._fetch_data_from_s3(filename, central_dir_start)
+
+    def get_zip_files(self, filename: str, file_size: Optional[int] = None) -> Tuple[List[zipfile.ZipInfo], int]:
         """
         Extract metadata about the files inside a ZIP archive stored in S3.
 
         :param filename: The name of the ZIP file in S3.
+        :param file_size: The size of the ZIP file, if it's already known from the listing.
         :return: A tuple containing a list of ZipInfo objects representing the files inside the ZIP archive
                  and the starting position of the central directory.
         """
-        central_dir_start = self._get_central_directory_start(filename)
-        central_dir_data = self._fetch_data_from_s3(filename, central_dir_start)
+        central_dir_start = self._get_central_directory_start(filename, file_size)
+        central_dir_data = self._fetch_central_directory(filename, central_dir_start)
 
         with io.BytesIO(central_dir_data) as bytes_io:
             with zipfile.ZipFile(bytes_io, "r") as zf:
@@ -150,24 +176,36 @@ class DecompressedStream(io.IOBase):
     LOCAL_FILE_HEADER_SIZE: int = 30
     NAME_LENGTH_OFFSET: int = 26
 
-    def __init__(self, file_obj: IO[bytes], file_info: RemoteFileInsideArchive, buffer_size: int = BUFFER_SIZE_DEFAULT):
+    def __init__(
+        self,
+        file_obj: IO[bytes],
+        file_info: RemoteFileInsideArchive,
+        buffer_size: int = BUFFER_SIZE_DEFAULT,
+        read_ahead: bool = False,
+    ):
         """
         Initialize a DecompressedStream.
 
         :param file_obj: Underlying file-like object.
         :param file_info: Meta information about the file inside the archive.
         :param buffer_size: Size of the buffer for reading data.
+        :param read_ahead: Whether to read the next compressed chunk in the background, while the current one is decompressed.
         """
         self._file = file_obj
         self.file_start = self._calculate_actual_start(file_info.start_offset)
         self.compressed_size = file_info.compressed_size
         self.uncompressed_size = file_info.uncompressed_size
         self.compression_method = file_info.compression_method
-        self._buffer = bytearray()
+        # The decompressed data, which is not read yet, starts at `_buffer_start`
+        self._buffer: Union[bytes, bytearray] = b""
+        self._buffer_start = 0
         self.buffer_size = buffer_size
         self._reset_decompressor()
         self.position = 0  # Current position in uncompressed stream
         self._file.seek(self.file_start)
+        self._compressed_position = 0  # Current position in compressed stream, relative to the file start
+        self._read_ahead_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zip-read-ahead") if read_ahead else None
+        self._next_chunk: Optional[Future] = None
         # Mapping between uncompressed and compressed offsets for quick seeking
         self.offset_map = {0: self.file_start, self.uncompressed_size: self.file_start + self.compressed_size}
 
@@ -204,6 +242,46 @@ class DecompressedStream(io.IOBase):
             return chunk
         return self.decompressor.decompress(chunk)
 
+    def _read_compressed_chunk(self) -> bytes:
+        """
+        Read the next chunk of the compressed data, either prefetched in the background or from the file directly.
+        """
+        remaining_size = self.compressed_size - self._compressed_position
+        if remaining_size <= 0:
+            return b""
+
+        if self._next_chunk:
+            chunk = self._next_chunk.result()
+            self._next_chunk = None
+        else:
+            chunk = self._file.read(min(self.buffer_size, remaining_size))
+        self._compressed_position += len(chunk)
+
+        remaining_size = self.compressed_size - self._compressed_position
+        if self._read_ahead_executor and chunk and remaining_size > 0:
+            self._next_chunk = self._read_ahead_executor.submit(self._file.read, min(self.buffer_size, remaining_size))
+        return chunk
+
+    def _cancel_read_ahead(self) -> None:
+        """
+        Wait for the prefetched chunk to be read, so the underlying file could be used again.
+        """
+        if self._next_chunk:
+            self._next_chunk.exception()
+            self._next_chunk = None
+
+    def _read_buffer(self, size: int) -> bytes:
+        """
+        Take up to `size` bytes of the decompressed data buffered by the previous reads.
+        """
+        end = min(self._buffer_start + size, len(self._buffer))
+        data = self._buffer[self._buffer_start : end]
+        if end == len(self._buffer):
+            self._buffer, self._buffer_start = b"", 0
+        else:
+            self._buffer_start = end
+        return data
+
     def read(self, size: int = -1) -> bytes:
         """
         Read a specified number of bytes from the stream.
@@ -212,29 +290,19 @@ class DecompressedStream(io.IOBase):
         if size == -1:
             size = self.uncompressed_size - self.position
 
-        # If buffer already has enough data, return it directly
-        if size <= len(self._buffer):
-            data = self._buffer[:size]
-            self._buffer = self._buffer[size:]
-            self.position += len(data)
-            return data
-
-        data = self._buffer
-        self._buffer = bytearray()
-        while len(data) < size and self._file.tell() - self.file_start < self.compressed_size:
-            max_read_size = min(self.buffer_size, self.compressed_size + self.file_start - self._file.tell())
-            chunk = self._file.read(max_read_size)
-
+        data = bytearray(self._read_buffer(size))
+        while len(data) < size:
+            chunk = self._read_compressed_chunk()
             if not chunk:
                 break
 
             decompressed_data = self._decompress_chunk(chunk)
 
-            # Buffer excessive data for future reads
-            if len(data) + len(decompressed_data) > size:
-                desired_length = size - len(data)
-                data += decompressed_data[:desired_length]
-                self._buffer = decompressed_data[desired_length:]
+            # Buffer excessive data for future reads, the rest of the chunk is kept as is, without copying
+            desired_length = size - len(data)
+            if len(decompressed_data) > desired_length:
+                data += memoryview(decompressed_data)[:desired_length]
+                self._buffer, self._buffer_start = decompressed_data, desired_length
             else:
                 data += decompressed_data
 
@@ -245,12 +313,11 @@ class DecompressedStream(io.IOBase):
         """
         Seek to a specific position in the uncompressed stream.
         """
-        if whence == io.SEEK_SET:
-            self._buffer = bytearray()
-        elif whence == io.SEEK_CUR:
+        if whence == io.SEEK_CUR:
             offset = self.position + offset
         elif whence == io.SEEK_END:
             offset = self.uncompressed_size + offset
+        self._buffer, self._buffer_start = b"", 0
 
         # Ensure the offset is within the file's boundaries
         offset = max(0, min(offset, self.uncompressed_size))
@@ -258,14 +325,17 @@ class DecompressedStream(io.IOBase):
         closest_offset = max(k for k in self.offset_map if k <= offset)
         closest_position = self.offset_map[closest_offset]
 
+        self._cancel_read_ahead()
         self._file.seek(closest_position)
+        self._compressed_position = closest_position - self.file_start
         self._reset_decompressor()
         self.position = closest_offset
 
         # Read till desired offset
         while self.position < offset:
             read_size = min(self.buffer_size, offset - self.position)
-            self.read(read_size)
+            if not self.read(read_size):
+                break
 
         return self.position
 
@@ -291,6 +361,9 @@ class DecompressedStream(io.IOBase):
         """
         Close the stream and underlying file object.
         """
+        self._cancel_read_ahead()
+        if self._read_ahead_executor:
+            self._read_ahead_executor.shutdown()
         self._file.close()
 
 
@@ -311,7 +384,9 @@ class ZipContentReader:
         self.raw = decompressed_stream
         self.encoding = encoding
         self.buffer_size = buffer_size
+        # The data, which is not read yet, starts at `_buffer_start`
         self.buffer = bytearray()
+        self._buffer_start = 0
         self._closed = False
 
     def __iter__(self):
@@ -348,8 +423,9 @@ class ZipContentReader:
                 next_char = self.read(1)
                 if char == "\r" and next_char == "\n":
                     line += next_char
-                else:
-                    self.buffer = next_char.encode(self.encoding) + self.buffer
+                elif next_char:
+                    # put the char back, it's still in the buffer right before its start
+                    self._buffer_start -= len(next_char.encode(self.encoding) if self.encoding else next_char)
                 break
         return line
 
@@ -357,14 +433,19 @@ class ZipContentReader:
         """
         Read a specified number of bytes/characters from the reader.
         """
-        while len(self.buffer) < size:
+        while size < 0 or len(self.buffer) - self._buffer_start < size:
             chunk = self.raw.read(self.buffer_size)
             if not chunk:
                 break
+            # drop the data which is already read, before the buffer is extended
+            if self._buffer_start:
+                del self.buffer[: self._buffer_start]
+                self._buffer_start = 0
             self.buffer += chunk
 
-        data = self.buffer[:size]
-        self.buffer = self.buffer[size:]
+        end = len(self.buffer) if size < 0 else min(self._buffer_start + size, len(self.buffer))
+        data = self.buffer[self._buffer_start : end]
+        self._buffer_start = end
 
         return data.decode(self.encoding) if self.encoding else bytes(data)
 
@@ -373,6 +454,7 @@ class ZipContentReader:
         Seek to a specific position in the decompressed stream.
         """
         self.buffer = bytearray()
+        self._buffer_start = 0
         return self.raw.seek(offset, whence)
 
     def close(self):
@@ -202,6 +202,83 @@ def test_given_multiple_pages_when_get_matching_files_then_pass_continuation_tok
     assert "ContinuationToken" in boto3_client_mock.return_value.list_objects_v2.call_args_list[1].kwargs
 
 
+def _list_objects_v2_with_delimiter(keys: List[str]):
+    def list_objects_v2(Bucket, Prefix="", Delimiter=None, **kwargs):
+        contents, common_prefixes = [], set()
+        for key in keys:
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix) :]
+            if Delimiter and Delimiter in rest:
+                common_prefixes.add(Prefix + rest.split(Delimiter)[0] + Delimiter)
+            else:
+                contents.append({"Key": key, "LastModified": datetime.now()})
+        response = {"Contents": contents, "KeyCount": len(contents) + len(common_prefixes)}
+        if common_prefixes:
+            response["CommonPrefixes"] = [{"Prefix": prefix} for prefix in sorted(common_prefixes)]
+        return response
+
+    return MagicMock(side_effect=list_objects_v2)
+
+
+@pytest.mark.parametrize(
+    "globs, expected_prefixes, expected_delimited_prefixes",
+    [
+        (["**"], {None, "a/", "b/"}, {None}),
+        (["a/**/*.csv", "b/*.csv"], {"a/", "a/x/", "a/y/", "b/"}, {"a/", "b/"}),
+        # the nested prefixes couldn't match the glob
+        (["a/*.csv"], {"a/"}, {"a/"}),
+    ],
+    ids=["no_prefix", "multiple_prefixes", "nested_prefixes_skipped"],
+)
+def test_get_matching_files_fans_out_nested_prefixes(globs, expected_prefixes, expected_delimited_prefixes):
+    keys = ["file0.csv", "a/file1.csv", "a/x/file2.csv", "a/y/file3.csv", "a/y/z/file4.csv", "b/file5.csv"]
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2 = _list_objects_v2_with_delimiter(keys)
+        files = list(reader.get_matching_files(globs, None, logger))
+
+    expected_uris = {key for key in keys if reader.file_matches_globs(RemoteFile(uri=key, last_modified=datetime.now()), globs)}
+    assert sorted(f.uri for f in files) == sorted(expected_uris)
+    calls = mock_s3_client.list_objects_v2.call_args_list
+    assert {call.kwargs.get("Prefix") for call in calls} == expected_prefixes
+    # only the top level prefixes are listed with the delimiter, the nested ones are listed entirely
+    assert {call.kwargs.get("Prefix") for call in calls if "Delimiter" in call.kwargs} == expected_delimited_prefixes
+
+
+def test_get_matching_files_nested_prefix_error_is_raised():
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+    listing = _list_objects_v2_with_delimiter(["file0.csv", "a/file1.csv"])
+
+    def list_objects_v2(**kwargs):
+        if kwargs.get("Prefix") == "a/":
+            raise ConnectionError("connection reset")
+        return listing(**kwargs)
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2 = MagicMock(side_effect=list_objects_v2)
+        with pytest.raises(ErrorListingFiles):
+            list(reader.get_matching_files(["**"], None, logger))
+
+
+def test_get_matching_files_consumer_stops_before_listing_is_done():
+    keys = [f"{folder}/file{index}.csv" for folder in "abcdefghij" for index in range(3)]
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    with patch.object(SourceS3StreamReader, "LISTING_RESULTS_QUEUE_SIZE", 1), patch.object(
+        SourceS3StreamReader, "s3_client", new_callable=MagicMock
+    ) as mock_s3_client:
+        mock_s3_client.list_objects_v2 = _list_objects_v2_with_delimiter(keys)
+        files = reader.get_matching_files(["**"], None, logger)
+        next(files)
+        # the listing workers blocked on the full queue give up once the consumer stops, instead of hanging the shutdown
+        files.close()
+
+
 def test_get_matching_files_exception():
     reader = SourceS3StreamReader()
     reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
@@ -357,3 +434,75 @@ def test_filter_file_by_start_date(start_date: datetime, last_modified_date: dat
     )
 
     assert expected_result == reader.is_modified_after_start_date(last_modified_date)
+
+
+def test_file_size_of_listed_file_is_not_requested():
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "file.csv", "LastModified": datetime.now(), "Size": 42}],
+            "KeyCount": 1,
+        }
+        mock_s3_client.head_object.return_value = {"ContentLength": 100}
+        (listed_file,) = reader.get_matching_files(["*.csv"], None, logger)
+
+        assert reader.file_size(listed_file) == 42
+        assert reader.file_size(RemoteFile(uri="other.csv", last_modified=datetime.now())) == 100
+        mock_s3_client.head_object.assert_called_once_with(Bucket="test", Key="other.csv")
+        mock_s3_client.get_object.assert_not_called()
+
+
+def test_file_sizes_least_recently_used_are_evicted():
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+    reader.FILE_SIZES_CACHE_SIZE = 2
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": f"file{i}.csv", "LastModified": datetime.now(), "Size": i} for i in range(3)],
+            "KeyCount": 3,
+        }
+        mock_s3_client.head_object.return_value = {"ContentLength": 100}
+        listed_files = list(reader.get_matching_files(["*.csv"], None, logger))
+
+        assert list(reader._file_sizes) == ["file1.csv", "file2.csv"]
+        assert [reader.file_size(listed_file) for listed_file in listed_files] == [100, 1, 2]
+        mock_s3_client.head_object.assert_called_once_with(Bucket="test", Key="file0.csv")
+
+
+@patch("source_s3.v4.stream_reader.boto3.client")
+def test_s3_client_connection_pool_fits_listing_concurrency(boto3_client_mock):
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[], endpoint="https://s3.local")
+    reader.s3_client
+
+    client_config = boto3_client_mock.call_args.kwargs["config"]
+    assert client_config.max_pool_connections == SourceS3StreamReader.LISTING_CONCURRENCY + SourceS3StreamReader.ZIP_DIRECTORY_CONCURRENCY
+    # the endpoint specific config is kept
+    assert client_config.s3 == {"addressing_style": "auto"}
+
+
+@patch("source_s3.v4.stream_reader.ZipFileHandler")
+def test_zip_central_directories_are_parsed_once_per_etag(zip_file_handler_mock):
+    zip_member = MagicMock(filename="member.csv", date_time=(2024, 1, 1, 0, 0, 0), header_offset=0, compress_size=1, file_size=1)
+    zip_member.compress_type = 0
+    zip_file_handler_mock.return_value.get_zip_files.return_value = ([zip_member], 0)
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [
+                {"Key": f"archive{i}.zip", "LastModified": datetime.now(), "Size": 100 + i, "ETag": f'"etag{i}"'} for i in range(10)
+            ],
+            "KeyCount": 10,
+        }
+        first_listing = [f.uri for f in reader.get_matching_files(["*.zip#*"], None, logger)]
+        second_listing = [f.uri for f in reader.get_matching_files(["*.zip#*"], None, logger)]
+
+    assert first_listing == second_listing == [f"archive{i}.zip#member.csv" for i in range(10)]
+    assert sorted(call.args for call in zip_file_handler_mock.return_value.get_zip_files.call_args_list) == sorted(
+        (f"archive{i}.zip", 100 + i) for i in range(10)
+    )
@@ -138,3 +138,86 @@ def test_zip_content_reader_iteration():
 
     # Verify the lines extracted match expected values
     assert lines == ["line1\n", "line2\r", "line3\r\n", "line4\n"]
+
+
+_CONTENT = b"".join(f"id,{i},name_{i}\n".encode() for i in range(20_000))
+
+
+def _zip_member_stream(compression_method: int, read_ahead: bool, buffer_size: int = 1024) -> DecompressedStream:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=compression_method) as zf:
+        zf.writestr("first.csv", b"some,other,content\n")
+        zf.writestr("test_file.csv", _CONTENT)
+    zip_info = zipfile.ZipFile(archive).getinfo("test_file.csv")
+    file_info = RemoteFileInsideArchive(
+        uri="test.zip#test_file.csv",
+        last_modified=datetime.datetime(2022, 12, 28),
+        start_offset=zip_info.header_offset,
+        compressed_size=zip_info.compress_size,
+        uncompressed_size=zip_info.file_size,
+        compression_method=zip_info.compress_type,
+    )
+    archive.seek(0)
+    return DecompressedStream(archive, file_info, buffer_size=buffer_size, read_ahead=read_ahead)
+
+
+@pytest.mark.parametrize("read_ahead", [False, True], ids=["sync", "read_ahead"])
+@pytest.mark.parametrize("compression_method", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED], ids=["stored", "deflated"])
+def test_decompressed_stream_read(compression_method, read_ahead):
+    stream = _zip_member_stream(compression_method, read_ahead)
+
+    # the reads of different sizes, smaller and larger than the buffer
+    chunks = []
+    while chunk := stream.read(1 + len(chunks) * 7 % 2000):
+        chunks.append(chunk)
+    stream.close()
+
+    assert b"".join(chunks) == _CONTENT
+    assert stream.tell() == len(_CONTENT)
+
+
+@pytest.mark.parametrize("read_ahead", [False, True], ids=["sync", "read_ahead"])
+@pytest.mark.parametrize("compression_method", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED], ids=["stored", "deflated"])
+def test_decompressed_stream_seek_and_read(compression_method, read_ahead):
+    stream = _zip_member_stream(compression_method, read_ahead)
+
+    assert stream.read(5000) == _CONTENT[:5000]
+    assert stream.seek(100) == 100
+    assert stream.read(50) == _CONTENT[100:150]
+    assert stream.seek(-10, io.SEEK_END) == len(_CONTENT) - 10
+    assert stream.read() == _CONTENT[-10:]
+    stream.close()
+
+
+def test_zip_content_reader_reads_lines_of_member():
+    reader = ZipContentReader(_zip_member_stream(zipfile.ZIP_DEFLATED, read_ahead=True), encoding="utf-8", buffer_size=1000)
+    assert "".join(reader) == _CONTENT.decode()
+    reader.seek(0)
+    assert reader.read() == _CONTENT.decode()
+    reader.close()
+
+
+def _s3_client_with_file(content: bytes) -> MagicMock:
+    def get_object(Bucket, Key, Range):
+        start, end = Range[len("bytes=") :].split("-")
+        return {"Body": io.BytesIO(content[int(start) : int(end) + 1 if end else None])}
+
+    s3_client = MagicMock()
+    s3_client.get_object = MagicMock(side_effect=get_object)
+    s3_client.head_object.return_value = {"ContentLength": len(content)}
+    return s3_client
+
+
+def test_get_zip_files_takes_central_directory_from_the_eocd_chunk(mock_config):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.csv", b"a\n1\n")
+        zf.writestr("b.csv", b"b\n2\n")
+    s3_client = _s3_client_with_file(archive.getvalue())
+
+    zip_files, _ = ZipFileHandler(s3_client, mock_config).get_zip_files("test.zip", file_size=len(archive.getvalue()))
+
+    assert [zip_file.filename for zip_file in zip_files] == ["a.csv", "b.csv"]
+    # the size is known from the listing, and the whole central directory is fetched along with the EOCD
+    s3_client.head_object.assert_not_called()
+    assert s3_client.get_object.call_count == 1
@@ -4,6 +4,9 @@
 
 import concurrent.futures
 import logging
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from os import getenv
 from typing import Any, List, Mapping, Optional, Tuple
 
 import requests  # type: ignore[import]
@@ -14,6 +17,7 @@ from airbyte_cdk.models import ConfiguredAirbyteCatalog, FailureType, StreamDesc
 from airbyte_cdk.sources.streams.http import HttpClient
 from airbyte_cdk.utils import AirbyteTracedException
 
+from .describe_cache import DescribeCache
 from .exceptions import TypeSalesforceException
 from .rate_limiting import SalesforceErrorHandler, default_backoff_handler
 from .utils import filter_streams_by_criteria
@@ -234,6 +238,9 @@ UNSUPPORTED_STREAMS = ["ActivityMetric", "ActivityMetricRollup"]
 #                                                        ^^^^^
 API_VERSION = "v62.0"
 
+# The environment variable of the directory to cache the describe responses in, the cache is disabled if it's not set
+DESCRIBE_CACHE_DIR_ENV = "SALESFORCE_DESCRIBE_CACHE_DIR"
+
 
 class Salesforce:
     logger = logging.getLogger("airbyte")
@@ -264,6 +271,9 @@ class Salesforce:
         adapter = request_adapters.HTTPAdapter(pool_connections=self.parallel_tasks_size, pool_maxsize=self.parallel_tasks_size)
         self.session.mount("https://", adapter)
         self._http_client = HttpClient("sf_api", self.logger, session=self.session, error_handler=SalesforceErrorHandler())
+        self.describe_cache_dir = getenv(DESCRIBE_CACHE_DIR_ENV)
+        # The time since which the metadata of the sobjects is known to be unchanged, according to the sobjects list revalidation
+        self._sobjects_not_modified_since: Optional[datetime] = None
 
         self.is_sandbox = is_sandbox in [True, "true"]
         if self.is_sandbox:
@@ -334,17 +344,39 @@ class Salesforce:
         self.access_token = auth["access_token"]
         self.instance_url = auth["instance_url"]
 
+    @property
+    def describe_cache(self) -> Optional[DescribeCache]:
+        if self.describe_cache_dir and self.instance_url:
+            return DescribeCache(self.describe_cache_dir, self.instance_url, self.version)
+        return None
+
     def describe(self, sobject: str = None, sobject_options: Mapping[str, Any] = None) -> Mapping[str, Any]:
         """Describes all objects or a specific object"""
         headers = self._get_standard_headers()
 
         endpoint = "sobjects" if not sobject else f"sobjects/{sobject}/describe"
 
+        describe_cache = self.describe_cache
+        cached = describe_cache.get(sobject) if describe_cache else None
+        if cached:
+            cached_at, cached_describe = cached
+            if sobject and self._sobjects_not_modified_since and parsedate_to_datetime(cached_at) >= self._sobjects_not_modified_since:
+                # none of the sobjects metadata was changed since the description was cached
+                return cached_describe
+            headers = {**headers, "If-Modified-Since": cached_at}
+
         url = f"{self.instance_url}/services/data/{self.version}/{endpoint}"
+        requested_at = formatdate(usegmt=True)
         resp = self._make_request("GET", url, headers=headers)
+        if cached and resp.status_code == requests.codes.not_modified:
+            if not sobject:
+                self._sobjects_not_modified_since = parsedate_to_datetime(cached_at)
+            return cached_describe
         if resp.status_code == 404 and sobject:
             self.logger.error(f"not found a description for the sobject '{sobject}'. Sobject options: {sobject_options}")
         resp_json: Mapping[str, Any] = resp.json()
+        if describe_cache and resp.ok:
+            describe_cache.put(sobject, requested_at, resp_json)
         return resp_json
 
     def generate_schema(self, stream_name: str = None, stream_options: Mapping[str, Any] = None) -> Mapping[str, Any]:
@@ -362,26 +394,23 @@ class Salesforce:
                 return name, None, str(e)
             return name, result, None
 
-        stream_names = list(stream_objects.keys())
-        # try to split all requests by chunks
         stream_schemas = {}
-        for i in range(0, len(stream_names), self.parallel_tasks_size):
-            chunk_stream_names = stream_names[i : i + self.parallel_tasks_size]
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                for stream_name, schema, err in executor.map(
-                    lambda args: load_schema(*args), [(stream_name, stream_objects[stream_name]) for stream_name in chunk_stream_names]
-                ):
-                    if err:
-                        self.logger.error(f"Loading error of the {stream_name} schema: {err}")
-                        # Without schema information, the source can't determine the type of stream to instantiate and there might be issues
-                        # related to property chunking
-                        raise AirbyteTracedException(
-                            message=f"Schema could not be extracted for stream {stream_name}. Please retry later.",
-                            internal_message=str(err),
-                            failure_type=FailureType.system_error,
-                            stream_descriptor=StreamDescriptor(name=stream_name),
-                        )
-                    stream_schemas[stream_name] = schema
+        # The single pool is used to describe all the sobjects, the number of workers is bounded by the default
+        with concurrent.futures.ThreadPoolExecutor(thread_name_prefix="sf-describe") as executor:
+            for stream_name, schema, err in executor.map(
+                lambda args: load_schema(*args), [(stream_name, stream_options) for stream_name, stream_options in stream_objects.items()]
+            ):
+                if err:
+                    self.logger.error(f"Loading error of the {stream_name} schema: {err}")
+                    # Without schema information, the source can't determine the type of stream to instantiate and there might be issues
+                    # related to property chunking
+                    raise AirbyteTracedException(
+                        message=f"Schema could not be extracted for stream {stream_name}. Please retry later.",
+                        internal_message=str(err),
+                        failure_type=FailureType.system_error,
+                        stream_descriptor=StreamDescriptor(name=stream_name),
+                    )
+                stream_schemas[stream_name] = schema
         return stream_schemas
 
     @staticmethod
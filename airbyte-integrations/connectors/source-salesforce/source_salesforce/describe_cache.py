@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger("airbyte")
+
+# the sobjects list is cached along with the sobjects descriptions, under the name which is never used by a sobject
+GLOBAL_DESCRIBE_NAME = "__sobjects__"
+
+
+class DescribeCache:
+    """
+    On-disk cache of the describe responses, keyed by the org, the API version and the sobject name.
+
+    Each entry keeps the time of the request it was received with, so it could be revalidated with the `If-Modified-Since` header:
+    https://developer.salesforce.com/docs/atlas.en-us.api_rest.meta/api_rest/resources_sobject_describe.htm
+    """
+
+    def __init__(self, cache_dir: str, instance_url: str, version: str):
+        org_dir = hashlib.sha256(instance_url.encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, org_dir, version)
+
+    def _filename(self, sobject: Optional[str]) -> str:
+        return os.path.join(self.path, f"{sobject or GLOBAL_DESCRIBE_NAME}.json")
+
+    def get(self, sobject: Optional[str]) -> Optional[Tuple[str, Mapping[str, Any]]]:
+        """
+        Returns the time the cached response was requested at, along with the response itself.
+        """
+        try:
+            with open(self._filename(sobject)) as cache_file:
+                entry = json.load(cache_file)
+            return entry["requested_at"], entry["describe"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"The cached description of the {sobject or 'sobjects'} could not be read, it's requested again: {e}")
+            return None
+
+    def put(self, sobject: Optional[str], requested_at: str, describe: Mapping[str, Any]) -> None:
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # the entry is written to the temporary file first, so the concurrent readers never see the partial entry
+            file_descriptor, tmp_filename = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as cache_file:
+                json.dump({"requested_at": requested_at, "describe": describe}, cache_file)
+            os.replace(tmp_filename, self._filename(sobject))
+        except OSError as e:
+            logger.warning(f"The description of the {sobject or 'sobjects'} could not be cached: {e}")
@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import sqlite3
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
+
+
+class PartialRecords:
+    """
+    Sticks together the parts of the records, fetched with the different property chunks, by their primary key.
+
+    The parts of the incomplete records are kept in memory up to `max_records_in_memory` records,
+    once the limit is reached, they are spilled to the temporary on-disk sqlite database,
+    so the memory usage stays bounded for the objects with a lot of properties and records.
+    """
+
+    def __init__(self, parts_count: int, max_records_in_memory: int = 10_000):
+        self.parts_count = parts_count
+        self.max_records_in_memory = max_records_in_memory
+        self._records: Dict[Any, Tuple[MutableMapping[str, Any], int]] = {}
+        self._spilled: Optional[sqlite3.Connection] = None
+
+    def add(self, record_id: Any, record: MutableMapping[str, Any]) -> Optional[MutableMapping[str, Any]]:
+        """
+        Add the part of the record, returns the complete record once all of its parts are added.
+        """
+        if record_id in self._records:
+            partial_record, counter = self._records.pop(record_id)
+        elif spilled := self._pop_spilled(record_id):
+            partial_record, counter = spilled
+        else:
+            partial_record, counter = {}, 0
+
+        partial_record.update(record)
+        counter += 1
+        if counter == self.parts_count:
+            return partial_record
+
+        if len(self._records) >= self.max_records_in_memory:
+            self._spill()
+        self._records[record_id] = (partial_record, counter)
+        return None
+
+    def incomplete_record_ids(self) -> List[Any]:
+        record_ids = list(self._records)
+        if self._spilled:
+            record_ids.extend(record_id for (record_id,) in self._spilled.execute("SELECT record_id FROM partial_records"))
+        return record_ids
+
+    def close(self) -> None:
+        if self._spilled:
+            # the temporary database is removed along with the connection
+            self._spilled.close()
+            self._spilled = None
+
+    def _spill(self) -> None:
+        if not self._spilled:
+            # the empty name stands for the temporary on-disk database
+            self._spilled = sqlite3.connect("")
+            self._spilled.execute("CREATE TABLE partial_records (record_id PRIMARY KEY, record TEXT, counter INTEGER)")
+        self._spilled.executemany(
+            "INSERT INTO partial_records VALUES (?, ?, ?)",
+            ((record_id, json.dumps(record), counter) for record_id, (record, counter) in self._records.items()),
+        )
+        self._records.clear()
+
+    def _pop_spilled(self, record_id: Any) -> Optional[Tuple[MutableMapping[str, Any], int]]:
+        if not self._spilled:
+            return None
+        row = self._spilled.execute("SELECT record, counter FROM partial_records WHERE record_id = ?", (record_id,)).fetchone()
+        if not row:
+            return None
+        self._spilled.execute("DELETE FROM partial_records WHERE record_id = ?", (record_id,))
+        return json.loads(row[0]), row[1]
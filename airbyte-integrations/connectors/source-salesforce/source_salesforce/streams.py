@@ -6,6 +6,7 @@ import csv
 import ctypes
 import urllib.parse
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from typing import Any, Callable, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
 
@@ -53,6 +54,7 @@ from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
 
 from .api import PARENT_SALESFORCE_OBJECTS, UNSUPPORTED_FILTERING_STREAMS, Salesforce
 from .availability_strategy import SalesforceAvailabilityStrategy
+from .partial_records import PartialRecords
 from .rate_limiting import BulkNotSupportedException, SalesforceErrorHandler, default_backoff_handler
 
 
@@ -183,6 +185,10 @@ class PropertyChunk:
 
 class RestSalesforceStream(SalesforceStream):
     state_converter = IsoMillisConcurrentStreamStateConverter(is_sequential_state=False)
+    # the max number of property chunks, which pages are fetched at the same time
+    property_chunks_concurrency = 4
+    # the max number of incomplete records kept in memory, the rest is spilled to disk
+    max_partial_records_in_memory = 10_000
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -251,11 +257,10 @@ class RestSalesforceStream(SalesforceStream):
         if local_properties:
             yield local_properties
 
-    @staticmethod
-    def _next_chunk_id(property_chunks: Mapping[int, PropertyChunk]) -> Optional[int]:
+    def _next_chunk_ids(self, property_chunks: Mapping[int, PropertyChunk]) -> List[int]:
         """
-        Figure out which chunk is going to be read next.
-        It should be the one with the least number of records read by the moment.
+        Figure out which chunks are going to be read next, their pages are fetched concurrently.
+        It should be the ones with the least number of records read by the moment.
         """
         non_exhausted_chunks = {
             # We skip chunks that have already attempted a sync before and do not have a next page
@@ -263,9 +268,7 @@ class RestSalesforceStream(SalesforceStream):
             for chunk_id, property_chunk in property_chunks.items()
             if property_chunk.first_time or property_chunk.next_page
         }
-        if not non_exhausted_chunks:
-            return None
-        return min(non_exhausted_chunks, key=non_exhausted_chunks.get)
+        return sorted(non_exhausted_chunks, key=non_exhausted_chunks.get)[: self.property_chunks_concurrency]
 
     def _read_pages(
         self,
@@ -276,62 +279,62 @@ class RestSalesforceStream(SalesforceStream):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[StreamData]:
         stream_state = stream_state or {}
-        records_by_primary_key = {}
         property_chunks: Mapping[int, PropertyChunk] = {
             index: PropertyChunk(properties=properties) for index, properties in enumerate(self.chunk_properties())
         }
-        while True:
-            chunk_id = self._next_chunk_id(property_chunks)
-            if chunk_id is None:
-                # pagination complete
-                break
-
-            property_chunk = property_chunks[chunk_id]
-            request, response = self._fetch_next_page_for_chunk(
-                stream_slice, stream_state, property_chunk.next_page, property_chunk.properties
-            )
-
-            # When this is the first time we're getting a chunk's records, we set this to False to be used when deciding the next chunk
-            if property_chunk.first_time:
-                property_chunk.first_time = False
-            property_chunk.next_page = self.next_page_token(response)
-            chunk_page_records = records_generator_fn(request, response, stream_state, stream_slice)
-            if not self.too_many_properties:
-                # this is the case when a stream has no primary key
-                # (it is allowed when properties length does not exceed the maximum value)
-                # so there would be a single chunk, therefore we may and should yield records immediately
-                for record in chunk_page_records:
-                    property_chunk.record_counter += 1
-                    yield record
-                continue
-
-            # stick together different parts of records by their primary key and emit if a record is complete
-            for record in chunk_page_records:
-                property_chunk.record_counter += 1
-                record_id = record[self.primary_key]
-                if record_id not in records_by_primary_key:
-                    records_by_primary_key[record_id] = (record, 1)
-                    continue
-                partial_record, counter = records_by_primary_key[record_id]
-                partial_record.update(record)
-                counter += 1
-                if counter == len(property_chunks):
-                    yield partial_record  # now it's complete
-                    records_by_primary_key.pop(record_id)
-                else:
-                    records_by_primary_key[record_id] = (partial_record, counter)
-
-        # Process what's left.
-        # Because we make multiple calls to query N records (each call to fetch X properties of all the N records),
-        # there's a chance that the number of records corresponding to the query may change between the calls.
-        # Select 'a', 'b' from table order by pk -> returns records with ids `1`, `2`
-        #   <insert smth.>
-        # Select 'c', 'd' from table order by pk -> returns records with ids `1`, `3`
-        # Then records `2` and `3` would be incomplete.
-        # This may result in data inconsistency. We skip such records for now and log a warning message.
-        incomplete_record_ids = ",".join([str(key) for key in records_by_primary_key])
-        if incomplete_record_ids:
-            self.logger.warning(f"Inconsistent record(s) with primary keys {incomplete_record_ids} found. Skipping them.")
+        partial_records = PartialRecords(parts_count=len(property_chunks), max_records_in_memory=self.max_partial_records_in_memory)
+        with ThreadPoolExecutor(max_workers=self.property_chunks_concurrency, thread_name_prefix=f"{self.name}-chunks") as executor:
+            try:
+                while True:
+                    chunk_ids = self._next_chunk_ids(property_chunks)
+                    if not chunk_ids:
+                        # pagination complete
+                        break
+
+                    pages = executor.map(
+                        lambda property_chunk: self._fetch_next_page_for_chunk(
+                            stream_slice, stream_state, property_chunk.next_page, property_chunk.properties
+                        ),
+                        [property_chunks[chunk_id] for chunk_id in chunk_ids],
+                    )
+                    # the pages are processed in the order of the chunks, no matter which one is received first
+                    for chunk_id, (request, response) in zip(chunk_ids, pages):
+                        property_chunk = property_chunks[chunk_id]
+                        # When this is the first time we're getting a chunk's records,
+                        # we set this to False to be used when deciding the next chunk
+                        if property_chunk.first_time:
+                            property_chunk.first_time = False
+                        property_chunk.next_page = self.next_page_token(response)
+                        chunk_page_records = records_generator_fn(request, response, stream_state, stream_slice)
+                        if not self.too_many_properties:
+                            # this is the case when a stream has no primary key
+                            # (it is allowed when properties length does not exceed the maximum value)
+                            # so there would be a single chunk, therefore we may and should yield records immediately
+                            for record in chunk_page_records:
+                                property_chunk.record_counter += 1
+                                yield record
+                            continue
+
+                        # stick together different parts of records by their primary key and emit if a record is complete
+                        for record in chunk_page_records:
+                            property_chunk.record_counter += 1
+                            complete_record = partial_records.add(record[self.primary_key], record)
+                            if complete_record is not None:
+                                yield complete_record
+
+                # Process what's left.
+                # Because we make multiple calls to query N records (each call to fetch X properties of all the N records),
+                # there's a chance that the number of records corresponding to the query may change between the calls.
+                # Select 'a', 'b' from table order by pk -> returns records with ids `1`, `2`
+                #   <insert smth.>
+                # Select 'c', 'd' from table order by pk -> returns records with ids `1`, `3`
+                # Then records `2` and `3` would be incomplete.
+                # This may result in data inconsistency. We skip such records for now and log a warning message.
+                incomplete_record_ids = ",".join([str(key) for key in partial_records.incomplete_record_ids()])
+                if incomplete_record_ids:
+                    self.logger.warning(f"Inconsistent record(s) with primary keys {incomplete_record_ids} found. Skipping them.")
+            finally:
+                partial_records.close()
 
         # Always return an empty generator just in case no records were ever yielded
         yield from []
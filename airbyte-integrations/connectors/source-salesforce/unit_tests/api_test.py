@@ -6,8 +6,9 @@ import csv
 import io
 import logging
 import re
+import threading
 from datetime import datetime, timedelta
-from typing import List
+from typing import Any, List, Mapping, Tuple
 from unittest.mock import Mock
 
 import freezegun
@@ -391,6 +392,41 @@ def test_forwarding_sobject_options(stream_config, stream_names, catalog_stream_
     return
 
 
+def test_describe_cache_revalidated_with_if_modified_since(stream_config, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("SALESFORCE_DESCRIBE_CACHE_DIR", str(tmp_path))
+    sobjects = {"sobjects": [{"name": f"stream_{i}", "queryable": True} for i in range(3)]}
+    describe = {"fields": [{"name": "field", "type": "string"}]}
+
+    def discover(sobjects_status_code: int, describe_status_code: int) -> Tuple[Mapping[str, Any], List[Any]]:
+        with requests_mock.Mocker() as m:
+            m.register_uri("POST", re.compile("/token$"), json={"instance_url": "https://fake-url.com", "access_token": "fake-token"})
+            m.register_uri("GET", re.compile("/sobjects$"), json=sobjects, status_code=sobjects_status_code)
+            m.register_uri("GET", re.compile("/describe$"), json=describe, status_code=describe_status_code)
+            sf = Salesforce(**stream_config)
+            sf.login()
+            schemas = sf.generate_schemas(sf.get_validated_streams(config=stream_config))
+            return schemas, m.request_history
+
+    cold_schemas, cold_requests = discover(200, 200)
+    assert len(cold_schemas) == 3
+    assert not any("If-Modified-Since" in request.headers for request in cold_requests)
+
+    # the sobjects metadata is not changed, only the sobjects list is revalidated
+    warm_schemas, warm_requests = discover(304, 304)
+    assert warm_schemas == cold_schemas
+    assert [request.path for request in warm_requests if request.method == "GET"] == [f"/services/data/{API_VERSION.lower()}/sobjects"]
+    assert "If-Modified-Since" in warm_requests[-1].headers
+
+    # the sobjects metadata is changed, each sobject description is revalidated
+    changed_schemas, changed_requests = discover(200, 304)
+    assert changed_schemas == cold_schemas
+    describe_requests = [request for request in changed_requests if request.path.endswith("/describe")]
+    assert len(describe_requests) == 3
+    assert all("If-Modified-Since" in request.headers for request in describe_requests)
+    # the pool describing the sobjects is shut down once they are described
+    assert not any(thread.name.startswith("sf-describe") for thread in threading.enumerate())
+
+
 @pytest.mark.parametrize(
     "stream_names,catalog_stream_names,",
     (
@@ -532,6 +568,32 @@ def test_too_many_properties(stream_config, stream_api_v2_pk_too_many_properties
         assert len(call.url) < Salesforce.REQUEST_SIZE_LIMITS
 
 
+def test_too_many_properties_chunks_fetched_concurrently_and_spilled(stream_config, stream_api_v2_pk_too_many_properties, requests_mock):
+    stream = generate_stream("Account", stream_config, stream_api_v2_pk_too_many_properties)
+    stream.max_partial_records_in_memory = 1
+    chunks = list(stream.chunk_properties())
+    assert len(chunks) > 2
+    url = f"https://fase-account.salesforce.com/services/data/{API_VERSION}/queryAll"
+
+    def chunk_page(request, context):
+        # the chunk is identified by its first property, the page by the `nextRecordsUrl`
+        if "q" in request.qs:
+            chunk_id = next(i for i, chunk in enumerate(chunks) if list(chunk)[1].lower() == request.qs["q"][0].split(",")[1])
+            records = [{"Id": 1, f"chunk{chunk_id}": "A"}, {"Id": 2, f"chunk{chunk_id}": "A"}]
+            return {"records": records, "nextRecordsUrl": f"{url}?c={chunk_id}"}
+        chunk_id = int(request.qs["c"][0])
+        return {"records": [{"Id": 3, f"chunk{chunk_id}": "B"}]}
+
+    requests_mock.get(url, json=chunk_page)
+    records = list(stream.read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [
+        {"Id": 1, **{f"chunk{i}": "A" for i in range(len(chunks))}},
+        {"Id": 2, **{f"chunk{i}": "A" for i in range(len(chunks))}},
+        {"Id": 3, **{f"chunk{i}": "B" for i in range(len(chunks))}},
+    ]
+
+
 def test_stream_with_no_records_in_response(stream_config, stream_api_v2_pk_too_many_properties, requests_mock):
     stream = generate_stream("Account", stream_config, stream_api_v2_pk_too_many_properties)
     chunks = list(stream.chunk_properties())
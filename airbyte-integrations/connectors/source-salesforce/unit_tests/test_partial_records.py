@@ -0,0 +1,33 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+from source_salesforce.partial_records import PartialRecords
+
+
+@pytest.mark.parametrize("max_records_in_memory", [10_000, 1, 3], ids=["in_memory", "spill_every_record", "spill_in_batches"])
+def test_partial_records_complete_records_are_returned(max_records_in_memory):
+    partial_records = PartialRecords(parts_count=3, max_records_in_memory=max_records_in_memory)
+    complete_records = []
+    for part in ("a", "b", "c"):
+        for record_id in range(10):
+            complete_record = partial_records.add(record_id, {"Id": record_id, part: f"{part}{record_id}"})
+            if complete_record is not None:
+                complete_records.append(complete_record)
+
+    assert complete_records == [
+        {"Id": record_id, "a": f"a{record_id}", "b": f"b{record_id}", "c": f"c{record_id}"} for record_id in range(10)
+    ]
+    assert partial_records.incomplete_record_ids() == []
+    partial_records.close()
+
+
+def test_partial_records_incomplete_record_ids():
+    partial_records = PartialRecords(parts_count=2, max_records_in_memory=2)
+    for record_id in ("id1", "id2", "id3", "id4"):
+        assert partial_records.add(record_id, {"Id": record_id, "a": 1}) is None
+    assert partial_records.add("id2", {"Id": "id2", "b": 2}) == {"Id": "id2", "a": 1, "b": 2}
+
+    assert sorted(partial_records.incomplete_record_ids()) == ["id1", "id3", "id4"]
+    partial_records.close()
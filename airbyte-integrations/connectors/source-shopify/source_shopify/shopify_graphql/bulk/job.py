@@ -17,11 +17,12 @@ from source_shopify.utils import ShopifyRateLimiter as limiter
 from airbyte_cdk.sources.streams.http import HttpClient
 
 from .exceptions import AirbyteTracedException, ShopifyBulkExceptions
+from .pipe import ShopifyBulkResultPipe
 from .query import ShopifyBulkQuery, ShopifyBulkTemplates
 from .record import ShopifyBulkRecord
-from .retry import bulk_retry_on_exception
+from .retry import BULK_RESULT_DOWNLOAD_ERRORS, bulk_retry_on_exception
 from .status import ShopifyBulkJobStatus
-from .tools import END_OF_FILE, BulkTools
+from .tools import END_OF_FILE_BYTES, BulkTools
 
 
 class BulkOperationUserErrorCode(Enum):
@@ -45,6 +46,10 @@ class ShopifyBulkManager:
 
     parent_stream_name: Optional[str] = None
     parent_stream_cursor: Optional[str] = None
+    # whether or not to create the BULK Job for the next slice, while the current job result is processed
+    job_prefetch_next_slice: bool = False
+    # whether or not to parse the BULK Job result, while it's being downloaded
+    job_stream_results: bool = False
 
     # 10Mb chunk size to save the file
     _retrieve_chunk_size: Final[int] = 1024 * 1024 * 10
@@ -68,6 +73,10 @@ class ShopifyBulkManager:
     _job_state: str | None = field(init=False, default=None)  # this string is based on ShopifyBulkJobStatus
     # completed and saved Bulk Job result filename
     _job_result_filename: Optional[str] = field(init=False, default=None)
+    # completed Bulk Job result url, to be streamed
+    _job_result_url: Optional[str] = field(init=False, default=None)
+    # the size of the streamed Bulk Job result lines already produced, in bytes
+    _job_result_offset: int = field(init=False, default=0)
     # date-time when the Bulk Job was created on the server
     _job_created_at: Optional[str] = field(init=False, default=None)
     # indicated whether or not we manually force-cancel the current job
@@ -94,6 +103,11 @@ class ShopifyBulkManager:
 
     # 2 sec is set as default value to cover the case with the empty-fast-completed jobs
     _job_last_elapsed_time: float = field(init=False, default=2.0)
+    # the slice and the filter field the current job was created for
+    _job_slice: Optional[Mapping[str, str]] = field(init=False, default=None)
+    _job_filter_field: Optional[str] = field(init=False, default=None)
+    # the BULK Job created ahead for the next slice, holds: `id`, `slice`
+    _job_prefetched: Optional[Mapping[str, Any]] = field(init=False, default=None)
 
     def __post_init__(self) -> None:
         self._job_size = self.job_size
@@ -208,6 +222,9 @@ class ShopifyBulkManager:
         self._job_state = None
         # reset the filename to default
         self._job_result_filename = None
+        # reset the result url to default
+        self._job_result_url = None
+        self._job_result_offset = 0
         # setting self-cancelation to default
         self._job_self_canceled = False
         # set the running job message counter to default
@@ -254,12 +271,7 @@ class ShopifyBulkManager:
         return self._job_state == ShopifyBulkJobStatus.FAILED.value
 
     def _job_cancel(self) -> None:
-        _, canceled_response = self.http_client.send_request(
-            http_method="POST",
-            url=self.base_url,
-            json={"query": ShopifyBulkTemplates.cancel(self._job_id)},
-            request_kwargs={},
-        )
+        canceled_response = self._job_send_cancel(self._job_id)
         # mark the job was self-canceled
         self._job_self_canceled = True
         # check CANCELED Job health
@@ -267,6 +279,15 @@ class ShopifyBulkManager:
         # sleep to ensure the cancelation
         sleep(self._job_check_interval)
 
+    def _job_send_cancel(self, job_id: str) -> requests.Response:
+        _, canceled_response = self.http_client.send_request(
+            http_method="POST",
+            url=self.base_url,
+            json={"query": ShopifyBulkTemplates.cancel(job_id)},
+            request_kwargs={},
+        )
+        return canceled_response
+
     def _log_job_state_with_count(self) -> None:
         """
         Print the status/state Job info message every N request, to minimize the noise in the logs.
@@ -288,12 +309,42 @@ class ShopifyBulkManager:
         else:
             LOGGER.info(pattern)
 
-    def _job_get_result(self, response: Optional[requests.Response] = None) -> Optional[str]:
+    def _job_get_result_url(self, response: Optional[requests.Response] = None) -> Optional[str]:
         parsed_response = response.json().get("data", {}).get("node", {}) if response else None
         # get `complete` or `partial` result from collected Bulk Job results
         full_result_url = parsed_response.get("url") if parsed_response else None
         partial_result_url = parsed_response.get("partialDataUrl") if parsed_response else None
-        job_result_url = full_result_url if full_result_url else partial_result_url
+        return full_result_url if full_result_url else partial_result_url
+
+    def _job_collect_result(self, response: Optional[requests.Response] = None) -> None:
+        if self.job_stream_results:
+            # the result is downloaded and parsed at the same time, see `_process_bulk_results`
+            self._job_result_url = self._job_get_result_url(response)
+        else:
+            self._job_result_filename = self._job_get_result(response)
+
+    @bulk_retry_on_exception(more_exceptions=BULK_RESULT_DOWNLOAD_ERRORS)
+    def _job_stream_result(self, job_result_url: str) -> Iterable[bytes]:
+        """
+        When the download is interrupted, it's retried from the last line produced,
+        the lines produced before are skipped, if the `Range` request is not supported.
+        """
+        offset = self._job_result_offset
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        _, response = self.http_client.send_request(http_method="GET", url=job_result_url, request_kwargs={"stream": True}, headers=headers)
+        response.raise_for_status()
+        skip_size = offset if response.status_code != requests.codes.partial_content else 0
+        # the local file is used only if the records parsing falls behind the download
+        spill_filename = self._tools.filename_from_url(job_result_url)
+        for line in ShopifyBulkResultPipe(response, spill_filename, chunk_size=self._retrieve_chunk_size).lines():
+            if skip_size > 0:
+                skip_size -= len(line) + 1
+                continue
+            self._job_result_offset += len(line) + 1
+            yield line
+
+    def _job_get_result(self, response: Optional[requests.Response] = None) -> Optional[str]:
+        job_result_url = self._job_get_result_url(response)
         if job_result_url:
             # save to local file using chunks to avoid OOM
             filename = self._tools.filename_from_url(job_result_url)
@@ -303,7 +354,7 @@ class ShopifyBulkManager:
                 for chunk in response.iter_content(chunk_size=self._retrieve_chunk_size):
                     file.write(chunk)
                 # add `<end_of_file>` line to the bottom  of the saved data for easy parsing
-                file.write(END_OF_FILE.encode())
+                file.write(END_OF_FILE_BYTES)
             return filename
 
     def _job_get_checkpointed_result(self, response: Optional[requests.Response]) -> None:
@@ -311,7 +362,7 @@ class ShopifyBulkManager:
             # set the flag to adjust the next slice from the checkpointed cursor value
             self._set_checkpointing()
             # fetch the collected records from CANCELED Job on checkpointing
-            self._job_result_filename = self._job_get_result(response)
+            self._job_collect_result(response)
 
     def _job_update_state(self, response: Optional[requests.Response] = None) -> None:
         if response:
@@ -361,7 +412,7 @@ class ShopifyBulkManager:
             sleep(self._job_check_interval)
 
     def _on_completed_job(self, response: Optional[requests.Response] = None) -> None:
-        self._job_result_filename = self._job_get_result(response)
+        self._job_collect_result(response)
 
     def _on_failed_job(self, response: requests.Response) -> AirbyteTracedException | None:
         if not self._supports_checkpointing:
@@ -475,8 +526,7 @@ class ShopifyBulkManager:
             else:
                 self._job_track_running()
 
-    @bulk_retry_on_exception()
-    def create_job(self, stream_slice: Mapping[str, str], filter_field: str) -> None:
+    def _job_send_create(self, stream_slice: Mapping[str, str], filter_field: str) -> requests.Response:
         if stream_slice:
             query = self.query.get(filter_field, stream_slice["start"], stream_slice["end"])
         else:
@@ -488,6 +538,93 @@ class ShopifyBulkManager:
             json={"query": ShopifyBulkTemplates.prepare(query)},
             request_kwargs={},
         )
+        return response
+
+    def _job_take_prefetched(self, stream_slice: Mapping[str, str]) -> bool:
+        """
+        Uses the BULK Job created ahead by `_job_prefetch_next`, if it was created for the requested slice.
+        Otherwise, the prefetched job is canceled, to release the BULK concurrency slot for the new job.
+        """
+        prefetched = self._job_prefetched
+        if not prefetched:
+            return False
+
+        self._job_prefetched = None
+        if prefetched.get("slice") == stream_slice:
+            self._job_id = prefetched.get("id")
+            # the prefetched job is timed from the moment it's awaited,
+            # the previous slice processing shouldn't make it a long running job
+            self._job_created_at = pdm.now().to_rfc3339_string()
+            self._job_state = ShopifyBulkJobStatus.CREATED.value
+            LOGGER.info(f"Stream: `{self.http_client.name}`, the BULK Job: `{self._job_id}` is prefetched for the slice: {stream_slice}.")
+            return True
+
+        self._job_cancel_prefetched(prefetched)
+        return False
+
+    def _job_cancel_prefetched(self, prefetched: Mapping[str, Any]) -> None:
+        LOGGER.info(f"Stream: `{self.http_client.name}`, canceling the prefetched BULK Job: `{prefetched.get('id')}`, the slice has changed.")
+        try:
+            self._job_send_cancel(prefetched.get("id"))
+        except Exception as e:
+            # the job could be already completed, the new job creation is retried on `OPERATION_IN_PROGRESS` anyway
+            LOGGER.warning(f"Stream: `{self.http_client.name}`, failed to cancel the prefetched BULK Job: `{prefetched.get('id')}`. Details: {repr(e)}.")
+
+    def job_cancel_prefetched(self) -> None:
+        """
+        Cancels the prefetched BULK Job, if any, when there are no more slices to read.
+        """
+        if self._job_prefetched:
+            prefetched = self._job_prefetched
+            self._job_prefetched = None
+            self._job_cancel_prefetched(prefetched)
+
+    def _get_next_slice(self) -> Optional[Mapping[str, str]]:
+        """
+        Predicts the next slice, emitted by the stream after the current job is COMPLETED, see `stream.stream_slices()`.
+        The last slice is not predicted, since it's bounded by the `now()` value, at the time it's emitted.
+        """
+        if not self._job_slice or not self._job_completed() or self._job_adjust_slice_from_checkpoint or self._is_long_running_job:
+            return None
+
+        start = pdm.parse(self._job_slice["end"])
+        step = self._job_size if self._job_size else self._job_size_min
+        if (pdm.now() - start).total_days() <= step:
+            return None
+
+        return {"start": start.to_rfc3339_string(), "end": start.add(days=step).to_rfc3339_string()}
+
+    def _job_prefetch_next(self) -> None:
+        """
+        Creates the BULK Job for the next slice, right after the current job is COMPLETED.
+        This way the next job runs on the server side, while the current job result is processed,
+        instead of being created only after all the records are emitted.
+        Any failure is ignored, the job is created the regular way in this case.
+        """
+        next_slice = self._get_next_slice()
+        if not next_slice:
+            return None
+
+        try:
+            response = self._job_send_create(next_slice, self._job_filter_field)
+            errors = self._collect_bulk_errors(response)
+            bulk_response = response.json().get("data", {}).get("bulkOperationRunQuery", {}).get("bulkOperation", {})
+        except Exception as e:
+            LOGGER.info(f"Stream: `{self.http_client.name}`, couldn't prefetch the BULK Job for the next slice. Details: {repr(e)}.")
+            return None
+
+        if not errors and bulk_response and bulk_response.get("status") == ShopifyBulkJobStatus.CREATED.value:
+            self._job_prefetched = {"id": bulk_response.get("id"), "slice": next_slice}
+            LOGGER.info(f"Stream: `{self.http_client.name}`, the BULK Job: `{bulk_response.get('id')}` is CREATED ahead for the slice: {next_slice}.")
+
+    @bulk_retry_on_exception()
+    def create_job(self, stream_slice: Mapping[str, str], filter_field: str) -> None:
+        self._job_slice = stream_slice
+        self._job_filter_field = filter_field
+        if self._job_take_prefetched(stream_slice):
+            return None
+
+        response = self._job_send_create(stream_slice, filter_field)
 
         errors = self._collect_bulk_errors(response)
         if self._has_running_concurrent_job(errors):
@@ -524,6 +661,9 @@ class ShopifyBulkManager:
         self._job_size = requested_slice_size if requested_slice_size < self._job_size else self._job_size
 
     def get_adjusted_job_start(self, slice_start: datetime) -> datetime:
+        if self._job_prefetched and self._job_prefetched["slice"]["start"] == slice_start.to_rfc3339_string():
+            # the job for this slice is already running, the adjusted job size is applied to the slice after
+            return pdm.parse(self._job_prefetched["slice"]["end"])
         step = self._job_size if self._job_size else self._job_size_min
         return slice_start.add(days=step)
 
@@ -571,6 +711,9 @@ class ShopifyBulkManager:
         if self._job_result_filename:
             # produce records from saved bulk job result
             yield from self.record_producer.read_file(self._job_result_filename)
+        elif self._job_result_url:
+            # produce records from the result, while it's being downloaded
+            yield from self.record_producer.read_lines(self._job_stream_result(self._job_result_url))
         else:
             yield from []
 
@@ -585,6 +728,8 @@ class ShopifyBulkManager:
         try:
             # track created job until it's COMPLETED
             self._job_check_state()
+            if self.job_prefetch_next_slice:
+                self._job_prefetch_next()
             yield from self._process_bulk_results()
         except (
             ShopifyBulkExceptions.BulkJobFailed,
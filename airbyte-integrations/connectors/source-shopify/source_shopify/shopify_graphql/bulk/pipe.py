@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+
+from collections import deque
+from dataclasses import dataclass, field
+from io import BufferedReader, BufferedWriter
+from os import remove
+from threading import Condition, Thread
+from typing import Deque, Iterable, Optional
+
+import requests
+from source_shopify.utils import LOGGER
+
+
+@dataclass
+class ShopifyBulkResultPipe:
+    """
+    Overlaps the BULK Job result download with the records parsing.
+
+    The result is downloaded in the background thread, the chunks are handed over to the consumer
+    through the in-memory queue bounded by size in bytes, the consumer splits the chunks into the JSONL lines.
+    When the consumer falls behind and the queue is full, the downloaded chunks are spilled to the local file,
+    the consumer reads the spilled data back in the same order, and the queue is used again once the consumer catches up.
+    This way the download is never blocked by the consumer, and the memory usage stays bounded.
+
+    Attributes:
+        response (requests.Response): The `stream=True` response for the BULK Job result url.
+        spill_filename (str): The path to the local file, used to spill the data when the consumer falls behind.
+        chunk_size (int): The size of the chunk to download.
+        queue_max_bytes (int): The max size of the chunks kept in memory, in bytes. At least one chunk is always kept.
+    """
+
+    response: requests.Response
+    spill_filename: str
+    chunk_size: int = 1024 * 1024
+    queue_max_bytes: int = 1024 * 1024 * 32
+
+    _queue: Deque[bytes] = field(init=False, default_factory=deque)
+    # the size of the chunks kept in the queue, in bytes
+    _queued_size: int = field(init=False, default=0)
+    _condition: Condition = field(init=False, default_factory=Condition)
+    # whether or not the downloaded chunks are written to the spill file
+    _spilling: bool = field(init=False, default=False)
+    # the number of bytes written to / read from the spill file
+    _spilled_size: int = field(init=False, default=0)
+    _consumed_size: int = field(init=False, default=0)
+    _done: bool = field(init=False, default=False)
+    _stopped: bool = field(init=False, default=False)
+    _error: Optional[Exception] = field(init=False, default=None)
+
+    def _enqueue(self, chunk: bytes) -> bool:
+        with self._condition:
+            if self._spilling and self._consumed_size == self._spilled_size:
+                # the consumer has caught up with the spill file, switch back to the queue
+                self._spilling = False
+            if not self._spilling and (not self._queue or self._queued_size + len(chunk) <= self.queue_max_bytes):
+                self._queue.append(chunk)
+                self._queued_size += len(chunk)
+                self._condition.notify_all()
+                return True
+            self._spilling = True
+            return False
+
+    def _spill(self, spill_file: BufferedWriter, chunk: bytes) -> None:
+        spill_file.write(chunk)
+        spill_file.flush()
+        with self._condition:
+            self._spilled_size += len(chunk)
+            self._condition.notify_all()
+
+    def _download(self) -> None:
+        spill_file: Optional[BufferedWriter] = None
+        try:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+                if self._stopped:
+                    break
+                if chunk and not self._enqueue(chunk):
+                    if not spill_file:
+                        LOGGER.info(f"The BULK Job result consumer falls behind, spilling the result to: `{self.spill_filename}`.")
+                        spill_file = open(self.spill_filename, "wb")
+                    self._spill(spill_file, chunk)
+        except Exception as e:
+            self._error = e
+        finally:
+            if spill_file:
+                spill_file.close()
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def _read_spilled(self, spill_reader: BufferedReader, size: int) -> bytes:
+        chunk = spill_reader.read(min(size, self.chunk_size))
+        with self._condition:
+            self._consumed_size += len(chunk)
+        return chunk
+
+    def _chunks(self) -> Iterable[bytes]:
+        spill_reader: Optional[BufferedReader] = None
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._queue or self._spilled_size > self._consumed_size or self._done)
+                    chunk = self._queue.popleft() if self._queue else None
+                    if chunk is not None:
+                        self._queued_size -= len(chunk)
+                    spilled_available = self._spilled_size - self._consumed_size
+                    if chunk is None and spilled_available <= 0 and self._done:
+                        if self._error:
+                            raise self._error
+                        break
+
+                if chunk is not None:
+                    yield chunk
+                else:
+                    spill_reader = spill_reader or open(self.spill_filename, "rb")
+                    yield self._read_spilled(spill_reader, spilled_available)
+        finally:
+            if spill_reader:
+                spill_reader.close()
+
+    def lines(self) -> Iterable[bytes]:
+        """
+        Yields the JSONL lines of the BULK Job result, while it's being downloaded.
+        """
+        downloader = Thread(target=self._download, name=f"bulk-result-{self.spill_filename}", daemon=True)
+        downloader.start()
+        tail = b""
+        try:
+            for chunk in self._chunks():
+                lines = (tail + chunk if tail else chunk).split(b"\n")
+                # the last line could be incomplete, it's completed with the next chunk
+                tail = lines.pop()
+                yield from lines
+            if tail:
+                yield tail
+        finally:
+            # stop the download, if the consumer exits earlier
+            self._stopped = True
+            self.response.close()
+            downloader.join()
+            try:
+                remove(self.spill_filename)
+            except FileNotFoundError:
+                pass
@@ -1,9 +1,11 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
 from functools import wraps
+from inspect import isgeneratorfunction
 from time import sleep
-from typing import Any, Callable, Final, Optional, Tuple, Type
+from typing import Any, Callable, Final, Iterable, Optional, Tuple, Type
 
+import requests
 from source_shopify.utils import LOGGER
 
 from .exceptions import ShopifyBulkExceptions
@@ -14,31 +16,61 @@ BULK_RETRY_ERRORS: Final[Tuple] = (
     ShopifyBulkExceptions.BulkJobError,
 )
 
+# the errors raised when the BULK Job result download is interrupted
+BULK_RESULT_DOWNLOAD_ERRORS: Final[Tuple] = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def _wait_before_retry(self, ex: Exception, current_retries: int) -> None:
+    if current_retries > self._job_max_retries:
+        LOGGER.error("Exceeded retry limit. Giving up.")
+        raise ex
+    LOGGER.warning(
+        f"Stream `{self.http_client.name}`: {ex}. Retrying {current_retries}/{self._job_max_retries} after {self._job_backoff_time} seconds."
+    )
+    sleep(self._job_backoff_time)
+
 
 def bulk_retry_on_exception(more_exceptions: Optional[Tuple[Type[Exception], ...]] = None) -> Callable:
     """
     A decorator to retry a function when specified exceptions are raised.
 
-    :param more_exceptions: A tuple of exception types to catch.
+    :param more_exceptions: A tuple of exception types to catch, on top of the `BULK_RETRY_ERRORS`,
+        they are retried for the decorated function only.
+
+    The generator function is retried from the start, while being iterated,
+    the function should keep track of the progress, to resume from it.
     """
+    retry_errors = BULK_RETRY_ERRORS + (more_exceptions or ())
 
     def decorator(func: Callable) -> Callable:
+        if isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator_wrapper(self, *args, **kwargs) -> Iterable[Any]:
+                current_retries = 0
+                while True:
+                    try:
+                        yield from func(self, *args, **kwargs)
+                        return
+                    except retry_errors as ex:
+                        current_retries += 1
+                        _wait_before_retry(self, ex, current_retries)
+
+            return generator_wrapper
+
         @wraps(func)
         def wrapper(self, *args, **kwargs) -> Any:
             current_retries = 0
             while True:
                 try:
                     return func(self, *args, **kwargs)
-                except BULK_RETRY_ERRORS or more_exceptions as ex:
+                except retry_errors as ex:
                     current_retries += 1
-                    if current_retries > self._job_max_retries:
-                        LOGGER.error("Exceeded retry limit. Giving up.")
-                        raise
-                    else:
-                        LOGGER.warning(
-                            f"Stream `{self.http_client.name}`: {ex}. Retrying {current_retries}/{self._job_max_retries} after {self._job_backoff_time} seconds."
-                        )
-                        sleep(self._job_backoff_time)
+                    _wait_before_retry(self, ex, current_retries)
                 except ShopifyBulkExceptions.BulkJobCreationFailedConcurrentError:
                     if self._concurrent_attempt == self._concurrent_max_retry:
                         message = f"The BULK Job couldn't be created at this time, since another job is running."
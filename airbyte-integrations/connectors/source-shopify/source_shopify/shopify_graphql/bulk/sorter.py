@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+
+import pickle
+from dataclasses import dataclass
+from heapq import merge
+from os import remove
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional
+
+from source_shopify.utils import LOGGER
+
+
+@dataclass
+class ShopifyBulkSorter:
+    """
+    Sorts the BULK Job records using the bounded amount of memory (external merge sort).
+
+    The records are collected into the in-memory `run` of `buffer_size` records,
+    each full `run` is sorted and spilled to the temporary file on disk.
+    When the input is exhausted, the spilled `runs` are lazily merged (k-way merge) by the `key`.
+    If all the records fit into a single `run`, nothing is written to disk.
+
+    The sort is stable, the records with equal `key` values are emitted in the order they were received.
+
+    Attributes:
+        key (Callable[[Mapping[str, Any]], Any]): The function to extract the comparison key from the record.
+        buffer_size (int): The max number of records kept in memory, before the `run` is spilled to disk.
+        merge_fan_in (int): The max number of `runs` merged (and opened) at once.
+        tmp_dir (Optional[str]): The directory to store the spilled `runs`, defaults to the system tmp dir.
+    """
+
+    key: Callable[[Mapping[str, Any]], Any]
+    buffer_size: int = 100_000
+    merge_fan_in: int = 64
+    tmp_dir: Optional[str] = None
+
+    def _write_run(self, records: Iterable[Mapping[str, Any]]) -> str:
+        with NamedTemporaryFile("wb", prefix="bulk-sort-", suffix=".run", dir=self.tmp_dir, delete=False) as run_file:
+            try:
+                for record in records:
+                    pickle.dump(record, run_file, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # the partially written `run` is not returned to the caller, so it's removed here
+                run_file.close()
+                self._remove_runs([run_file.name])
+                raise
+        return run_file.name
+
+    @staticmethod
+    def _read_run(filename: str) -> Iterator[Mapping[str, Any]]:
+        with open(filename, "rb") as run_file:
+            while True:
+                try:
+                    yield pickle.load(run_file)
+                except EOFError:
+                    break
+
+    @staticmethod
+    def _remove_runs(runs: List[str]) -> None:
+        for filename in runs:
+            try:
+                remove(filename)
+            except FileNotFoundError:
+                # the `run` is already removed, after it was merged into another one
+                pass
+            except Exception as e:
+                LOGGER.info(f"Failed to remove the `tmp sort run` file: `{filename}`. Details: {repr(e)}.")
+
+    def _spill(self, buffer: List[Mapping[str, Any]]) -> str:
+        buffer.sort(key=self.key)
+        filename = self._write_run(buffer)
+        buffer.clear()
+        return filename
+
+    def _merge_runs(self, runs: List[str]) -> Iterator[Mapping[str, Any]]:
+        readers = [self._read_run(filename) for filename in runs]
+        try:
+            # `heapq.merge` is stable, the ties are resolved by the order of the `runs`
+            yield from merge(*readers, key=self.key)
+        finally:
+            for reader in readers:
+                reader.close()
+
+    def _reduce_runs(self, runs: List[str]) -> List[str]:
+        """
+        Merges the `runs` in groups of `merge_fan_in`, until they could be merged in a single pass,
+        to keep the number of opened files bounded.
+        """
+        intermediate_runs: List[str] = []
+        reduced = False
+        try:
+            while len(runs) > self.merge_fan_in:
+                reduced_runs: List[str] = []
+                for i in range(0, len(runs), self.merge_fan_in):
+                    group = runs[i : i + self.merge_fan_in]
+                    if len(group) == 1:
+                        reduced_runs.append(group[0])
+                    else:
+                        merged_run = self._write_run(self._merge_runs(group))
+                        intermediate_runs.append(merged_run)
+                        reduced_runs.append(merged_run)
+                        self._remove_runs(group)
+                runs = reduced_runs
+            reduced = True
+        finally:
+            if not reduced:
+                # the caller only knows about the initial `runs`, so the intermediate ones are removed here
+                self._remove_runs(intermediate_runs)
+        return runs
+
+    def sort(self, records: Iterable[Mapping[str, Any]]) -> Iterable[Mapping[str, Any]]:
+        buffer: List[Mapping[str, Any]] = []
+        runs: List[str] = []
+        try:
+            for record in records:
+                buffer.append(record)
+                if len(buffer) >= self.buffer_size:
+                    runs.append(self._spill(buffer))
+
+            if not runs:
+                # all records fit in memory, no need to touch the disk
+                buffer.sort(key=self.key)
+                yield from buffer
+            else:
+                if buffer:
+                    runs.append(self._spill(buffer))
+                runs = self._reduce_runs(runs)
+                yield from self._merge_runs(runs)
+        finally:
+            self._remove_runs(runs)
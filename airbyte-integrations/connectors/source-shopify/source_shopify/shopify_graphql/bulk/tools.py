@@ -4,6 +4,7 @@
 
 
 import re
+from functools import lru_cache
 from typing import Any, Mapping, MutableMapping, Optional, Union
 from urllib.parse import parse_qsl, urlparse
 
@@ -14,12 +15,17 @@ from .exceptions import ShopifyBulkExceptions
 
 # default end line tag
 END_OF_FILE: str = "<end_of_file>"
+END_OF_FILE_BYTES: bytes = END_OF_FILE.encode()
 BULK_PARENT_KEY: str = "__parentId"
+# precompiled pattern to extract the numeric part of the GraphQL `id`, like: `gid://shopify/Order/19435458986123`
+STR_ID_PATTERN: re.Pattern = re.compile(r"\d+")
 
 
 class BulkTools:
     @staticmethod
+    @lru_cache(maxsize=4096)
     def camel_to_snake(camel_case: str) -> str:
+        # the set of the field names is small and repeated for every record, so the conversion is memoized
         snake_case = []
         for char in camel_case:
             if char.isupper():
@@ -84,7 +90,8 @@ class BulkTools:
         # transforming record field names from camel to snake case, leaving the `__parent_id` relation in place
         if dict_input:
             # the `None` type check is required, to properly handle nested missing entities (return None)
-            return {self.camel_to_snake(k) if dict_input and k != BULK_PARENT_KEY else k: v for k, v in dict_input.items()}
+            camel_to_snake = self.camel_to_snake
+            return {camel_to_snake(k) if k != BULK_PARENT_KEY else k: v for k, v in dict_input.items()}
 
     @staticmethod
     def resolve_str_id(
@@ -93,6 +100,6 @@ class BulkTools:
         # some fields that expected to be resolved as ids, might not be populated for the particular `RECORD`,
         # we should return `None` to make the field `null` in the output as the result of the transformation.
         if str_input:
-            return output_type(re.search(r"\d+", str_input).group())
+            return output_type(STR_ID_PATTERN.search(str_input).group())
         else:
             return None
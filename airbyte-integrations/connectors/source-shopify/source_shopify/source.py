@@ -4,11 +4,11 @@
 
 
 import logging
-from typing import Any, List, Mapping, Tuple
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from requests.exceptions import ConnectionError, RequestException, SSLError
 
-from airbyte_cdk.models import FailureType, SyncMode
+from airbyte_cdk.models import AirbyteMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, FailureType, SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.utils import AirbyteTracedException
@@ -64,6 +64,7 @@ from .streams.streams import (
     Transactions,
     TransactionsGraphql,
 )
+from .utils import ShopifyRateLimiter as limiter
 
 
 class ConnectionCheckTest:
@@ -149,6 +150,21 @@ class SourceShopify(AbstractSource):
         config["authenticator"] = ShopifyAuthenticator(config)
         return ConnectionCheckTest(config).test_connection()
 
+    def read(
+        self,
+        logger: logging.Logger,
+        config: Mapping[str, Any],
+        catalog: ConfiguredAirbyteCatalog,
+        state: Optional[Union[List[AirbyteStateMessage], MutableMapping[str, Any]]] = None,
+    ) -> Iterator[AirbyteMessage]:
+        # the API budgets are re-synced with the rate limits of the first responses of this read
+        limiter.reset_api_budgets()
+        try:
+            yield from super().read(logger, config, catalog, state)
+        finally:
+            # emit the time spent waiting for the API rate limits to be restored
+            limiter.log_throttle_metrics()
+
     def select_transactions_stream(self, config: Mapping[str, Any]) -> Stream:
         """
         Allow the Customer to decide which API type to use when it comes to the `Transactions` stream.
@@ -4,10 +4,14 @@
 
 
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from functools import cached_property
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Union
+from operator import itemgetter
+from typing import Any, Deque, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib.parse import parse_qsl, urlparse
 
 import pendulum as pdm
@@ -16,6 +20,7 @@ from requests.exceptions import RequestException
 from source_shopify.http_request import ShopifyErrorHandler
 from source_shopify.shopify_graphql.bulk.job import ShopifyBulkManager
 from source_shopify.shopify_graphql.bulk.query import DeliveryZoneList, ShopifyBulkQuery
+from source_shopify.shopify_graphql.bulk.sorter import ShopifyBulkSorter
 from source_shopify.transform import DataTypeEnforcer
 from source_shopify.utils import ApiTypeEnum, ShopifyNonRetryableErrors
 from source_shopify.utils import EagerlyCachedStreamState as stream_state_cache
@@ -279,6 +284,8 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
     ::  @ nested_record_field_name - the name of the field inside of nested_record.
     ::  @ nested_substream - the name of the nested entity inside of parent stream, helps to reduce the number of
           API Calls, if present, see `OrderRefunds` stream for more.
+    ::  @ max_concurrent_slices - the number of slices (parent records) fetched concurrently, ahead of the slice being read.
+          Defaults to the `substream_concurrency` value from `config`, the slices are read one by one, if it's 1.
     """
 
     parent_stream_class: Union[ShopifyStream, IncrementalShopifyStream] = None
@@ -288,6 +295,12 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
     nested_substream = None
     nested_substream_list_field_id = None
 
+    def __init__(self, config: Dict) -> None:
+        super().__init__(config)
+        self.max_concurrent_slices: int = max(1, int(config.get("substream_concurrency", 1)))
+        # the slices fetched ahead, in the order they are emitted, along with their records
+        self._prefetched_slices: Deque[Tuple[Mapping[str, Any], Future]] = deque()
+
     @cached_property
     def parent_stream(self) -> Union[ShopifyStream, IncrementalShopifyStream]:
         """
@@ -325,6 +338,60 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
         return params
 
     def stream_slices(self, stream_state: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        slices = self.parent_stream_slices(stream_state=stream_state, **kwargs)
+        if self.max_concurrent_slices > 1:
+            yield from self.prefetch_slices(slices, **kwargs)
+        else:
+            yield from slices
+
+    def _fetch_slice_records(self, worker_streams: threading.local, stream_slice: Mapping[str, Any], **kwargs) -> List[Mapping[str, Any]]:
+        # the HTTP client and the pagination state of the stream are not thread-safe,
+        # each worker thread reads the slices using its own instance of the stream
+        worker_stream = getattr(worker_streams, "stream", None)
+        if worker_stream is None:
+            worker_stream = worker_streams.stream = self.__class__(self.config)
+        return list(super(IncrementalShopifySubstream, worker_stream).read_records(stream_slice=stream_slice, **kwargs))
+
+    def prefetch_slices(self, slices: Iterable[Mapping[str, Any]], **kwargs) -> Iterable[Mapping[str, Any]]:
+        """
+        Fetches the records for the next `max_concurrent_slices` slices concurrently, while the current slice is being read.
+        The parent records are read lazily, only the slices within the fetching window are kept in memory.
+        Each worker thread reads the slices with its own instance of the stream,
+        and respects the `ShopifyRateLimiter` wait time, based on the response it has received.
+        """
+        worker_streams = threading.local()
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_slices, thread_name_prefix=f"{self.name}-slice") as executor:
+            try:
+                for stream_slice in slices:
+                    future = executor.submit(self._fetch_slice_records, worker_streams, stream_slice, **kwargs)
+                    self._prefetched_slices.append((stream_slice, future))
+                    # keep the window of the slices fetched ahead, the oldest one is emitted to be read
+                    if len(self._prefetched_slices) > self.max_concurrent_slices:
+                        yield from self._emit_prefetched_slice()
+                # emit the rest of the slices within the window
+                while self._prefetched_slices:
+                    yield from self._emit_prefetched_slice()
+            finally:
+                for _, future in self._prefetched_slices:
+                    future.cancel()
+                self._prefetched_slices.clear()
+
+    def _emit_prefetched_slice(self) -> Iterable[Mapping[str, Any]]:
+        stream_slice, future = self._prefetched_slices[0]
+        yield stream_slice
+        # the slice is emitted, but it was not read, the fetched records are dropped
+        if self._prefetched_slices and self._prefetched_slices[0][1] is future:
+            self._prefetched_slices.popleft()
+            future.cancel()
+
+    def _read_slice_records(self, stream_slice: Mapping[str, Any], **kwargs) -> Iterable[Mapping[str, Any]]:
+        if self._prefetched_slices and self._prefetched_slices[0][0] == stream_slice:
+            _, future = self._prefetched_slices.popleft()
+            yield from future.result()
+        else:
+            yield from super().read_records(stream_slice=stream_slice, **kwargs)
+
+    def parent_stream_slices(self, stream_state: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
         """
         Reading the parent stream for slices with structure:
         EXAMPLE: for given nested_record as `id` of Orders,
@@ -337,7 +404,9 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
                 {slice_key: 999
             ]
         """
-        sorted_substream_slices = []
+        # the slices of the nested substream have to be sorted by the cursor, before they are emitted,
+        # only the `(cursor value, slice value)` pairs are kept, the parent records are not buffered.
+        sorted_substream_slices: List[Tuple[Union[int, str], Any]] = []
 
         # reading parent nested stream_state from child stream state
         parent_stream_state = stream_state.get(self.parent_stream.name) if stream_state else {}
@@ -352,25 +421,14 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
             # and corresponds to the data of child_substream we need.
             if self.nested_substream and self.nested_substream_list_field_id:
                 if record.get(self.nested_substream):
+                    cursor_value = record[self.nested_substream][0].get(self.cursor_field, self.default_state_comparison_value)
                     sorted_substream_slices.extend(
-                        [
-                            {
-                                self.slice_key: sub_record[self.nested_substream_list_field_id],
-                                self.cursor_field: record[self.nested_substream][0].get(
-                                    self.cursor_field, self.default_state_comparison_value
-                                ),
-                            }
-                            for sub_record in record[self.nested_record]
-                        ]
+                        (cursor_value, sub_record[self.nested_substream_list_field_id]) for sub_record in record[self.nested_record]
                     )
             elif self.nested_substream:
                 if record.get(self.nested_substream):
-                    sorted_substream_slices.append(
-                        {
-                            self.slice_key: record[self.nested_record],
-                            self.cursor_field: record[self.nested_substream][0].get(self.cursor_field, self.default_state_comparison_value),
-                        }
-                    )
+                    cursor_value = record[self.nested_substream][0].get(self.cursor_field, self.default_state_comparison_value)
+                    sorted_substream_slices.append((cursor_value, record[self.nested_record]))
             else:
                 # avoid checking `deleted` records for substreams, a.k.a `Metafields` streams,
                 # since `deleted` records are not available, thus we avoid HTTP-400 errors.
@@ -381,9 +439,9 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
         if self.nested_substream:
             if len(sorted_substream_slices) > 0:
                 # sort by cursor_field
-                sorted_substream_slices.sort(key=lambda x: x.get(self.cursor_field))
-                for sorted_slice in sorted_substream_slices:
-                    yield {self.slice_key: sorted_slice[self.slice_key]}
+                sorted_substream_slices.sort(key=itemgetter(0))
+                for _, slice_value in sorted_substream_slices:
+                    yield {self.slice_key: slice_value}
 
     # the stream_state caching is required to avoid the STATE collisions for Substreams
     @stream_state_cache.cache_stream_state
@@ -403,7 +461,7 @@ class IncrementalShopifySubstream(IncrementalShopifyStream):
 
         # reading substream records
         self.logger.info(f"Reading {self.name} for {self.slice_key}: {slice_data}")
-        records = super().read_records(stream_slice=stream_slice, **kwargs)
+        records = self._read_slice_records(stream_slice=stream_slice, **kwargs)
         # get the cached substream state, to avoid state collisions for Incremental Syncs
         cached_substream_state = stream_state_cache.cached_state.get(self.name, {})
         # filtering the portion of already emmited substream records using cached state value,
@@ -638,6 +696,8 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
     data_field = "graphql"
 
     parent_stream_class: Optional[Union[ShopifyStream, IncrementalShopifyStream]] = None
+    # the max number of records to sort in memory, the rest is spilled to disk while sorting the BULK Job result
+    sort_output_buffer_size: int = 100_000
 
     def __init__(self, config: Dict) -> None:
         super().__init__(config)
@@ -653,6 +713,10 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
             job_checkpoint_interval=config.get("job_checkpoint_interval", 200_000),
             parent_stream_name=self.parent_stream_name,
             parent_stream_cursor=self.parent_stream_cursor,
+            # create the BULK Job for the next slice, while the current job result is processed
+            job_prefetch_next_slice=config.get("job_prefetch_next_slice", False),
+            # parse the BULK Job result, while it's being downloaded
+            job_stream_results=config.get("job_stream_results", False),
         )
 
     @property
@@ -809,13 +873,17 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
             state = self._get_state_value(stream_state)
             start = pdm.parse(state)
             end = pdm.now()
-            while start < end:
-                self.job_manager.job_size_normalize(start, end)
-                slice_end = self.job_manager.get_adjusted_job_start(start)
-                self.emit_slice_message(start, slice_end)
-                yield {"start": start.to_rfc3339_string(), "end": slice_end.to_rfc3339_string()}
-                # increment the end of the slice or reduce the next slice
-                start = self.job_manager.get_adjusted_job_end(start, slice_end, self._checkpoint_cursor)
+            try:
+                while start < end:
+                    self.job_manager.job_size_normalize(start, end)
+                    slice_end = self.job_manager.get_adjusted_job_start(start)
+                    self.emit_slice_message(start, slice_end)
+                    yield {"start": start.to_rfc3339_string(), "end": slice_end.to_rfc3339_string()}
+                    # increment the end of the slice or reduce the next slice
+                    start = self.job_manager.get_adjusted_job_end(start, slice_end, self._checkpoint_cursor)
+            finally:
+                # release the BULK concurrency slot, if the job was created ahead for the slice that is never emitted
+                self.job_manager.job_cancel_prefetched()
         else:
             # for the streams that don't support filtering
             yield {}
@@ -829,10 +897,13 @@ class IncrementalShopifyGraphQlBulkStream(IncrementalShopifyStream):
             if not self.cursor_field:
                 yield from non_sorted_records
             else:
-                yield from sorted(
-                    non_sorted_records,
+                # the records are sorted using the bounded amount of memory,
+                # the sorted runs are spilled to disk, when the BULK Job result doesn't fit the buffer.
+                sorter = ShopifyBulkSorter(
                     key=lambda x: x.get(self.cursor_field) if x.get(self.cursor_field) else self.default_state_comparison_value,
+                    buffer_size=self.sort_output_buffer_size,
                 )
+                yield from sorter.sort(non_sorted_records)
         else:
             # always return an empty iterable, if no records
             return []
@@ -6,8 +6,9 @@
 import enum
 import logging
 from functools import wraps
-from time import sleep
-from typing import Any, Callable, Dict, Final, List, Mapping, Optional, Union
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Final, List, Mapping, Optional, Tuple, Union
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import requests
@@ -98,34 +99,102 @@ class ApiTypeEnum(enum.Enum):
         return [api_type.value for api_type in ApiTypeEnum]
 
 
-class ShopifyRateLimiter:
+class ShopifyApiBudget:
     """
-    Define timings for RateLimits. Adjust timings if needed.
+    The thread-safe token bucket, which mirrors the Shopify API rate limits state of the shop, shared by all streams of the sync.
 
-    :: on_unknown_load = 1.0 sec - Shopify recommended time to hold between each API call.
-    :: on_low_load = 0.2 sec (200 miliseconds) - ideal ratio between hold time and api call, also the standard hold time between each API call.
-    :: on_mid_load = 1.5 sec - great timing to retrieve another 15% of request capacity while having mid_load.
-    :: on_high_load = 5.0 sec - ideally we should wait 2.0 sec while having high_load, but we hold 5 sec to retrieve up to 80% of request capacity.
-    """
+    The bucket is re-synced with the actual server-side state, provided with each response:
+        - REST: `X-Shopify-Shop-Api-Call-Limit` header, the leaky bucket of `max` requests, restored at `max / 20` requests per second.
+        - GraphQL: `extensions.cost.throttleStatus`, the bucket of `maximumAvailable` points, restored at `restoreRate` points per second.
 
-    on_unknown_load: float = 1.0
-    on_very_low_load: float = 0.0
-    on_low_load: float = 0.2
-    on_mid_load: float = 1.5
-    on_high_load: float = 5.0
+    Before the next request is made, the cost of the request is reserved from the bucket,
+    the caller waits only for the time needed to restore the missing part of the budget,
+    so the concurrent callers are queued instead of hitting the limits at the same time.
 
-    log_message_count = 0
-    log_message_frequency = 3
+    :: capacity - the max budget available
+    :: restore_rate - the budget restored per second
+    :: threshold - the % of the capacity we could use, the rest is kept as the reserve
+    :: cost - the estimated cost of the next request, the last known cost is used
+    """
 
-    def log_message_counter(message: str) -> None:
+    def __init__(self, name: str, capacity: float, restore_rate: float, threshold: float = 0.9, cost: float = 1.0) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.restore_rate = restore_rate
+        self.threshold = threshold
+        self.cost = cost
+        self._available: float = capacity
+        self._updated_at: float = monotonic()
+        self._lock = Lock()
+        # metrics
+        self.requests_count: int = 0
+        self.throttled_count: int = 0
+        self.throttled_time: float = 0.0
+
+    def _restore(self, now: float) -> None:
+        self._available = min(self.capacity, self._available + (now - self._updated_at) * self.restore_rate)
+        self._updated_at = now
+
+    def update(
+        self,
+        currently_available: float,
+        capacity: Optional[float] = None,
+        restore_rate: Optional[float] = None,
+        cost: Optional[float] = None,
+    ) -> None:
         """
-        Print the rate-limit info message every `log_message_frequency` request, to minimize the noise in the logs.
+        Re-syncs the bucket with the server-side state.
         """
-        if ShopifyRateLimiter.log_message_count < ShopifyRateLimiter.log_message_frequency:
-            ShopifyRateLimiter.log_message_count += 1
-        else:
-            LOGGER.info(message)
-            ShopifyRateLimiter.log_message_count = 0
+        with self._lock:
+            if cost:
+                self.cost = float(cost)
+            if capacity:
+                self.capacity = float(capacity)
+            if restore_rate:
+                self.restore_rate = float(restore_rate)
+            self._available = min(self.capacity, float(currently_available))
+            self._updated_at = monotonic()
+
+    def reserve(self, cost: Optional[float] = None, threshold: Optional[float] = None) -> float:
+        """
+        Reserves the `cost` from the bucket, returns the time to wait before the request could be made.
+        """
+        with self._lock:
+            cost = cost or self.cost
+            self._restore(monotonic())
+            reserve = self.capacity * (1 - (threshold or self.threshold))
+            # the cost is taken even if it's not available yet, the next caller waits for it to be restored as well
+            wait_time = max(0.0, (cost + reserve - self._available) / self.restore_rate)
+            self._available -= cost
+            self.requests_count += 1
+            if wait_time > 0:
+                self.throttled_count += 1
+                self.throttled_time += wait_time
+        return wait_time
+
+    def acquire(self, cost: Optional[float] = None, threshold: Optional[float] = None) -> float:
+        wait_time = self.reserve(cost, threshold)
+        if wait_time > 0:
+            sleep(wait_time)
+        return wait_time
+
+    def metrics(self) -> Mapping[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests_count,
+                "throttled_requests": self.throttled_count,
+                "throttled_time_sec": round(self.throttled_time, 3),
+            }
+
+
+class ShopifyRateLimiter:
+    """
+    Spreads the requests over the API budgets of the shop, the budgets are re-synced with the rate limits of every response.
+    """
+
+    # the API budgets shared by all streams of the read, per `(shop, api_type)`, see `get_api_budget`
+    _budgets: Dict[Tuple[str, str], ShopifyApiBudget] = {}
+    _budgets_lock: Lock = Lock()
 
     def get_response_from_args(*args) -> Optional[requests.Response]:
         for arg in args:
@@ -133,84 +202,63 @@ class ShopifyRateLimiter:
                 return arg
 
     @staticmethod
-    def _convert_load_to_time(load: Optional[float], threshold: float) -> float:
+    def reset_api_budgets() -> None:
         """
-        Define wait_time based on load conditions.
-
-        :: load - represents how close we are to being throttled
-            - 0.5 is half way through our allowance
-            - 1 indicates that all of the allowance is used and the api will start rejecting calls
-        :: threshold - is the % cutoff for the rate_limits/load
-        :: wait_time - time to wait between each request in seconds
-
+        Drops the API budgets of the previous reads, so the budgets are not carried over from one read to another.
         """
-
-        half_of_threshold = threshold / 2  # average load based on threshold
-        quarter_of_threshold = threshold / 4  # low load based on threshold
-
-        if not load:
-            # when there is no rate_limits from header, use the `sleep_on_unknown_load`
-            wait_time = ShopifyRateLimiter.on_unknown_load
-            ShopifyRateLimiter.log_message_counter("API Load: `REGULAR`")
-        elif threshold <= load:
-            wait_time = ShopifyRateLimiter.on_high_load
-            ShopifyRateLimiter.log_message_counter("API Load: `HIGH`")
-        elif half_of_threshold <= load < threshold:
-            wait_time = ShopifyRateLimiter.on_mid_load
-            ShopifyRateLimiter.log_message_counter("API Load: `MID`")
-        elif quarter_of_threshold <= load < half_of_threshold:
-            wait_time = ShopifyRateLimiter.on_low_load
-            ShopifyRateLimiter.log_message_counter("API Load: `LOW`")
-        elif load < quarter_of_threshold:
-            wait_time = ShopifyRateLimiter.on_very_low_load
-
-        return wait_time
+        with ShopifyRateLimiter._budgets_lock:
+            ShopifyRateLimiter._budgets.clear()
 
     @staticmethod
-    def get_rest_api_wait_time(
-        *args,
-        threshold: float = 0.9,
-        rate_limit_header: str = "X-Shopify-Shop-Api-Call-Limit",
-    ) -> float:
+    def get_api_budget(shop: str, api_type: str) -> ShopifyApiBudget:
+        """
+        Returns the API budget of the shop, the defaults are used until the first response is received.
         """
-        To avoid reaching Shopify REST API Rate Limits, use the "X-Shopify-Shop-Api-Call-Limit" header value,
-        to determine the current rate limits and load and handle wait_time based on load %.
-        Recomended wait_time between each request is 1 sec, we would handle this dynamicaly.
+        with ShopifyRateLimiter._budgets_lock:
+            budget = ShopifyRateLimiter._budgets.get((shop, api_type))
+            if not budget:
+                if api_type == ApiTypeEnum.graphql.value:
+                    budget = ShopifyApiBudget(f"{shop}: {api_type}", capacity=1000, restore_rate=50)
+                else:
+                    budget = ShopifyApiBudget(f"{shop}: {api_type}", capacity=40, restore_rate=2)
+                ShopifyRateLimiter._budgets[(shop, api_type)] = budget
+            return budget
 
-        :: threshold - is the % cutoff for the rate_limits % load, if this cutoff is crossed,
-                        the connector waits `sleep_on_high_load` amount of time, default value = 0.9 (90%)
-        :: wait_time - time between each request = 200 miliseconds
-        :: rate_limit_header - responce header item, contains information with rate_limits (current/max)
+    @staticmethod
+    def get_shop_from_args(*args) -> str:
+        """
+        Returns the host of the shop the request is made to, from the `requests.Response` or the base url of the caller.
+        """
+        response = ShopifyRateLimiter.get_response_from_args(*args)
+        if response is not None and response.url:
+            return urlparse(response.url).netloc
+        for arg in args:
+            base_url = getattr(arg, "url_base", None) or getattr(arg, "base_url", None)
+            if isinstance(base_url, str):
+                return urlparse(base_url).netloc
+        return ""
 
+    @staticmethod
+    def update_rest_api_budget(response: Optional[requests.Response], rate_limit_header: str = "X-Shopify-Shop-Api-Call-Limit") -> None:
+        """
         Header example:
         {"X-Shopify-Shop-Api-Call-Limit": 10/40}, where: 10 - current load, 40 - max requests capacity.
-
-        More information: https://shopify.dev/api/usage/rate-limits
+        The bucket of 40 is restored at 2 requests/sec, the bucket of 400 (Shopify Plus) - at 20 requests/sec.
         """
-        # find the requests.Response inside args list
-        response = ShopifyRateLimiter.get_response_from_args(*args)
-        # Get the rate_limits from response
-        rate_limits = response.headers.get(rate_limit_header) if response else None
-        # define current load from rate_limits
+        rate_limits = response.headers.get(rate_limit_header) if response is not None else None
         if rate_limits:
-            current_rate, max_rate_limit = rate_limits.split("/")
-            load = int(current_rate) / int(max_rate_limit)
-        else:
-            load = None
-        wait_time = ShopifyRateLimiter._convert_load_to_time(load, threshold)
-        return wait_time
+            try:
+                current_rate, max_rate_limit = (float(value) for value in rate_limits.split("/"))
+            except ValueError:
+                return None
+            ShopifyRateLimiter.get_api_budget(ShopifyRateLimiter.get_shop_from_args(response), ApiTypeEnum.rest.value).update(
+                max_rate_limit - current_rate, capacity=max_rate_limit, restore_rate=max_rate_limit / 20
+            )
 
     @staticmethod
-    def get_graphql_api_wait_time(*args, threshold: float = 0.9) -> float:
+    def update_graphql_api_budget(response: Optional[requests.Response]) -> None:
         """
-        To avoid reaching Shopify Graphql API Rate Limits, use the extensions dict in the response.
-
-        :: threshold - is the % cutoff for the % load, if this cutoff is crossed,
-                        the connector waits `sleep_on_high_load` amount of time
-
         Body example:
-        In this example we are 75% through our allowance.
-        This is calculated as: ((2000 - 500)/2000)*100= 75
         {
             "data": {...}
             "extensions": {
@@ -228,28 +276,29 @@ class ShopifyRateLimiter:
 
         More information: https://shopify.dev/api/usage/rate-limits
         """
-        # find the requests.Response inside args list
-        response = ShopifyRateLimiter.get_response_from_args(*args)
-
-        # Get the rate limit info from response
-        if response:
-            try:
-                throttle_status = response.json()["extensions"]["cost"]["throttleStatus"]
-                max_available = throttle_status["maximumAvailable"]
-                currently_available = throttle_status["currentlyAvailable"]
-                if max_available and currently_available:
-                    load = (int(max_available) - int(currently_available)) / int(max_available)
-            except KeyError:
-                load = None
-        else:
-            load = None
-
-        wait_time = ShopifyRateLimiter._convert_load_to_time(load, threshold)
-        return wait_time
+        if response is None:
+            return None
+        try:
+            cost = response.json()["extensions"]["cost"]
+            throttle_status = cost["throttleStatus"]
+        except (KeyError, TypeError, ValueError):
+            return None
+        ShopifyRateLimiter.get_api_budget(ShopifyRateLimiter.get_shop_from_args(response), ApiTypeEnum.graphql.value).update(
+            throttle_status.get("currentlyAvailable", 0),
+            capacity=throttle_status.get("maximumAvailable"),
+            restore_rate=throttle_status.get("restoreRate"),
+            # the cost of the last query is used as the cost estimate for the next one
+            cost=cost.get("requestedQueryCost"),
+        )
 
     @staticmethod
-    def wait_time(wait_time: float) -> None:
-        return sleep(wait_time)
+    def log_throttle_metrics() -> None:
+        with ShopifyRateLimiter._budgets_lock:
+            budgets = list(ShopifyRateLimiter._budgets.items())
+        for (shop, api_type), budget in budgets:
+            metrics = budget.metrics()
+            if metrics["requests"]:
+                LOGGER.info(f"Shop: `{shop}`, API: `{api_type}`, rate limits usage: {metrics}.")
 
     @staticmethod
     def balance_rate_limit(
@@ -265,14 +314,17 @@ class ShopifyRateLimiter:
         def decorator(func) -> Callable[..., Any]:
             @wraps(func)
             def wrapper_balance_rate_limit(*args, **kwargs) -> Any:
+                # find the requests.Response inside args list
+                response = ShopifyRateLimiter.get_response_from_args(*args)
+                # re-sync the shared budget with the response, then reserve the budget for the next request,
+                # waiting only if the budget is not restored yet.
                 if api_type == ApiTypeEnum.rest.value:
-                    ShopifyRateLimiter.wait_time(
-                        ShopifyRateLimiter.get_rest_api_wait_time(*args, threshold=threshold, rate_limit_header=rate_limit_header)
-                    )
+                    ShopifyRateLimiter.update_rest_api_budget(response, rate_limit_header=rate_limit_header)
                 elif api_type == ApiTypeEnum.graphql.value:
-                    ShopifyRateLimiter.wait_time(ShopifyRateLimiter.get_graphql_api_wait_time(*args, threshold=threshold))
+                    ShopifyRateLimiter.update_graphql_api_budget(response)
                 else:
                     raise UnrecognisedApiType(f"unrecognised api type: {api_type}. valid values are: {ApiTypeEnum.api_types()}")
+                ShopifyRateLimiter.get_api_budget(ShopifyRateLimiter.get_shop_from_args(*args), api_type).acquire(threshold=threshold)
                 return func(*args, **kwargs)
 
             return wrapper_balance_rate_limit
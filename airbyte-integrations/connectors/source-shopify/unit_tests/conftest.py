@@ -9,6 +9,7 @@ from typing import Any, List, Mapping
 
 import pytest
 import requests
+from source_shopify.utils import ShopifyRateLimiter
 
 from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 
@@ -22,6 +23,14 @@ def time_sleep_mock(mocker):
     yield time_mock
 
 
+@pytest.fixture(autouse=True)
+def reset_api_budgets():
+    # the API budgets re-synced by the responses of one test are not used by the other tests
+    ShopifyRateLimiter.reset_api_budgets()
+    yield
+    ShopifyRateLimiter.reset_api_budgets()
+
+
 def records_per_slice(parent_records: List[Mapping[str, Any]], state_checkpoint_interval) -> List[int]:
     num_batches = len(parent_records) // state_checkpoint_interval
     if len(parent_records) % state_checkpoint_interval != 0:
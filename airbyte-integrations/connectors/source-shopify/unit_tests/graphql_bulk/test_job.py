@@ -5,6 +5,7 @@
 
 from os import remove
 
+import pendulum as pdm
 import pytest
 import requests
 from source_shopify.shopify_graphql.bulk.exceptions import ShopifyBulkExceptions
@@ -516,3 +517,192 @@ def test_expand_stream_slices_job_size(
     list(stream.read_records(SyncMode.incremental, stream_slice=first_slice))
     # check the next slice
     assert stream.job_manager._job_size == adjusted_slice_size
+
+
+def _bulk_job_created_response(job_id: str, created_at: str = "2024-01-01T00:00:00Z") -> dict:
+    return {
+        "data": {
+            "bulkOperationRunQuery": {
+                "bulkOperation": {"id": job_id, "status": "CREATED", "createdAt": created_at},
+                "userErrors": [],
+            }
+        },
+        "extensions": {},
+    }
+
+
+def test_job_prefetch_next_slice(requests_mock, auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager.job_prefetch_next_slice = True
+    current_slice = {"start": "2020-01-01T00:00:00+00:00", "end": "2020-01-31T00:00:00+00:00"}
+    requests_mock.post(
+        stream.job_manager.base_url,
+        json=_bulk_job_created_response("gid://shopify/BulkOperation/1", created_at=pdm.now().to_rfc3339_string()),
+    )
+    stream.job_manager.create_job(current_slice, stream.filter_field)
+    # the current job is COMPLETED, the next job should be created ahead
+    stream.job_manager._job_state = ShopifyBulkJobStatus.COMPLETED.value
+    requests_mock.post(stream.job_manager.base_url, json=_bulk_job_created_response("gid://shopify/BulkOperation/2"))
+    stream.job_manager._job_prefetch_next()
+
+    next_slice = {"start": "2020-01-31T00:00:00+00:00", "end": "2020-03-01T00:00:00+00:00"}
+    assert stream.job_manager._job_prefetched == {
+        "id": "gid://shopify/BulkOperation/2",
+        "slice": next_slice,
+    }
+    # the prefetched job is taken for the matching slice, without the new job creation
+    requests_mock.reset_mock()
+    stream.job_manager.create_job(next_slice, stream.filter_field)
+    assert requests_mock.call_count == 0
+    assert stream.job_manager._job_id == "gid://shopify/BulkOperation/2"
+    assert stream.job_manager._job_state == ShopifyBulkJobStatus.CREATED.value
+    # the prefetched job is timed from the moment it's awaited, not from the moment it was created
+    assert stream.job_manager._job_elapsed_time_in_state < 5
+    assert not stream.job_manager._is_long_running_job
+    assert not stream.job_manager._job_prefetched
+
+
+def test_job_prefetched_slice_is_emitted_by_slicer(auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager._job_size = 10.0
+    stream.job_manager._job_prefetched = {
+        "id": "gid://shopify/BulkOperation/2",
+        "slice": {"start": "2020-01-31T00:00:00+00:00", "end": "2020-03-01T00:00:00+00:00"},
+    }
+    # the slice the job was prefetched for is kept, regardless of the adjusted job size
+    assert stream.job_manager.get_adjusted_job_start(pdm.parse("2020-01-31T00:00:00+00:00")) == pdm.parse("2020-03-01T00:00:00+00:00")
+    # the adjusted job size is used for any other slice
+    assert stream.job_manager.get_adjusted_job_start(pdm.parse("2020-03-01T00:00:00+00:00")) == pdm.parse("2020-03-11T00:00:00+00:00")
+
+
+def test_job_prefetch_job_size_adjusted_by_total_elapsed_time(mocker, auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager.job_prefetch_next_slice = True
+    stream.job_manager._job_size = 10.0
+    stream.job_manager._job_last_elapsed_time = 2.0
+    mocker.patch.object(stream.job_manager, "_job_check_state")
+    prefetch_next = mocker.patch.object(stream.job_manager, "_job_prefetch_next")
+    clock = mocker.patch("source_shopify.shopify_graphql.bulk.job.time")
+    # the job is completed and its result is processed in 3 sec
+    clock.side_effect = [0.0, 3.0]
+    list(stream.job_manager.job_get_results())
+    prefetch_next.assert_called_once()
+    # the processing time is taken into account, the job size is not expanded
+    assert stream.job_manager._job_last_elapsed_time == 3.0
+    assert stream.job_manager._job_size == 10.0
+
+
+def test_job_prefetched_canceled_on_slice_mismatch(requests_mock, auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager._job_prefetched = {
+        "id": "gid://shopify/BulkOperation/2",
+        "slice": {"start": "2020-01-31T00:00:00+00:00", "end": "2020-03-01T00:00:00+00:00"},
+    }
+    requests_mock.post(stream.job_manager.base_url, json=_bulk_job_created_response("gid://shopify/BulkOperation/3"))
+    stream.job_manager.create_job({"start": "2020-01-01T00:00:00+00:00", "end": "2020-01-15T00:00:00+00:00"}, stream.filter_field)
+    # cancel of the prefetched job + the new job creation
+    assert requests_mock.call_count == 2
+    assert "bulkOperationCancel" in requests_mock.request_history[0].text
+    assert stream.job_manager._job_id == "gid://shopify/BulkOperation/3"
+    assert not stream.job_manager._job_prefetched
+
+
+def test_job_prefetch_skipped_for_checkpointed_job(requests_mock, auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager.job_prefetch_next_slice = True
+    stream.job_manager._job_slice = {"start": "2020-01-01T00:00:00+00:00", "end": "2020-01-31T00:00:00+00:00"}
+    stream.job_manager._job_state = ShopifyBulkJobStatus.CANCELED.value
+    stream.job_manager._job_adjust_slice_from_checkpoint = True
+    stream.job_manager._job_prefetch_next()
+    assert requests_mock.call_count == 0
+    assert not stream.job_manager._job_prefetched
+
+
+@pytest.mark.parametrize(
+    "stream, json_content_example, expected",
+    [
+        (CustomerAddress, "customer_address_jsonl_content_example", "customer_address_parse_response_expected_result"),
+        (MetafieldOrders, "metafield_jsonl_content_example", "metafield_parse_response_expected_result"),
+        (Products, "products_jsonl_content_example", "products_response_expected_result"),
+    ],
+    ids=["CustomerAddress", "MetafieldOrders", "Products"],
+)
+def test_bulk_stream_parse_streamed_response(
+    request,
+    requests_mock,
+    bulk_job_completed_response,
+    stream,
+    json_content_example,
+    expected,
+    auth_config,
+) -> None:
+    stream = stream(auth_config)
+    stream.job_manager.job_stream_results = True
+    test_result_url = bulk_job_completed_response.get("data").get("node").get("url")
+    requests_mock.post(stream.job_manager.base_url, json=bulk_job_completed_response)
+    requests_mock.get(test_result_url, text=request.getfixturevalue(json_content_example))
+    # the result is parsed while it's downloaded, no local file is saved
+    test_records = list(stream.read_records(SyncMode.full_refresh, stream_slice={}))
+    expected_result = request.getfixturevalue(expected)
+    assert test_records == (expected_result if isinstance(expected_result, list) else [expected_result])
+    assert not stream.job_manager._job_result_filename
+
+
+class _FakeStreamedResponse:
+    def __init__(self, content: bytes, status_code: int = 200, fail_after: int = 0) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.fail_after = fail_after
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        size = self.fail_after or len(self.content)
+        for i in range(0, size, 4):
+            yield self.content[i : min(i + 4, size)]
+        if self.fail_after:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "resumed_status_code, resumed_content",
+    [
+        (206, b'{"id": 3}\n{"id": 4}\n'),
+        (200, b'{"id": 1}\n{"id": 2}\n{"id": 3}\n{"id": 4}\n'),
+    ],
+    ids=["range_supported", "range_not_supported"],
+)
+def test_job_stream_result_resumed_after_interruption(mocker, auth_config, resumed_status_code, resumed_content) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager._job_backoff_time = 0
+    content = b'{"id": 1}\n{"id": 2}\n{"id": 3}\n{"id": 4}\n'
+    send_request = mocker.patch.object(
+        stream.job_manager.http_client,
+        "send_request",
+        side_effect=[
+            # the connection is broken in the middle of the third line
+            (None, _FakeStreamedResponse(content, fail_after=24)),
+            (None, _FakeStreamedResponse(resumed_content, status_code=resumed_status_code)),
+        ],
+    )
+    result_url = 'https://some_url?response-content-disposition=attachment;+filename="bulk-123.jsonl"'
+    lines = list(stream.job_manager._job_stream_result(result_url))
+
+    assert [line for line in lines if line] == [b'{"id": 1}', b'{"id": 2}', b'{"id": 3}', b'{"id": 4}']
+    # the download is resumed from the last line produced
+    assert send_request.call_args_list[0].kwargs["headers"] is None
+    assert send_request.call_args_list[1].kwargs["headers"] == {"Range": "bytes=20-"}
+
+
+def test_job_result_download_errors_retried_by_download_only(mocker, auth_config) -> None:
+    stream = MetafieldOrders(auth_config)
+    stream.job_manager._job_backoff_time = 0
+    job_completed = mocker.patch.object(stream.job_manager, "_job_completed", side_effect=requests.exceptions.ConnectionError("broken"))
+    # the functions retried without `more_exceptions` are not retried on the download errors
+    with pytest.raises(requests.exceptions.ConnectionError):
+        stream.job_manager._job_check_state()
+    assert job_completed.call_count == 1
@@ -0,0 +1,78 @@
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+
+
+import os
+from typing import Iterable, List, Optional
+
+import pytest
+from source_shopify.shopify_graphql.bulk.pipe import ShopifyBulkResultPipe
+
+
+class FakeResponse:
+    def __init__(self, chunks: List[bytes], error: Optional[Exception] = None) -> None:
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    def iter_content(self, chunk_size: int) -> Iterable[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _chunked(content: bytes, size: int) -> List[bytes]:
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+_LINES = [f'{{"id": "gid://shopify/Order/{i}", "name": "order_{i}"}}'.encode() for i in range(500)]
+_CONTENT = b"\n".join(_LINES) + b"\n"
+
+
+@pytest.mark.parametrize(
+    "chunk_size, queue_max_bytes",
+    [
+        (len(_CONTENT), len(_CONTENT)),
+        (7, len(_CONTENT)),
+        (7, 7),
+        (64, 128),
+    ],
+    ids=["single_chunk", "queue_only", "spilled", "spilled_and_resumed"],
+)
+def test_pipe_lines(tmp_path, chunk_size, queue_max_bytes) -> None:
+    spill_filename = str(tmp_path / "bulk-123.jsonl")
+    response = FakeResponse(_chunked(_CONTENT, chunk_size))
+    pipe = ShopifyBulkResultPipe(response, spill_filename, queue_max_bytes=queue_max_bytes)
+
+    assert [line for line in pipe.lines() if line] == _LINES
+    assert response.closed
+    # the spill file is removed once the result is consumed
+    assert not os.path.exists(spill_filename)
+
+
+def test_pipe_queue_bounded_by_size(tmp_path) -> None:
+    pipe = ShopifyBulkResultPipe(FakeResponse([]), str(tmp_path / "bulk-123.jsonl"), queue_max_bytes=128)
+    assert pipe._enqueue(b"x" * 64)
+    assert pipe._enqueue(b"x" * 64)
+    # the chunk is spilled, once the queue size limit is reached
+    assert not pipe._enqueue(b"x" * 64)
+    assert pipe._queued_size == 128
+    # the chunk bigger than the limit is still queued, when the queue is empty
+    pipe = ShopifyBulkResultPipe(FakeResponse([]), str(tmp_path / "bulk-123.jsonl"), queue_max_bytes=128)
+    assert pipe._enqueue(b"x" * 256)
+
+
+def test_pipe_lines_without_trailing_new_line(tmp_path) -> None:
+    response = FakeResponse(_chunked(b'{"id": 1}\n{"id": 2}', 3))
+    pipe = ShopifyBulkResultPipe(response, str(tmp_path / "bulk-123.jsonl"))
+    assert list(pipe.lines()) == [b'{"id": 1}', b'{"id": 2}']
+
+
+def test_pipe_download_error(tmp_path) -> None:
+    response = FakeResponse(_chunked(_CONTENT, 64), error=ConnectionError("connection reset"))
+    pipe = ShopifyBulkResultPipe(response, str(tmp_path / "bulk-123.jsonl"), queue_max_bytes=1)
+    with pytest.raises(ConnectionError):
+        list(pipe.lines())
@@ -3,7 +3,7 @@
 
 import pytest
 from source_shopify.shopify_graphql.bulk.query import ShopifyBulkQuery
-from source_shopify.shopify_graphql.bulk.record import ShopifyBulkRecord
+from source_shopify.shopify_graphql.bulk.record import ShopifyBulkRecord, loads
 
 
 @pytest.mark.parametrize(
@@ -207,3 +207,57 @@ def test_record_compose(basic_config, records_from_jsonl, record_composition, ex
         list(record_instance.record_compose(record))
 
     assert record_instance.buffer == expected
+
+
+def test_produce_records(basic_config, tmp_path) -> None:
+    query = ShopifyBulkQuery(basic_config)
+    record_instance = ShopifyBulkRecord(query)
+    record_instance.composition = {"new_record": "NewRecord", "record_components": ["RecordComponent"]}
+    record_instance.components = ["RecordComponent"]
+    record_instance.record_process_components = lambda record: [record]
+
+    jsonl_file = tmp_path / "bulk-123.jsonl"
+    jsonl_file.write_bytes(
+        b'{"__typename": "NewRecord", "id": "gid://shopify/NewRecord/1", "createdAt": "2024-01-01", "bigValue": 9007199254740993}\n'
+        b'{"__typename": "RecordComponent", "id": "gid://shopify/RecordComponent/2", "__parentId": "gid://shopify/NewRecord/1"}\n'
+        b"\n"
+        b'{"__typename": "NewRecord", "id": "gid://shopify/NewRecord/3", "createdAt": "2024-01-02", "bigValue": 1}\n'
+        b"<end_of_file>"
+    )
+
+    assert list(record_instance.produce_records(str(jsonl_file))) == [
+        {
+            "id": 1,
+            "created_at": "2024-01-01",
+            "big_value": 9007199254740993,
+            "record_components": {
+                "RecordComponent": [{"id": "gid://shopify/RecordComponent/2", "__parentId": "gid://shopify/NewRecord/1"}],
+            },
+            "admin_graphql_api_id": "gid://shopify/NewRecord/1",
+        },
+        {
+            "id": 3,
+            "created_at": "2024-01-02",
+            "big_value": 1,
+            "record_components": {"RecordComponent": []},
+            "admin_graphql_api_id": "gid://shopify/NewRecord/3",
+        },
+    ]
+    assert record_instance.record_composed == 2
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (b'{"id": 1, "value": 18446744073709551616}', {"id": 1, "value": 18446744073709551616}),
+        (b'{"id": 1, "value": -123456789012345678901234567890}', {"id": 1, "value": -123456789012345678901234567890}),
+        (b'{"id": 1, "value": -9223372036854775809}', {"id": 1, "value": -9223372036854775809}),
+        (b'{"id": 1, "value": NaN}', {"id": 1, "value": float("nan")}),
+        (b'{"id": 1, "value": 9007199254740993}', {"id": 1, "value": 9007199254740993}),
+    ],
+    ids=["wider_than_64_bits", "negative_wider_than_64_bits", "negative_19_digits_below_64_bits", "nan", "fits_64_bits"],
+)
+def test_loads_falls_back_to_json(line, expected) -> None:
+    decoded = loads(line)
+    assert str(decoded) == str(expected)
+    assert type(decoded["value"]) is type(expected["value"])
@@ -0,0 +1,64 @@
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+
+
+import os
+
+import pytest
+from source_shopify.shopify_graphql.bulk.sorter import ShopifyBulkSorter
+
+
+def _records(count: int):
+    # the cursor values are intentionally repeated, to check the sort is stable
+    return [{"id": i, "updated_at": f"2024-01-{(i * 7) % 28 + 1:02d}T00:00:00+00:00"} for i in range(count)]
+
+
+@pytest.mark.parametrize(
+    "count, buffer_size, merge_fan_in",
+    [
+        (10, 100, 64),
+        (100, 100, 64),
+        (1000, 100, 64),
+        (1000, 7, 3),
+        (0, 10, 2),
+    ],
+    ids=["in_memory", "single_full_run", "spilled_runs", "multi_pass_merge", "empty"],
+)
+def test_sort(tmp_path, count, buffer_size, merge_fan_in) -> None:
+    records = _records(count)
+    sorter = ShopifyBulkSorter(
+        key=lambda x: x.get("updated_at"),
+        buffer_size=buffer_size,
+        merge_fan_in=merge_fan_in,
+        tmp_dir=str(tmp_path),
+    )
+    assert list(sorter.sort(records)) == sorted(records, key=lambda x: x.get("updated_at"))
+    # all spilled runs are removed after the output is consumed
+    assert os.listdir(tmp_path) == []
+
+
+def test_sort_removes_runs_when_not_fully_consumed(tmp_path) -> None:
+    sorter = ShopifyBulkSorter(key=lambda x: x.get("updated_at"), buffer_size=10, tmp_dir=str(tmp_path))
+    output = sorter.sort(_records(100))
+    next(output)
+    assert len(os.listdir(tmp_path)) == 10
+    output.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_sort_removes_runs_when_merge_fails(tmp_path) -> None:
+    sorter = ShopifyBulkSorter(key=lambda x: x.get("updated_at"), buffer_size=7, merge_fan_in=3, tmp_dir=str(tmp_path))
+    read_run = sorter._read_run
+    runs_read = 0
+
+    def failing_read_run(filename):
+        nonlocal runs_read
+        runs_read += 1
+        # fail in the second pass of the merge, once the intermediate runs are written
+        if runs_read > 150:
+            raise OSError("No space left on device")
+        return read_run(filename)
+
+    sorter._read_run = failing_read_run
+    with pytest.raises(OSError):
+        list(sorter.sort(_records(1000)))
+    assert os.listdir(tmp_path) == []
@@ -3,7 +3,11 @@
 #
 
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 import requests
+from source_shopify.utils import ApiTypeEnum, ShopifyApiBudget
 from source_shopify.utils import ShopifyRateLimiter as limiter
 
 
@@ -31,137 +35,69 @@ def get_graphql_api_response(maximum_available, currently_available):
     }
 
 
-def test_rest_api_with_unknown_load(requests_mock):
-    """
-    Test simulates the case with unknown load because of missing rate limit header.
-    """
-    test_response_header = {"no_rate_limit_header": "no_values"}
-
-    requests_mock.get("https://test.myshopify.com/", headers=test_response_header)
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_rest_api_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
-
-    assert limiter.on_unknown_load == actual_sleep_time
-
-
-def test_rest_api_with_very_low_load(requests_mock):
-    """
-    Test simulates very low load 2/40 points of rate limit.
-    """
-    test_response_header = {"X-Shopify-Shop-Api-Call-Limit": "1/40"}
-
-    requests_mock.get("https://test.myshopify.com/", headers=test_response_header)
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_rest_api_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
-
-    assert limiter.on_very_low_load == actual_sleep_time
-
-
-def test_rest_api_with_low_load(requests_mock):
-    """
-    Test simulates low load 10/40 points of rate limit.
-    """
-    test_response_header = {"X-Shopify-Shop-Api-Call-Limit": "10/40"}
-
-    requests_mock.get("https://test.myshopify.com/", headers=test_response_header)
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_rest_api_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
-
-    assert limiter.on_low_load == actual_sleep_time
-
-
-def test_rest_api_with_mid_load(requests_mock):
-    """
-    Test simulates mid load 25/40 points of rate limit.
-    """
-    test_response_header = {"X-Shopify-Shop-Api-Call-Limit": "25/40"}
-
-    requests_mock.get("https://test.myshopify.com/", headers=test_response_header)
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_rest_api_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
-
-    assert limiter.on_mid_load == actual_sleep_time
+@pytest.fixture
+def frozen_clock(mocker):
+    # the budget is not restored between the calls
+    return mocker.patch("source_shopify.utils.monotonic", return_value=0.0)
 
 
-def test_rest_api_with_high_load(requests_mock):
-    """
-    Test simulates high load 39/40 points of rate limit.
-    """
-    test_response_header = {"X-Shopify-Shop-Api-Call-Limit": "39/40"}
-
-    requests_mock.get("https://test.myshopify.com/", headers=test_response_header)
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_rest_api_wait_time(test_response, threshold=TEST_THRESHOLD, rate_limit_header=TEST_RATE_LIMIT_HEADER)
-
-    assert limiter.on_high_load == actual_sleep_time
-
-
-def test_graphql_api_with_unknown_load(requests_mock):
-    """
-    Test simulates the case with unknown load because the json body is missing for an unknown reason.
-    """
-    requests_mock.get("https://test.myshopify.com/", json={})
-    test_response = requests.get("https://test.myshopify.com/")
-
-    actual_sleep_time = limiter.get_graphql_api_wait_time(test_response, threshold=TEST_THRESHOLD)
+def test_api_budget_reserve_within_capacity(frozen_clock):
+    budget = ShopifyApiBudget("test", capacity=40, restore_rate=2, threshold=0.9)
+    # 36 requests fit into the budget, the rest 4 are kept as the reserve
+    assert all(budget.reserve(1.0) == 0 for _ in range(36))
+    assert budget.reserve(1.0) == pytest.approx(0.5)
+    assert budget.metrics() == {"requests": 37, "throttled_requests": 1, "throttled_time_sec": 0.5}
 
-    assert limiter.on_unknown_load == actual_sleep_time
 
+def test_api_budget_concurrent_reservations_are_queued(frozen_clock):
+    budget = ShopifyApiBudget("test", capacity=10, restore_rate=10, threshold=1.0)
+    budget.update(0)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        wait_times = sorted(executor.map(lambda _: budget.reserve(1.0), range(5)))
+    # each next caller waits for its own share of the budget to be restored
+    assert wait_times == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
 
-def test_graphql_api_with_very_low_load(requests_mock):
-    """
-    Test simulates very low load (2000-1800)/2000=0.1 points of rate limit.
-    """
 
-    api_response = get_graphql_api_response(maximum_available=2000, currently_available=1800)
-    requests_mock.get("https://test.myshopify.com/", json=api_response)
+def test_api_budget_updated_from_rest_response(requests_mock, frozen_clock):
+    requests_mock.get("https://test.myshopify.com/", headers={TEST_RATE_LIMIT_HEADER: "390/400"})
     test_response = requests.get("https://test.myshopify.com/")
+    limiter.update_rest_api_budget(test_response, rate_limit_header=TEST_RATE_LIMIT_HEADER)
 
-    actual_sleep_time = limiter.get_graphql_api_wait_time(test_response, threshold=TEST_THRESHOLD)
-
-    assert limiter.on_very_low_load == actual_sleep_time
+    budget = limiter.get_api_budget("test.myshopify.com", ApiTypeEnum.rest.value)
+    assert budget.capacity == 400
+    assert budget.restore_rate == 20
+    # only 10 requests are available, while 40 should be kept as the reserve
+    assert budget.reserve(1.0, threshold=TEST_THRESHOLD) == pytest.approx(31 / 20, abs=0.01)
 
 
-def test_graphql_api_with_low_load(requests_mock):
-    """
-    Test simulates low load (2000-1500)/2000=0.25 points of rate limit.
-    """
-
-    api_response = get_graphql_api_response(maximum_available=2000, currently_available=1500)
+def test_api_budget_updated_from_graphql_response(requests_mock, frozen_clock):
+    api_response = get_graphql_api_response(maximum_available=2000, currently_available=100)
     requests_mock.get("https://test.myshopify.com/", json=api_response)
     test_response = requests.get("https://test.myshopify.com/")
+    limiter.update_graphql_api_budget(test_response)
 
-    actual_sleep_time = limiter.get_graphql_api_wait_time(test_response, threshold=TEST_THRESHOLD)
+    budget = limiter.get_api_budget("test.myshopify.com", ApiTypeEnum.graphql.value)
+    assert budget.capacity == 2000
+    assert budget.restore_rate == 100
+    assert budget.cost == 72
+    # 72 points are requested, while 100 are available and 200 should be kept as the reserve
+    assert budget.reserve(threshold=TEST_THRESHOLD) == pytest.approx(1.72)
 
-    assert limiter.on_low_load == actual_sleep_time
 
+def test_api_budget_scoped_by_shop(requests_mock):
+    requests_mock.get("https://shop-a.myshopify.com/", headers={TEST_RATE_LIMIT_HEADER: "390/400"})
+    limiter.update_rest_api_budget(requests.get("https://shop-a.myshopify.com/"), rate_limit_header=TEST_RATE_LIMIT_HEADER)
 
-def test_graphql_api_with_mid_load(requests_mock):
-    """
-    Test simulates mid load (2000-1000)/2000=0.5 points of rate limit.
-    """
-    api_response = get_graphql_api_response(maximum_available=2000, currently_available=1000)
-    requests_mock.get("https://test.myshopify.com/", json=api_response)
-    test_response = requests.get("https://test.myshopify.com/")
+    assert limiter.get_api_budget("shop-a.myshopify.com", ApiTypeEnum.rest.value).capacity == 400
+    # the budget of the other shop is not affected
+    assert limiter.get_api_budget("shop-b.myshopify.com", ApiTypeEnum.rest.value).capacity == 40
 
-    actual_sleep_time = limiter.get_graphql_api_wait_time(test_response, threshold=TEST_THRESHOLD)
 
-    assert limiter.on_mid_load == actual_sleep_time
-
-
-def test_graphql_api_with_high_load(requests_mock):
-    """
-    Test simulates high load (2000-100)/2000=0.95 points of rate limit.
-    """
-    api_response = get_graphql_api_response(maximum_available=2000, currently_available=100)
-    requests_mock.get("https://test.myshopify.com/", json=api_response)
-    test_response = requests.get("https://test.myshopify.com/")
+def test_api_budgets_reset(requests_mock):
+    requests_mock.get("https://shop-a.myshopify.com/", headers={TEST_RATE_LIMIT_HEADER: "390/400"})
+    limiter.update_rest_api_budget(requests.get("https://shop-a.myshopify.com/"), rate_limit_header=TEST_RATE_LIMIT_HEADER)
 
-    actual_sleep_time = limiter.get_graphql_api_wait_time(test_response, threshold=TEST_THRESHOLD)
+    limiter.reset_api_budgets()
 
-    assert limiter.on_high_load == actual_sleep_time
+    # the next read starts with the default budget, until it's re-synced with the first response
+    assert limiter.get_api_budget("shop-a.myshopify.com", ApiTypeEnum.rest.value).capacity == 40
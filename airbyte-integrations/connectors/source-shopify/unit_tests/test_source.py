@@ -3,6 +3,7 @@
 #
 import json
 import math
+import re
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -49,6 +50,8 @@ from source_shopify.streams.streams import (
     TransactionsGraphql,
 )
 
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http import HttpStream
 from airbyte_cdk.utils import AirbyteTracedException
 
 from .conftest import records_per_slice
@@ -517,3 +520,62 @@ def test_countries_parse_response(config, countries_response_data, countries_exp
         countries_expected_record_data,
     ]
     assert list(records) == expected_records
+
+
+@pytest.mark.parametrize("substream_concurrency", [1, 3], ids=["sequential", "concurrent"])
+def test_substream_concurrent_slices(config, mocker, requests_mock, substream_concurrency) -> None:
+    config["substream_concurrency"] = substream_concurrency
+    stream = MetafieldPages(config)
+    parent_records = [{"id": i, "updated_at": f"2023-01-0{i}T00:00:00+00:00"} for i in range(1, 8)]
+    mocker.patch(
+        "source_shopify.streams.base_streams.IncrementalShopifyStreamWithDeletedEvents.read_records",
+        return_value=parent_records,
+    )
+    for record in parent_records:
+        requests_mock.get(
+            f"{stream.url_base}pages/{record['id']}/metafields.json",
+            json={"metafields": [{"id": record["id"] * 10, "updated_at": record["updated_at"]}]},
+            headers={"X-Shopify-Shop-Api-Call-Limit": "1/40"},
+        )
+
+    records = []
+    for stream_slice in stream.stream_slices(sync_mode=SyncMode.incremental):
+        records.extend(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice))
+
+    # the records are read in the order of the parent records, regardless the concurrency
+    assert [record["id"] for record in records] == [record["id"] * 10 for record in parent_records]
+    assert requests_mock.call_count == len(parent_records)
+    assert not stream._prefetched_slices
+
+
+def test_substream_concurrent_slices_not_read(config, mocker, requests_mock) -> None:
+    config["substream_concurrency"] = 2
+    stream = MetafieldPages(config)
+    mocker.patch(
+        "source_shopify.streams.base_streams.IncrementalShopifyStreamWithDeletedEvents.read_records",
+        return_value=[{"id": i} for i in range(1, 5)],
+    )
+    requests_mock.get(re.compile("metafields.json"), json={"metafields": []}, headers={"X-Shopify-Shop-Api-Call-Limit": "1/40"})
+    # the slices are emitted even if the records are not read for them
+    assert list(stream.stream_slices(sync_mode=SyncMode.incremental)) == [{"id": i} for i in range(1, 5)]
+    assert not stream._prefetched_slices
+
+
+def test_substream_concurrent_slices_read_by_worker_streams(config, mocker, requests_mock) -> None:
+    config["substream_concurrency"] = 3
+    stream = MetafieldPages(config)
+    mocker.patch(
+        "source_shopify.streams.base_streams.IncrementalShopifyStreamWithDeletedEvents.read_records",
+        return_value=[{"id": i} for i in range(1, 7)],
+    )
+    requests_mock.get(re.compile("metafields.json"), json={"metafields": []}, headers={"X-Shopify-Shop-Api-Call-Limit": "1/40"})
+    read_records = mocker.spy(HttpStream, "read_records")
+
+    for stream_slice in stream.stream_slices(sync_mode=SyncMode.incremental):
+        list(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice))
+
+    # the slices are fetched by the worker threads, each one with its own instance of the stream
+    worker_streams = {id(call.args[0]) for call in read_records.call_args_list}
+    assert read_records.call_count == 6
+    assert id(stream) not in worker_streams
+    assert 1 <= len(worker_streams) <= 3